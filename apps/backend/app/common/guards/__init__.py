@@ -8,10 +8,30 @@ from .auth_guard import (
     VerifiedUserGuard,
     get_current_user_from_request,
 )
+from .admission import (
+    BULK,
+    HEAVY,
+    TEAM_WRITE,
+    AdmissionControlMiddleware,
+    AdmissionController,
+    AdmissionRejected,
+    RouteClass,
+    admission_class,
+    controller_from_settings,
+)
 
 __all__ = [
     "AuthGuardMiddleware",
     "RoleGuard",
     "VerifiedUserGuard",
     "get_current_user_from_request",
+    "BULK",
+    "HEAVY",
+    "TEAM_WRITE",
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "AdmissionRejected",
+    "RouteClass",
+    "admission_class",
+    "controller_from_settings",
 ]
@@ -0,0 +1,284 @@
+"""
+Admission control: bound concurrency of heavy endpoints and shed load early.
+
+Heavy handlers (full leaderboards, hot-player aggregations, imports) share the
+event loop with cheap ones (auth, team fetches). Under a spike they can starve
+everything else. Handlers opt into a route class:
+
+    @router.get("/{contest_id}/leaderboard")
+    @admission_class(HEAVY)
+    async def contest_leaderboard(...): ...
+
+Each class has its own concurrency limit and bounded queue. All classes also
+share a global limit. Unclassified routes are never queued.
+
+A request is rejected with ``503`` and ``Retry-After`` when:
+- its class queue is full, or
+- it waited longer than the queue timeout.
+
+Either way it fails fast instead of piling up.
+
+Authenticated team edits (TEAM_WRITE) have the highest priority. Edits spike
+right before contest deadlines, and a freed slot goes to a queued edit before
+any queued heavy read.
+
+Queue depth, in-flight requests, shed counts and queue wait are exported as
+``admission_*`` metrics.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.common.metrics.registry import (
+    admission_in_flight,
+    admission_queue_depth,
+    admission_shed_total,
+    admission_wait_seconds,
+)
+
+F = TypeVar("F", bound=Callable)
+
+ADMISSION_ATTRIBUTE = "__admission_class__"
+
+# Route classes
+HEAVY = "heavy"
+BULK = "bulk"
+TEAM_WRITE = "team_write"
+
+# Lower is admitted first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+
+def admission_class(name: str) -> Callable[[F], F]:
+    """Put a handler under the given route class's budget.
+
+    Apply it below the router decorator; the handler itself is returned unchanged.
+    """
+
+    def decorator(func: F) -> F:
+        setattr(func, ADMISSION_ATTRIBUTE, name)
+        return func
+
+    return decorator
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    """Budget of one route class."""
+
+    name: str
+    max_concurrency: int
+    max_queue: int
+    priority: int = PRIORITY_NORMAL
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, route_class: str, reason: str):
+        self.route_class = route_class
+        self.reason = reason
+        super().__init__(f"{route_class}: {reason}")
+
+
+class AdmissionController:
+    """
+    Hands out slots per route class, queueing by priority then arrival.
+
+    Args:
+        classes: Budgets of the limited route classes
+        max_concurrency: Slots shared by all classes together
+        queue_timeout: Seconds a request may wait for a slot before it is shed
+    """
+
+    def __init__(self, classes: Iterable[RouteClass], max_concurrency: int, queue_timeout: float):
+        self.classes: Dict[str, RouteClass] = {c.name: c for c in classes}
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self._running: Dict[str, int] = {name: 0 for name in self.classes}
+        self._queued: Dict[str, int] = {name: 0 for name in self.classes}
+        self._total = 0
+        # (priority, arrival, class name, future)
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    def _can_run(self, name: str) -> bool:
+        return self._total < self.max_concurrency and self._running[name] < self.classes[name].max_concurrency
+
+    def _grant(self, name: str) -> None:
+        self._running[name] += 1
+        self._total += 1
+        admission_in_flight.inc((name,))
+
+    def _set_queued(self, name: str, delta: int) -> None:
+        self._queued[name] += delta
+        admission_queue_depth.set(self._queued[name], (name,))
+
+    @asynccontextmanager
+    async def admit(self, name: str, priority: Optional[int] = None) -> AsyncIterator[None]:
+        """Hold a slot of ``name`` for the duration of the block; raises AdmissionRejected when shed."""
+        await self.acquire(name, priority)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    async def acquire(self, name: str, priority: Optional[int] = None) -> None:
+        route_class = self.classes[name]
+        priority = route_class.priority if priority is None else priority
+
+        # Waiters are dispatched on every release, so any still queued are blocked by
+        # their own class limit (or the global one, which blocks us too): a free slot is ours
+        if self._can_run(name):
+            self._grant(name)
+            admission_wait_seconds.observe(0.0, (name,))
+            return
+        if self._queued[name] >= route_class.max_queue:
+            admission_shed_total.inc((name, "queue_full"))
+            raise AdmissionRejected(name, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._arrivals), name, future)
+        self._waiters.append(waiter)
+        self._set_queued(name, 1)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                admission_shed_total.inc((name, "timeout"))
+                raise AdmissionRejected(name, "timeout")
+        except asyncio.CancelledError:
+            # Client went away while queued; hand the slot on if it was just granted
+            if future.done() and not future.cancelled():
+                self.release(name)
+            else:
+                future.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._set_queued(name, -1)
+        admission_wait_seconds.observe(time.perf_counter() - started, (name,))
+
+    def release(self, name: str) -> None:
+        self._running[name] -= 1
+        self._total -= 1
+        admission_in_flight.dec((name,))
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for waiter in sorted(self._waiters, key=lambda w: (w[0], w[1])):
+            if self._total >= self.max_concurrency:
+                break
+            _, _, name, future = waiter
+            if future.done():
+                continue
+            if self._can_run(name):
+                self._waiters.remove(waiter)
+                self._set_queued(name, -1)
+                self._grant(name)
+                future.set_result(None)
+
+
+class AdmissionControlMiddleware:
+    """
+    Routes requests of classified handlers through an AdmissionController.
+
+    Args:
+        app: ASGI application
+        controller: Slot budgets per route class
+        retry_after: Seconds advertised in the Retry-After header of a 503
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+        self._classified: Optional[list] = None
+
+    def _classify(self, scope: Scope):
+        """The matching classified route and its class, or (None, None)."""
+        if self._classified is None:
+            routes = getattr(getattr(scope.get("app"), "router", None), "routes", [])
+            self._classified = [
+                (route, getattr(route.endpoint, ADMISSION_ATTRIBUTE))
+                for route in routes
+                if getattr(getattr(route, "endpoint", None), ADMISSION_ATTRIBUTE, None) in self.controller.classes
+            ]
+        for route, name in self._classified:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route, name
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route, name = self._classify(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        priority = None
+        if name == TEAM_WRITE and not _has_bearer_token(scope):
+            # Only authenticated edits jump the queue
+            priority = PRIORITY_NORMAL
+        try:
+            await self.controller.acquire(name, priority)
+        except AdmissionRejected:
+            # Label the 503 with its route in request metrics
+            scope["route"] = route
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _has_bearer_token(scope: Scope) -> bool:
+    for key, value in scope.get("headers", ()):
+        if key == b"authorization":
+            return value[:7].lower() == b"bearer "
+    return False
+
+
+def controller_from_settings(settings) -> AdmissionController:
+    """Controller with the route class budgets configured in settings."""
+    return AdmissionController(
+        classes=[
+            RouteClass(HEAVY, settings.admission_heavy_concurrency, settings.admission_heavy_queue),
+            RouteClass(BULK, settings.admission_bulk_concurrency, settings.admission_bulk_queue),
+            RouteClass(
+                TEAM_WRITE,
+                settings.admission_max_concurrency,
+                settings.admission_team_write_queue,
+                priority=PRIORITY_HIGH,
+            ),
+        ],
+        max_concurrency=settings.admission_max_concurrency,
+        queue_timeout=settings.admission_queue_timeout_seconds,
+    )
@@ -0,0 +1,66 @@
+"""
+Cross-process cache invalidation.
+
+In-process caches (players, slots, contests, sponsors, carousel, enrollments) subscribe to
+the bus for the collections they are built from:
+
+    from app.common.invalidation import PLAYERS, invalidation_bus
+
+    invalidation_bus.subscribe(PLAYERS, lambda event: _cache.clear())
+
+A write handler calls ``publish_local`` so its own process invalidates at
+once. With CACHE_INVALIDATION_CHANGE_STREAMS enabled, a ChangeStreamWatcher
+tails a MongoDB change stream over the watched collections and publishes every
+change, so every worker and instance invalidates too, including for writes
+made by scripts or other services. Change streams need a replica set; a
+single-node one is enough locally:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 &
+    mongosh --eval 'rs.initiate()'
+    python -m scripts.watch_invalidations
+"""
+
+from .bus import ALL, InvalidationBus, invalidation_bus, publish_local
+from .events import (
+    CAROUSEL,
+    CHANGE_STREAM,
+    CONTESTS,
+    DELETE,
+    ENROLLMENTS,
+    FLUSH,
+    INSERT,
+    LOCAL,
+    PLAYERS,
+    REPLACE,
+    SLOTS,
+    SPONSORS,
+    UPDATE,
+    WATCHED_COLLECTIONS,
+    InvalidationEvent,
+    event_from_change,
+)
+from .watcher import ChangeStreamWatcher
+
+__all__ = [
+    "ALL",
+    "CAROUSEL",
+    "CHANGE_STREAM",
+    "CONTESTS",
+    "DELETE",
+    "ENROLLMENTS",
+    "FLUSH",
+    "INSERT",
+    "LOCAL",
+    "PLAYERS",
+    "REPLACE",
+    "SLOTS",
+    "SPONSORS",
+    "UPDATE",
+    "WATCHED_COLLECTIONS",
+    "ChangeStreamWatcher",
+    "InvalidationBus",
+    "InvalidationEvent",
+    "event_from_change",
+    "invalidation_bus",
+    "publish_local",
+]
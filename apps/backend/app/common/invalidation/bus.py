@@ -0,0 +1,67 @@
+"""In-process fan-out of invalidation events to the caches that subscribed."""
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.common.metrics.registry import invalidation_events_total
+from .events import FLUSH, LOCAL, UPDATE, InvalidationEvent
+
+logger = logging.getLogger("app.invalidation")
+
+Handler = Callable[[InvalidationEvent], None]
+
+# Subscribe to every collection
+ALL = "*"
+
+
+class InvalidationBus:
+    """Delivers each published event to the handlers of its collection.
+
+    Handlers run synchronously, in subscription order, and must be cheap
+    (drop a key, bump a version). A failing handler is logged and does not
+    keep the event from the others.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, collection: str, handler: Handler) -> Callable[[], None]:
+        """Call ``handler`` for events of ``collection`` (or ALL); returns an unsubscribe function."""
+        self._handlers.setdefault(collection, []).append(handler)
+
+        def unsubscribe() -> None:
+            handlers = self._handlers.get(collection, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+        return unsubscribe
+
+    def collections(self) -> List[str]:
+        return [name for name, handlers in self._handlers.items() if handlers and name != ALL]
+
+    def publish(self, event: InvalidationEvent) -> None:
+        invalidation_events_total.inc((event.collection, event.operation, event.source))
+        for handler in self._handlers.get(event.collection, []) + self._handlers.get(ALL, []):
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Invalidation handler %r failed for %s", handler, event)
+
+    def flush(self, collections: Optional[Iterable[str]] = None, reason: Optional[str] = None, source: str = LOCAL) -> None:
+        """Tell caches of ``collections`` (default: every subscribed one) to drop everything."""
+        for collection in collections if collections is not None else self.collections():
+            self.publish(InvalidationEvent(collection=collection, operation=FLUSH, source=source, reason=reason))
+
+
+invalidation_bus = InvalidationBus()
+
+
+def publish_local(collection: str, document_id=None, operation: str = UPDATE) -> None:
+    """Invalidate this process's caches right after a write it handled.
+
+    Other workers learn about the write from the change stream (when enabled).
+    """
+    invalidation_bus.publish(InvalidationEvent(
+        collection=collection,
+        operation=operation,
+        document_id=str(document_id) if document_id is not None else None,
+    ))
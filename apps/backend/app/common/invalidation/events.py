@@ -0,0 +1,68 @@
+"""Typed invalidation events published on the bus."""
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Tuple
+
+# Operations
+INSERT = "insert"
+UPDATE = "update"
+REPLACE = "replace"
+DELETE = "delete"
+# Anything cached from the collection may be stale: drop it all
+FLUSH = "flush"
+
+# Where the event came from
+LOCAL = "local"  # a write handled by this process
+CHANGE_STREAM = "change_stream"  # a write seen on the MongoDB change stream
+
+# Collections whose documents feed in-process caches
+PLAYERS = "players"
+SLOTS = "slots"
+CONTESTS = "contests"
+SPONSORS = "sponsors"
+CAROUSEL = "carousel_images"
+ENROLLMENTS = "team_contest_enrollments"
+
+WATCHED_COLLECTIONS = (PLAYERS, SLOTS, CONTESTS, SPONSORS, CAROUSEL, ENROLLMENTS)
+
+
+@dataclass(frozen=True)
+class InvalidationEvent:
+    """A document (or, for FLUSH, a whole collection) changed."""
+
+    collection: str
+    operation: str
+    document_id: Optional[str] = None
+    # Top-level fields touched by an update, so caches can ignore irrelevant ones
+    updated_fields: Tuple[str, ...] = ()
+    source: str = LOCAL
+    reason: Optional[str] = None
+
+    @property
+    def is_flush(self) -> bool:
+        return self.operation == FLUSH
+
+    def touches(self, *fields: str) -> bool:
+        """Whether the change may affect any of ``fields`` (always true unless it is a partial update)."""
+        if self.operation != UPDATE or not self.updated_fields:
+            return True
+        return any(field in self.updated_fields for field in fields)
+
+
+def event_from_change(change: Mapping[str, Any]) -> Optional[InvalidationEvent]:
+    """Translate one change stream document; None for operations caches do not care about."""
+    operation = change.get("operationType")
+    collection = (change.get("ns") or {}).get("coll")
+    if operation in (INSERT, UPDATE, REPLACE, DELETE):
+        key = (change.get("documentKey") or {}).get("_id")
+        description = change.get("updateDescription") or {}
+        fields = set(description.get("updatedFields") or ()) | set(description.get("removedFields") or ())
+        return InvalidationEvent(
+            collection=collection,
+            operation=operation,
+            document_id=str(key) if key is not None else None,
+            updated_fields=tuple(sorted({name.split(".", 1)[0] for name in fields})),
+            source=CHANGE_STREAM,
+        )
+    if operation in ("drop", "rename") and collection:
+        return InvalidationEvent(collection=collection, operation=FLUSH, source=CHANGE_STREAM, reason=operation)
+    return None
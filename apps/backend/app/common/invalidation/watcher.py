@@ -0,0 +1,140 @@
+"""Tail MongoDB change streams and republish the changes as invalidation events."""
+import asyncio
+import logging
+from typing import Any, Iterable, Mapping, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.common.metrics.registry import change_stream_connected, change_stream_restarts_total
+from .bus import InvalidationBus, invalidation_bus
+from .events import CHANGE_STREAM, event_from_change
+
+logger = logging.getLogger("app.invalidation")
+
+# The resume token is no longer usable: the oplog rolled past it, or it is malformed
+RESUME_LOST_CODES = {
+    260,  # InvalidResumeToken
+    280,  # ChangeStreamFatalError
+    286,  # ChangeStreamHistoryLost
+}
+# Change streams need a replica set (or sharded cluster); retrying will not help
+NOT_SUPPORTED_CODES = {40573}
+
+OPERATIONS = ["insert", "update", "replace", "delete", "drop", "rename", "dropDatabase"]
+
+
+class ChangeStreamWatcher:
+    """
+    One database-level change stream over the watched collections.
+
+    Every change becomes an InvalidationEvent on the bus. After each batch,
+    including empty ones, the stream's resume token is kept, so a
+    dropped connection resumes exactly after the last change it delivered.
+
+    If the token can no longer be resumed from (the oplog rolled past it,
+    or the database was dropped), the watched collections are flushed and
+    the stream restarts from now. Caches are in-process and start empty,
+    so a new process needs no token from a previous one.
+
+    Args:
+        database: Motor database to watch
+        collections: Collection names to watch
+        bus: Bus to publish on
+        max_await_time_ms: How long the server holds an empty getMore (the token refresh interval)
+        max_backoff: Upper bound in seconds for the reconnect delay after errors
+    """
+
+    def __init__(
+        self,
+        database,
+        collections: Iterable[str],
+        bus: InvalidationBus = invalidation_bus,
+        max_await_time_ms: int = 1000,
+        max_backoff: float = 30.0,
+    ):
+        self.database = database
+        self.collections = list(collections)
+        self.bus = bus
+        self.max_await_time_ms = max_await_time_ms
+        self.max_backoff = max_backoff
+        self.resume_token: Optional[Mapping[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        # Set once the first stream is open, so startup can wait for it
+        self.ready = asyncio.Event()
+
+    def pipeline(self):
+        return [
+            {"$match": {"ns.coll": {"$in": self.collections}, "operationType": {"$in": OPERATIONS}}},
+            {"$project": {"operationType": 1, "ns": 1, "documentKey": 1, "updateDescription": 1}},
+        ]
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        change_stream_connected.set(0)
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                await self._tail()
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as exc:
+                change_stream_connected.set(0)
+                if exc.code in NOT_SUPPORTED_CODES:
+                    logger.error("Change streams are not supported by this deployment (needs a replica set): %s", exc)
+                    change_stream_restarts_total.inc(("unsupported",))
+                    return
+                if exc.code in RESUME_LOST_CODES or exc.has_error_label("NonResumableChangeStreamError"):
+                    self._restart_from_now("history_lost", exc)
+                    continue
+                change_stream_restarts_total.inc(("error",))
+                logger.warning("Change stream failed, resuming in %.1fs: %s", backoff, exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            except PyMongoError as exc:
+                change_stream_connected.set(0)
+                change_stream_restarts_total.inc(("error",))
+                logger.warning("Change stream disconnected, resuming in %.1fs: %s", backoff, exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def _restart_from_now(self, reason: str, exc: Optional[Exception] = None) -> None:
+        """Forget the token; anything that changed in between is unknown, so flush."""
+        logger.warning("Change stream cannot resume (%s), flushing caches: %s", reason, exc)
+        change_stream_restarts_total.inc((reason,))
+        self.resume_token = None
+        self.bus.flush(self.collections, reason=reason, source=CHANGE_STREAM)
+
+    async def _tail(self) -> None:
+        async with self.database.watch(
+            self.pipeline(),
+            resume_after=self.resume_token,
+            max_await_time_ms=self.max_await_time_ms,
+        ) as stream:
+            change_stream_connected.set(1)
+            self.ready.set()
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    operation = change.get("operationType")
+                    if operation in ("dropDatabase", "invalidate"):
+                        # The stream ends after these; start over from now
+                        self._restart_from_now(operation)
+                        return
+                    event = event_from_change(change)
+                    if event is not None:
+                        self.bus.publish(event)
+                # Advances on empty batches too (post-batch token), so quiet periods never age it out
+                self.resume_token = stream.resume_token
@@ -0,0 +1,41 @@
+"""
+Metrics package: per-request DB accounting, Prometheus-style exposition and slow-query capture
+"""
+
+from .context import RequestStats, current_request_stats
+from .db_listener import DBCommandListener
+from .middleware import MetricsMiddleware, route_label
+from .pool_listener import PoolMetricsListener
+from .registry import Counter, Gauge, Histogram, MetricsRegistry, registry
+from .query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetListener,
+    QueryBudgetMiddleware,
+    assert_query_budget,
+    query_budget,
+    record_queries,
+)
+from .slow_queries import SlowQueryRecorder, get_slow_query_recorder, set_slow_query_recorder
+
+__all__ = [
+    "RequestStats",
+    "current_request_stats",
+    "DBCommandListener",
+    "MetricsMiddleware",
+    "route_label",
+    "PoolMetricsListener",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "registry",
+    "QueryBudgetExceeded",
+    "QueryBudgetListener",
+    "QueryBudgetMiddleware",
+    "assert_query_budget",
+    "query_budget",
+    "record_queries",
+    "SlowQueryRecorder",
+    "get_slow_query_recorder",
+    "set_slow_query_recorder",
+]
@@ -0,0 +1,59 @@
+"""
+Request-scoped DB accounting.
+
+The metrics middleware binds a RequestStats to a context variable for the
+lifetime of each request. Motor copies the current context into its executor
+threads, so the pymongo command listener sees the same RequestStats and can
+attribute every command to the request that issued it.
+"""
+
+import threading
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+# (command name, duration in seconds, succeeded)
+CommandSample = Tuple[str, float, bool]
+
+
+class RequestStats:
+    """DB commands, time and bytes accumulated by one request."""
+
+    __slots__ = ("scope", "commands", "db_time", "bytes_sent", "bytes_received", "samples", "_lock")
+
+    def __init__(self, scope: Optional[dict] = None):
+        # ASGI scope of the request; the router fills in scope["route"] once matched
+        self.scope = scope
+        self.commands = 0
+        self.db_time = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.samples: List[CommandSample] = []
+        self._lock = threading.Lock()
+
+    def add_sent(self, size: int) -> None:
+        with self._lock:
+            self.bytes_sent += size
+
+    def add_command(self, name: str, duration: float, succeeded: bool, received: int = 0) -> None:
+        with self._lock:
+            self.commands += 1
+            self.db_time += duration
+            self.bytes_received += received
+            self.samples.append((name, duration, succeeded))
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_db_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request running in the current context, if any."""
+    return _request_stats.get()
+
+
+def bind_request_stats(stats: RequestStats):
+    """Bind stats to the current context; returns a token for reset_request_stats."""
+    return _request_stats.set(stats)
+
+
+def reset_request_stats(token) -> None:
+    _request_stats.reset(token)
@@ -0,0 +1,64 @@
+"""
+pymongo command listener that attributes MongoDB traffic to the active request.
+"""
+
+import bson
+from pymongo import monitoring
+
+from .context import current_request_stats
+from .registry import db_bytes_total, db_command_duration_seconds, db_commands_total
+
+# Label used for commands issued outside of an HTTP request (startup, scripts, background tasks)
+BACKGROUND_ROUTE = "background"
+
+
+def _bson_size(document) -> int:
+    try:
+        return len(bson.encode(document))
+    except Exception:
+        return 0
+
+
+class DBCommandListener(monitoring.CommandListener):
+    """
+    Counts commands, round-trip time and (optionally) bytes per request.
+
+    Commands issued while a request is active are accumulated on its
+    RequestStats and published by the metrics middleware once the route is
+    known. Other commands are published immediately under BACKGROUND_ROUTE.
+
+    Args:
+        track_bytes: Re-encode commands and replies to measure BSON size.
+            This costs an extra encode per command, so it is opt-in.
+    """
+
+    def __init__(self, track_bytes: bool = False):
+        self.track_bytes = track_bytes
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if not self.track_bytes:
+            return
+        size = _bson_size(event.command)
+        stats = current_request_stats()
+        if stats is not None:
+            stats.add_sent(size)
+        else:
+            db_bytes_total.inc((BACKGROUND_ROUTE, "sent"), size)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        received = _bson_size(event.reply) if self.track_bytes else 0
+        self._finish(event.command_name, event.duration_micros, True, received)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event.command_name, event.duration_micros, False, 0)
+
+    def _finish(self, command: str, duration_micros: int, succeeded: bool, received: int) -> None:
+        duration = duration_micros / 1_000_000
+        stats = current_request_stats()
+        if stats is not None:
+            stats.add_command(command, duration, succeeded, received)
+            return
+        db_commands_total.inc((BACKGROUND_ROUTE, command, "success" if succeeded else "failure"))
+        db_command_duration_seconds.observe(duration, (BACKGROUND_ROUTE, command))
+        if received:
+            db_bytes_total.inc((BACKGROUND_ROUTE, "received"), received)
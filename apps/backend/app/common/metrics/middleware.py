@@ -0,0 +1,90 @@
+"""
+ASGI middleware recording per-route latency and DB accounting.
+
+Implemented as a plain ASGI middleware (rather than BaseHTTPMiddleware) so it
+adds no extra task or response buffering to every request, and so it can
+inject the Server-Timing header into the response start message.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .context import RequestStats, bind_request_stats, reset_request_stats
+from .registry import (
+    db_bytes_total,
+    db_command_duration_seconds,
+    db_commands_total,
+    http_request_db_commands,
+    http_request_duration_seconds,
+    http_requests_total,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope: Scope) -> str:
+    """Route template (e.g. /api/contests/{contest_id}) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request and publishes the DB commands it issued.
+
+    Args:
+        app: ASGI application
+        server_timing: Add a Server-Timing header with DB and total time
+            (meant for debug builds; it exposes internal timings).
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = bind_request_stats(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    value = (
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.commands} cmds", '
+                        f"app;dur={elapsed_ms:.1f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_request_stats(token)
+            self._publish(scope, stats, status_code, time.perf_counter() - started)
+
+    @staticmethod
+    def _publish(scope: Scope, stats: RequestStats, status_code: int, duration: float) -> None:
+        route = route_label(scope)
+        method = scope.get("method", "")
+        http_requests_total.inc((route, method, str(status_code)))
+        http_request_duration_seconds.observe(duration, (route, method))
+        http_request_db_commands.observe(stats.commands, (route,))
+        for command, command_duration, succeeded in stats.samples:
+            db_commands_total.inc((route, command, "success" if succeeded else "failure"))
+            db_command_duration_seconds.observe(command_duration, (route, command))
+        if stats.bytes_sent:
+            db_bytes_total.inc((route, "sent"), stats.bytes_sent)
+        if stats.bytes_received:
+            db_bytes_total.inc((route, "received"), stats.bytes_received)
@@ -0,0 +1,65 @@
+"""
+pymongo connection pool listener: checkout wait times and pool occupancy.
+"""
+
+from pymongo import monitoring
+
+from .registry import (
+    db_pool_checked_out,
+    db_pool_checkout_wait_seconds,
+    db_pool_checkouts_total,
+    db_pool_connections,
+)
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Publishes how long requests wait for a pooled connection and how many
+    connections are open / checked out, per server address.
+
+    A growing checkout wait with checked-out connections at the pool maximum
+    means MONGODB_MAX_POOL_SIZE (or the number of workers) is too small.
+    """
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        address = self._address(event)
+        db_pool_checkout_wait_seconds.observe(event.duration, (address,))
+        db_pool_checkouts_total.inc((address, "success"))
+        db_pool_checked_out.inc((address,))
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        address = self._address(event)
+        db_pool_checkout_wait_seconds.observe(event.duration, (address,))
+        db_pool_checkouts_total.inc((address, event.reason))
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        db_pool_checked_out.dec((self._address(event),))
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        db_pool_connections.inc((self._address(event),))
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        db_pool_connections.dec((self._address(event),))
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
@@ -0,0 +1,210 @@
+"""
+Query budgets: guard route handlers against N+1 regressions.
+
+A handler declares how many MongoDB commands one request may issue:
+
+    @router.get("/{contest_id}/leaderboard")
+    @query_budget(6)
+    async def contest_leaderboard(...): ...
+
+The budget counts commands from the auth dependency too and must hold
+regardless of data size. Cursor continuation (getMore) and session
+housekeeping are not counted, since they are not separate queries.
+
+``record_queries()`` collects every command issued inside it together with
+the application call sites that were awaiting it. In test mode
+(NODE_ENV=test) ``QueryBudgetMiddleware`` records each request and raises
+``QueryBudgetExceeded`` - with the offending call sites - when a handler
+goes over its budget, so any test exercising the route fails loudly.
+"""
+
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from pymongo import monitoring
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .middleware import route_label
+
+F = TypeVar("F", bound=Callable)
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+UNCOUNTED_COMMANDS = {"getMore", "killCursors", "endSessions"}
+
+# Frames from these files are reported as call sites; everything else is framework code
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_THIS_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+_MAX_CALL_SITES = 4
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Declare the maximum number of DB commands one request to this handler may issue.
+
+    Apply it below the router decorator; the handler itself is returned unchanged.
+    """
+    if max_queries < 0:
+        raise ValueError("max_queries must be >= 0")
+
+    def decorator(func: F) -> F:
+        setattr(func, BUDGET_ATTRIBUTE, max_queries)
+        return func
+
+    return decorator
+
+
+def budget_for(scope: Scope) -> Optional[int]:
+    """Declared budget of the endpoint that handled this request, if any."""
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    return getattr(endpoint, BUDGET_ATTRIBUTE, None)
+
+
+@dataclass(frozen=True)
+class RecordedQuery:
+    command: str
+    collection: str
+    call_sites: Tuple[str, ...]
+
+
+@dataclass
+class QueryLog:
+    """Commands issued while recording."""
+
+    queries: List[RecordedQuery] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return sum(1 for q in self.queries if q.command not in UNCOUNTED_COMMANDS)
+
+    def summary(self) -> str:
+        """Counted queries grouped by command, collection and call site, most frequent first."""
+        grouped = Counter(
+            (q.command, q.collection, q.call_sites) for q in self.queries if q.command not in UNCOUNTED_COMMANDS
+        )
+        lines = []
+        for (command, collection, call_sites), n in grouped.most_common():
+            lines.append(f"  {n:>5}x {command} {collection}")
+            for site in call_sites or ("<no application frame>",):
+                lines.append(f"           at {site}")
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request issues more DB commands than its route's budget."""
+
+    def __init__(self, route: str, budget: int, log: QueryLog):
+        self.route = route
+        self.budget = budget
+        self.log = log
+        super().__init__(
+            f"{route} issued {log.count} DB queries, budget is {budget}:\n{log.summary()}"
+        )
+
+
+_query_log: ContextVar[Optional[QueryLog]] = ContextVar("query_budget_log", default=None)
+# Application call sites of the Motor operation being dispatched (copied into the executor context)
+_call_sites: ContextVar[Tuple[str, ...]] = ContextVar("query_budget_call_sites", default=())
+_capture_installed = False
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryLog]:
+    """Record DB commands issued in this context (including awaited Motor calls)."""
+    _install_call_site_capture()
+    log = QueryLog()
+    token = _query_log.set(log)
+    try:
+        yield log
+    finally:
+        _query_log.reset(token)
+
+
+def assert_query_budget(log: QueryLog, budget: int, label: str = "block") -> None:
+    """Raise QueryBudgetExceeded when the recorded log is over budget."""
+    if log.count > budget:
+        raise QueryBudgetExceeded(label, budget, log)
+
+
+def _is_app_frame(filename: str) -> bool:
+    return filename.startswith(_APP_ROOT) and not filename.startswith(_THIS_PACKAGE)
+
+
+def _app_call_sites(frame) -> Tuple[str, ...]:
+    """Innermost application frames of a call stack, innermost first."""
+    sites = []
+    while frame is not None and len(sites) < _MAX_CALL_SITES:
+        filename = frame.f_code.co_filename
+        if _is_app_frame(filename):
+            path = os.path.relpath(filename, os.path.dirname(_APP_ROOT))
+            sites.append(f"{path}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return tuple(sites)
+
+
+def _install_call_site_capture() -> None:
+    """Wrap Motor's executor dispatch to note who issued each operation.
+
+    Motor runs the driver in an executor thread, so the command listener's own
+    stack holds no application code. Dispatch happens synchronously inside the
+    awaiting coroutine chain, so the caller's frames are captured there and
+    handed to the listener through the context Motor copies into the thread.
+    """
+    global _capture_installed
+    if _capture_installed:
+        return
+    from motor.frameworks import asyncio as motor_asyncio
+
+    original = motor_asyncio.run_on_executor
+
+    def run_on_executor(loop, fn, *args, **kwargs):
+        if _query_log.get() is not None:
+            _call_sites.set(_app_call_sites(sys._getframe(1)))
+        return original(loop, fn, *args, **kwargs)
+
+    motor_asyncio.run_on_executor = run_on_executor
+    _capture_installed = True
+
+
+class QueryBudgetListener(monitoring.CommandListener):
+    """Feeds commands into the active QueryLog, if any."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        log = _query_log.get()
+        if log is None:
+            return
+        collection = event.command.get(event.command_name)
+        sites = () if event.command_name in UNCOUNTED_COMMANDS else _call_sites.get()
+        log.queries.append(
+            RecordedQuery(
+                command=event.command_name,
+                collection=collection if isinstance(collection, str) else "",
+                call_sites=sites,
+            )
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+class QueryBudgetMiddleware:
+    """Records every HTTP request and enforces the handler's declared budget (test mode)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with record_queries() as log:
+            await self.app(scope, receive, send)
+        budget = budget_for(scope)
+        if budget is not None and log.count > budget:
+            raise QueryBudgetExceeded(f"{scope.get('method', '')} {route_label(scope)}", budget, log)
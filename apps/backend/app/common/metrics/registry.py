@@ -0,0 +1,294 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format.
+
+Only counters, gauges and histograms are needed, so this avoids pulling in
+prometheus_client. Metric updates can come from Motor's executor threads
+(pymongo command monitoring), so every metric guards its state with a lock.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# DB commands issued by a single request
+COMMANDS_PER_REQUEST_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with a fixed label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down (e.g. open connections)."""
+
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # labels -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = ([0] * len(self.buckets), [0.0, 0.0])
+                self._values[labels] = state
+            counts, totals = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            totals[0] += value
+            totals[1] += 1
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((labels, (list(c), list(t))) for labels, (c, t) in self._values.items())
+        for labels, (counts, (total, count)) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_number(total)}"
+            yield f"{self.name}_count{label_text} {_format_number(count)}"
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them for a scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template, method and status code.",
+    ("route", "method", "status"),
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds, by route template and method.",
+    ("route", "method"),
+)
+http_request_db_commands = registry.histogram(
+    "http_request_db_commands",
+    "MongoDB commands issued per HTTP request, by route template.",
+    ("route",),
+    buckets=COMMANDS_PER_REQUEST_BUCKETS,
+)
+db_commands_total = registry.counter(
+    "db_commands_total",
+    "MongoDB commands issued, by route template, command name and outcome.",
+    ("route", "command", "outcome"),
+)
+db_command_duration_seconds = registry.histogram(
+    "db_command_duration_seconds",
+    "MongoDB command round-trip time in seconds, by route template and command name.",
+    ("route", "command"),
+)
+db_bytes_total = registry.counter(
+    "db_bytes_total",
+    "Approximate BSON bytes exchanged with MongoDB, by route template and direction.",
+    ("route", "direction"),
+)
+
+# Connection pool
+POOL_WAIT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the MongoDB pool, by server.",
+    ("address",),
+    buckets=POOL_WAIT_BUCKETS,
+)
+db_pool_checkouts_total = registry.counter(
+    "db_pool_checkouts_total",
+    "MongoDB pool checkouts, by server and outcome (success, timeout, connectionError, poolClosed).",
+    ("address", "outcome"),
+)
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out",
+    "MongoDB connections currently checked out, by server.",
+    ("address",),
+)
+db_pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Open MongoDB connections, by server.",
+    ("address",),
+)
+
+# Request coalescing (app.common.singleflight); coalescing ratio per group:
+#   sum by (group) (rate(singleflight_calls_total{role="follower"}[5m]))
+#     / sum by (group) (rate(singleflight_calls_total[5m]))
+singleflight_calls_total = registry.counter(
+    "singleflight_calls_total",
+    "Coalesced computations requested, by group and role (leader runs it, follower shares its result).",
+    ("group", "role"),
+)
+singleflight_timeouts_total = registry.counter(
+    "singleflight_timeouts_total",
+    "Callers that gave up waiting for a coalesced computation, by group.",
+    ("group",),
+)
+singleflight_inflight = registry.gauge(
+    "singleflight_inflight",
+    "Coalesced computations currently running, by group.",
+    ("group",),
+)
+
+# Admission control (app.common.guards.admission)
+admission_queue_depth = registry.gauge(
+    "admission_queue_depth",
+    "Requests waiting for an admission slot, by route class.",
+    ("route_class",),
+)
+admission_in_flight = registry.gauge(
+    "admission_in_flight",
+    "Admitted requests currently running, by route class.",
+    ("route_class",),
+)
+admission_shed_total = registry.counter(
+    "admission_shed_total",
+    "Requests rejected with 503, by route class and reason (queue_full, timeout).",
+    ("route_class", "reason"),
+)
+admission_wait_seconds = registry.histogram(
+    "admission_wait_seconds",
+    "Time admitted requests spent queued, by route class.",
+    ("route_class",),
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+# Cache invalidation (app.common.invalidation)
+invalidation_events_total = registry.counter(
+    "invalidation_events_total",
+    "Invalidation events published, by collection, operation and source (local, change_stream).",
+    ("collection", "operation", "source"),
+)
+change_stream_connected = registry.gauge(
+    "change_stream_connected",
+    "1 while the invalidation change stream is open.",
+)
+change_stream_restarts_total = registry.counter(
+    "change_stream_restarts_total",
+    "Change stream reconnects, by reason (error, history_lost, dropDatabase, invalidate, unsupported).",
+    ("reason",),
+)
+
+# Team edit lock (app.services.team_locks)
+team_lock_checks_total = registry.counter(
+    "team_lock_checks_total",
+    "Team lock checks, by how they were answered (no_live_contest, cache, query).",
+    ("source",),
+)
+team_lock_locked_contests = registry.gauge(
+    "team_lock_locked_contests",
+    "Contests whose locked window is open right now.",
+)
@@ -0,0 +1,273 @@
+"""
+Opt-in slow-query recorder with automatic explain capture.
+
+A pymongo CommandListener remembers explainable commands (find, aggregate,
+count, distinct) as they start. When one finishes slower than the threshold,
+an ``explain`` (queryPlanner verbosity, so nothing is re-executed) is scheduled
+on the event loop. The plan is scanned for collection scans and blocking
+in-memory sorts, and the query is kept in a bounded table of worst offenders.
+
+Queries are grouped by shape (the command with every literal replaced by "?"),
+so each shape is explained at most once per ``explain_interval`` and no user
+data ends up in the buffer.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo import monitoring
+
+from .context import current_request_stats
+from .db_listener import BACKGROUND_ROUTE
+from .middleware import route_label
+
+logger = logging.getLogger("app.slow_queries")
+
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+# Fields the driver adds to every command; explain rejects or ignores them
+_DRIVER_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "$readConcern", "readConcern"}
+
+FLAG_COLLSCAN = "COLLSCAN"
+FLAG_IN_MEMORY_SORT = "IN_MEMORY_SORT"
+FLAG_UNWIND = "UNWIND"
+
+_PendingKey = Tuple[Any, int]
+
+
+def query_shape(value: Any) -> Any:
+    """Replace literals with "?" while keeping operators and field names."""
+    if isinstance(value, dict):
+        return {k: query_shape(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(v, dict) for v in value):
+            return [query_shape(v) for v in value]
+        return "?"
+    return "?"
+
+
+def _shape_key(command_name: str, command: Dict[str, Any]) -> str:
+    collection = command.get(command_name)
+    relevant = {k: v for k, v in command.items() if k not in _DRIVER_FIELDS and k != command_name}
+    return f"{command_name}:{collection}:{query_shape(relevant)!r}"
+
+
+def analyse_plan(explain: Any) -> Set[str]:
+    """Collect warning flags from an explain document (find or aggregate)."""
+    flags: Set[str] = set()
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            stage = node.get("stage")
+            if stage == "COLLSCAN":
+                flags.add(FLAG_COLLSCAN)
+            elif stage == "SORT":
+                flags.add(FLAG_IN_MEMORY_SORT)
+            # Aggregation pipeline stages that could not be pushed down to the query layer
+            if "$sort" in node:
+                flags.add(FLAG_IN_MEMORY_SORT)
+            if "$unwind" in node:
+                flags.add(FLAG_UNWIND)
+            for key, child in node.items():
+                # Rejected plans never ran; do not flag them
+                if key != "rejectedPlans":
+                    walk(child)
+        elif isinstance(node, list):
+            for child in node:
+                walk(child)
+
+    walk(explain)
+    return flags
+
+
+@dataclass
+class SlowQuery:
+    """One query shape that exceeded the threshold."""
+
+    shape: str
+    command: str
+    collection: str
+    route: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    flags: List[str] = field(default_factory=list)
+    plan_summary: Optional[str] = None
+    explained_at: Optional[float] = None
+    last_seen: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "command": self.command,
+            "collection": self.collection,
+            "route": self.route,
+            "shape": self.shape,
+            "count": self.count,
+            "max_ms": round(self.max_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "flags": self.flags,
+            "plan_summary": self.plan_summary,
+            "last_seen": self.last_seen,
+        }
+
+
+def _plan_summary(explain: Dict[str, Any]) -> Optional[str]:
+    """Stage chain of the winning plan, e.g. "FETCH <- IXSCAN"."""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        for stage in explain.get("stages") or []:
+            cursor = stage.get("$cursor") if isinstance(stage, dict) else None
+            if cursor:
+                planner = cursor.get("queryPlanner")
+                break
+    if not planner:
+        return None
+    plan = planner.get("winningPlan") or {}
+    plan = plan.get("queryPlan", plan)
+    stages = []
+    while isinstance(plan, dict) and plan.get("stage"):
+        stages.append(plan["stage"])
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " <- ".join(stages) or None
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    """
+    Command listener capturing slow queries and their plans.
+
+    Args:
+        threshold_ms: Commands at least this slow are recorded
+        capacity: Number of distinct query shapes kept (slowest win)
+        explain_interval: Seconds before the same shape is explained again
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, capacity: int = 50, explain_interval: float = 600.0):
+        self.threshold_ms = threshold_ms
+        self.capacity = capacity
+        self.explain_interval = explain_interval
+        self._pending: Dict[_PendingKey, Tuple[Dict[str, Any], str]] = {}
+        self._entries: Dict[str, SlowQuery] = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, client, loop: asyncio.AbstractEventLoop) -> None:
+        """Give the recorder a client and loop to run explain commands on."""
+        self._client = client
+        self._loop = loop
+
+    # CommandListener interface (called from Motor's executor threads)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (dict(event.command), event.database_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event)
+
+    def _finish(self, event) -> None:
+        if event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+        command, database_name = pending
+        self._record(event.command_name, command, database_name, duration_ms)
+
+    # Recording
+
+    def _record(self, command_name: str, command: Dict[str, Any], database_name: str, duration_ms: float) -> None:
+        shape = _shape_key(command_name, command)
+        stats = current_request_stats()
+        route = route_label(stats.scope) if stats is not None and stats.scope is not None else BACKGROUND_ROUTE
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is None:
+                if len(self._entries) >= self.capacity:
+                    slowest_kept = min(self._entries.values(), key=lambda e: e.max_ms)
+                    if slowest_kept.max_ms >= duration_ms:
+                        return
+                    del self._entries[slowest_kept.shape]
+                entry = SlowQuery(
+                    shape=shape,
+                    command=command_name,
+                    collection=str(command.get(command_name)),
+                    route=route,
+                )
+                self._entries[shape] = entry
+            entry.count += 1
+            entry.total_ms += duration_ms
+            entry.max_ms = max(entry.max_ms, duration_ms)
+            entry.route = route
+            entry.last_seen = datetime.utcnow()
+            needs_explain = entry.explained_at is None or now - entry.explained_at >= self.explain_interval
+            if needs_explain:
+                entry.explained_at = now
+        logger.warning("Slow %s on %s took %.1fms (route %s)", command_name, entry.collection, duration_ms, route)
+        if needs_explain:
+            self._schedule_explain(entry, command_name, command, database_name)
+
+    def _schedule_explain(self, entry: SlowQuery, command_name: str, command: Dict[str, Any], database_name: str) -> None:
+        if self._client is None or self._loop is None or self._loop.is_closed():
+            return
+        explainable = {k: v for k, v in command.items() if k not in _DRIVER_FIELDS}
+        coro = self._explain(entry, database_name, explainable)
+        try:
+            in_loop_thread = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop_thread = False
+        if in_loop_thread:
+            self._loop.create_task(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _explain(self, entry: SlowQuery, database_name: str, command: Dict[str, Any]) -> None:
+        try:
+            explain = await self._client[database_name].command(
+                {"explain": command, "verbosity": "queryPlanner"}
+            )
+        except Exception as exc:
+            logger.warning("Could not explain slow %s on %s: %s", entry.command, entry.collection, exc)
+            return
+        flags = analyse_plan(explain)
+        with self._lock:
+            entry.flags = sorted(flags)
+            entry.plan_summary = _plan_summary(explain)
+
+    # Reading
+
+    def worst(self, limit: Optional[int] = None) -> List[SlowQuery]:
+        """Recorded query shapes, slowest first."""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e.max_ms, reverse=True)
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+
+# Process-wide recorder; only registered with the client when SLOW_QUERY_ENABLED is set
+_recorder: Optional[SlowQueryRecorder] = None
+
+
+def get_slow_query_recorder() -> Optional[SlowQueryRecorder]:
+    return _recorder
+
+
+def set_slow_query_recorder(recorder: Optional[SlowQueryRecorder]) -> None:
+    global _recorder
+    _recorder = recorder
@@ -0,0 +1,37 @@
+"""
+Raw JSON responses for read-heavy list endpoints.
+
+By default a list route loads Beanie documents (validating every row), builds
+a response model per row, and FastAPI validates and serializes the result
+once more. For responses of hundreds of rows that is most of the request's CPU.
+
+A route can opt into the fast path instead. It builds plain dicts straight
+from projected Motor rows, shaped exactly like its response_model, and returns
+them in a RawJSONResponse. FastAPI passes a returned Response through as is,
+so nothing is validated again. The route keeps its response_model, so the
+OpenAPI schema does not change:
+
+    @router.get("", response_model=List[PlayerOut])
+    async def list_players(...):
+        rows = [player_out_row(doc) async for doc in cursor]
+        return RawJSONResponse(rows)
+
+Rows are encoded with orjson when it is installed (ObjectId, datetime, Enum and
+sets are handled), otherwise with the standard json module.
+
+Responses built from a versioned server-side cache can also carry an ETag and
+answer a matching If-None-Match with an empty 304:
+
+    if etag_matches(request, feed.etag):
+        return not_modified(feed.etag, headers)
+"""
+
+from .conditional import etag_matches, not_modified
+from .raw_json import RawJSONResponse, dumps
+
+__all__ = [
+    "RawJSONResponse",
+    "dumps",
+    "etag_matches",
+    "not_modified",
+]
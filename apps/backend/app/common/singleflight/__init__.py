@@ -0,0 +1,11 @@
+"""
+Single-flight request coalescing for expensive concurrent reads
+"""
+
+from .group import SingleFlight, SingleFlightTimeout, normalize_key
+
+__all__ = [
+    "SingleFlight",
+    "SingleFlightTimeout",
+    "normalize_key",
+]
@@ -0,0 +1,120 @@
+"""
+Coalesce identical in-flight computations into one shared awaitable.
+
+When a wicket falls, hundreds of clients ask for the same leaderboard page at
+the same instant. A ``SingleFlight`` group runs the computation for the first
+caller (the leader) and hands every concurrent caller with the same normalized
+params (the followers) the same result, or the same exception:
+
+    _pages = SingleFlight("contest_leaderboard", timeout=10.0)
+
+    page = await _pages.do({"contest_id": cid, "skip": skip, "limit": limit}, lambda: build_page(cid, skip, limit))
+
+Only coalesce work whose result is the same for every caller and treat the
+result as read-only; per-user parts (the caller's own rank, ownership checks)
+belong outside. Nothing is cached: once the computation finishes the key is
+forgotten and the next caller starts a fresh one.
+
+The computation runs in its own task, so a leader whose client disconnects
+does not cancel it for the followers. Each key is shared for at most
+``timeout`` seconds. After that, waiting callers get ``SingleFlightTimeout``
+and new callers start a fresh computation instead of joining one that is
+stuck.
+
+The ``singleflight_*`` metrics in app.common.metrics.registry count leaders,
+followers (their ratio is the coalescing ratio), timeouts and in-flight keys
+per group.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+
+from app.common.metrics.registry import (
+    singleflight_calls_total,
+    singleflight_inflight,
+    singleflight_timeouts_total,
+)
+
+T = TypeVar("T")
+
+Key = Tuple[Tuple[str, Hashable], ...]
+
+
+class SingleFlightTimeout(asyncio.TimeoutError):
+    """A coalesced computation did not finish within its group's timeout."""
+
+    def __init__(self, group: str, timeout: float):
+        self.group = group
+        self.timeout = timeout
+        super().__init__(f"{group} did not complete within {timeout:g}s")
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(v) for v in value))
+    # ObjectIds, enums and the like: compare by their string form
+    return str(getattr(value, "value", value))
+
+
+def normalize_key(params: Mapping[str, Any]) -> Key:
+    """Order-independent key for a set of params; None values are dropped."""
+    return tuple(sorted((name, _normalize(value)) for name, value in params.items() if value is not None))
+
+
+class SingleFlight:
+    """A group of coalesced computations, e.g. one per route."""
+
+    def __init__(self, name: str, timeout: Optional[float] = 10.0):
+        self.name = name
+        self.timeout = timeout
+        self._calls: Dict[Key, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        params: Mapping[str, Any],
+        fn: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Run ``fn`` unless an identical call is in flight, and return the shared result."""
+        key = normalize_key(params)
+        timeout = self.timeout if timeout is None else timeout
+        task = self._calls.get(key)
+        if task is None:
+            role = "leader"
+            task = asyncio.get_running_loop().create_task(fn())
+            self._calls[key] = task
+            singleflight_inflight.inc((self.name,))
+            task.add_done_callback(lambda done: self._finished(key, done))
+            if timeout is not None:
+                asyncio.get_running_loop().call_later(timeout, self._forget, key, task)
+        else:
+            role = "follower"
+        singleflight_calls_total.inc((self.name, role))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            singleflight_timeouts_total.inc((self.name,))
+            raise SingleFlightTimeout(self.name, timeout) from None
+
+    def _forget(self, key: Key, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def _finished(self, key: Key, task: asyncio.Task) -> None:
+        self._forget(key, task)
+        singleflight_inflight.dec((self.name,))
+        # Mark the exception as retrieved even if every waiter gave up
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,37 @@
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+
+class ImportDryRun(Document):
+    """Validated rows of a dry-run player import, reused when the same file is committed"""
+
+    # Same file, user and options as the commit call
+    checksum: str  # SHA256 of file content
+    user_id: str
+    conflict_policy: str
+    slot_strategy: str
+    header_row: int = 1
+
+    # Fingerprint of players and slots when the rows were validated
+    catalog_version: str
+
+    format: str  # xlsx or csv
+    total_rows: int = 0
+    # Normalized player data; rows to update carry "_existing_id" instead of the player document
+    valid_rows: List[Dict[str, Any]] = Field(default_factory=list)
+    errors: List[Dict[str, Any]] = Field(default_factory=list)
+    conflicts: List[Dict[str, Any]] = Field(default_factory=list)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "import_dry_runs"
+        indexes = [
+            [("checksum", 1), ("user_id", 1)],
+            # MongoDB drops the document once expires_at has passed
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0),
+        ]
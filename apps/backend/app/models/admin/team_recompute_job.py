@@ -0,0 +1,40 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from typing import Optional, List
+
+from app.common.enums.jobs import JobStatus
+
+
+class TeamRecomputeJob(Document):
+    """Progress of a background recompute of team totals (app.services.team_totals)"""
+
+    reason: str  # player_update, player_delete or manual
+    # Teams picking any of these players are recomputed; None means every team
+    player_ids: Optional[List[str]] = None
+    requested_by: Optional[str] = None  # User who triggered the job
+
+    status: JobStatus = JobStatus.PENDING
+    total_teams: int = 0
+    processed_teams: int = 0
+    batches: int = 0
+    error: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Settings:
+        name = "team_recompute_jobs"
+        indexes = [
+            [("created_at", -1)],
+        ]
+
+    @property
+    def progress(self) -> float:
+        """Fraction of teams processed, 0.0 to 1.0"""
+        if self.status == JobStatus.COMPLETED:
+            return 1.0
+        if not self.total_teams:
+            return 0.0
+        return min(1.0, self.processed_teams / self.total_teams)
@@ -1,7 +1,7 @@
 from beanie import Document
 from pydantic import Field, HttpUrl
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from pymongo import IndexModel
 
 
@@ -14,6 +14,8 @@ class CarouselImage(Document):
     image_file_id: Optional[str] = None
     # Public URL to image served via API; will be '/api/v1/carousel/{id}/image'
     image_url: Optional[str] = None
+    # SHA-256 of the stored image, versions the image URL in the public feed
+    image_hash: Optional[str] = None
     link_url: Optional[HttpUrl] = None
     display_order: int = 0
     active: bool = True
@@ -36,3 +38,22 @@ class CarouselImage(Document):
 
     def __str__(self):
         return self.title or f"Carousel Image {self.id}"
+
+
+class CarouselOrder(Document):
+    """Display order of every carousel image, in a single document.
+
+    A reorder rewrites it with one update, which MongoDB applies atomically,
+    so the public feed (which sorts by ``positions``) sees either the whole
+    old order or the whole new one. ``CarouselImage.display_order`` is a copy
+    for the admin endpoints. Images missing from ``positions`` fall back to it.
+    There is one document, ``_id`` ORDER_ID in app.services.carousel_feed,
+    read and written through the motor collection.
+    """
+
+    # Image id -> display order
+    positions: Dict[str, int] = Field(default_factory=dict)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "carousel_order"
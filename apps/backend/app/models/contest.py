@@ -33,6 +33,13 @@ class Contest(Document):
     # list of allowed real-world team names (Player.team) for daily contests
     allowed_teams: List[str] = Field(default_factory=list)
 
+    # frozen standings (app.models.contest_standings) served once the contest is finalized
+    finalized_version: Optional[int] = None
+    finalized_at: Optional[datetime] = None
+    finalized_teams: int = 0
+    # last version claimed by a finalization, so concurrent runs write distinct versions
+    finalizing_version: Optional[int] = None
+
     created_at: datetime = Field(default_factory=now_ist)
     updated_at: datetime = Field(default_factory=now_ist)
 
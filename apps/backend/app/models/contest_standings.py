@@ -0,0 +1,73 @@
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import IndexModel
+from datetime import datetime
+from typing import Optional, List
+
+
+class FrozenStandingEntry(BaseModel):
+    """One ranked team as it stood when the contest was finalized."""
+    rank: int
+    team_id: str
+    team_name: str
+    user_id: str
+    username: str
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    points: float
+    rank_change: Optional[int] = None
+
+
+class ContestStandingsPage(Document):
+    """A fixed-size page of a finalized contest leaderboard.
+
+    Pages of one finalization share a ``version``; Contest.finalized_version
+    names the version readers use, so a re-finalization is swapped in at once.
+    """
+
+    contest_id: PydanticObjectId
+    version: int
+    page: int  # 0-based; holds ranks page * page_size + 1 ..
+    entries: List[FrozenStandingEntry] = Field(default_factory=list)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contest_standings_pages"
+        indexes = [
+            IndexModel([("contest_id", 1), ("version", 1), ("page", 1)], unique=True),
+        ]
+
+
+class FrozenTeamPlayer(BaseModel):
+    id: str
+    name: str
+    team: Optional[str] = None
+    price: float = 0.0
+    contest_points: float = 0.0  # with the captain / vice-captain multiplier applied
+    slot: Optional[str] = None
+
+
+class ContestTeamBreakdown(Document):
+    """Per-player points of one team in a finalized contest."""
+
+    contest_id: PydanticObjectId
+    version: int
+    team_id: PydanticObjectId
+    user_id: PydanticObjectId
+    rank: int
+    team_name: str
+    points: float
+    rank_change: Optional[int] = None
+    captain_id: Optional[str] = None
+    vice_captain_id: Optional[str] = None
+    players: List[FrozenTeamPlayer] = Field(default_factory=list)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contest_team_breakdowns"
+        indexes = [
+            IndexModel([("contest_id", 1), ("version", 1), ("team_id", 1)], unique=True),
+            [("contest_id", 1), ("version", 1), ("user_id", 1), ("rank", 1)],
+        ]
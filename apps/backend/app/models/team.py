@@ -24,6 +24,8 @@ class Team(Document):
     rank: Optional[int] = None
     rank_change: Optional[int] = None  # positive = moved up, negative = moved down
     contest_id: Optional[str] = None  # Optional: reference to a contest
+    # Canonical hash of player_ids + captain + vice-captain (app.utils.team_fingerprint)
+    fingerprint: Optional[str] = None
     
     # Metadata
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -36,4 +38,5 @@ class Team(Document):
             [("total_points", -1)],  # Descending order for leaderboard
             [("created_at", -1)],
             [("player_ids", 1)],  # Multikey index to speed up selection lookups
+            [("fingerprint", 1), ("user_id", 1)],  # Identical-team counts
         ]
@@ -3,6 +3,7 @@ from .slots import router as slots_router
 from .players_import import router as players_import_router
 from .contests import router as contests_router
 from .teams_users import router as users_teams_router
+from .diagnostics import router as diagnostics_router
 
 __all__ = [
     "players_router",
@@ -10,4 +11,5 @@ __all__ = [
     "players_import_router",
     "contests_router",
     "users_teams_router",
+    "diagnostics_router",
 ]
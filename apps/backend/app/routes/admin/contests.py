@@ -25,6 +25,18 @@ from app.schemas.enrollment import (
     EnrollmentResponse,
 )
 from app.utils.dependencies import get_admin_user
+from app.services.queries import find_page
+from app.services.leaderboard_store import (
+    apply_contest_point_changes,
+    apply_global_point_changes,
+    invalidate_leaderboards,
+    remove_teams,
+)
+from app.services.contest_snapshots import FinalizeConflict, finalize_contest
+from app.services.team_locks import forget_teams
+from app.services.contest_cache import get_contest as get_cached_contest
+from app.common.invalidation import CONTESTS, DELETE, INSERT, PLAYERS, publish_local
+from app.common.guards.admission import BULK, admission_class
 from app.models.user import User
 
 router = APIRouter(prefix="/api/admin/contests", tags=["Admin - Contests"])
@@ -44,6 +56,7 @@ async def to_response(contest: Contest) -> ContestResponse:
         allowed_teams=contest.allowed_teams or [],
         created_at=to_ist(contest.created_at),
         updated_at=to_ist(contest.updated_at),
+        finalized_at=to_ist(contest.finalized_at) if contest.finalized_at else None,
     )
 
 
@@ -75,6 +88,7 @@ async def create_contest(
         updated_at=now,
     )
     await contest.insert()
+    publish_local(CONTESTS, contest.id, INSERT)
     return await to_response(contest)
 
 
@@ -95,9 +109,8 @@ async def list_contests(
         conditions = Or(RegEx(Contest.code, search, options="i"), RegEx(Contest.name, search, options="i"))
         query = Contest.find(conditions)
 
-    total = await query.count()
     skip = (page - 1) * page_size
-    rows = await query.skip(skip).limit(page_size).sort(-Contest.start_at).to_list()
+    rows, total = await find_page(query, skip=skip, limit=page_size, sort=[-Contest.start_at])
     return {
         "contests": [await to_response(c) for c in rows],
         "total": total,
@@ -139,6 +152,7 @@ async def update_contest(
         setattr(contest, k, v)
     contest.updated_at = now_ist()
     await contest.save()
+    publish_local(CONTESTS, contest.id)
     return await to_response(contest)
 
 
@@ -171,6 +185,8 @@ async def delete_contest(
             raise HTTPException(status_code=409, detail="Contest has active enrollments. Use force=true to unenroll and delete.")
 
     await contest.delete()
+    publish_local(CONTESTS, contest.id, DELETE)
+    await invalidate_leaderboards([contest.id])
     return {"message": "Contest deleted"}
 
 
@@ -180,7 +196,7 @@ async def enroll_teams(
     body: EnrollmentBulkRequest,
     current_user: User = Depends(get_admin_user),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await get_cached_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -200,9 +216,9 @@ async def enroll_teams(
 
         # Ensure no duplicate active enrollment
         existing = await TeamContestEnrollment.find_one(
-            (TeamContestEnrollment.team_id == team.id)
-            & (TeamContestEnrollment.contest_id == contest.id)
-            & (TeamContestEnrollment.status == "active")
+            (TeamContestEnrollment.team_id == team.id),
+            (TeamContestEnrollment.contest_id == contest.id),
+            (TeamContestEnrollment.status == "active")
         )
         if existing:
             # skip duplicates silently
@@ -236,6 +252,9 @@ async def enroll_teams(
             )
         )
 
+    if created:
+        forget_teams(enr.team_id for enr in created)
+        await invalidate_leaderboards([contest.id])
     return created
 
 
@@ -245,7 +264,7 @@ async def unenroll(
     body: UnenrollBulkRequest,
     current_user: User = Depends(get_admin_user),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await get_cached_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -271,9 +290,9 @@ async def unenroll(
             except Exception:
                 continue
             enr = await TeamContestEnrollment.find_one(
-                (TeamContestEnrollment.team_id == toid)
-                & (TeamContestEnrollment.contest_id == contest.id)
-                & (TeamContestEnrollment.status == EnrollmentStatus.ACTIVE)
+                (TeamContestEnrollment.team_id == toid),
+                (TeamContestEnrollment.contest_id == contest.id),
+                (TeamContestEnrollment.status == EnrollmentStatus.ACTIVE)
             )
             if enr:
                 enr.status = EnrollmentStatus.REMOVED
@@ -305,6 +324,8 @@ async def unenroll(
         except Exception:
             # Best-effort cleanup; ignore errors
             pass
+        forget_teams(affected_team_ids)
+        await remove_teams(affected_team_ids, contest_ids=[contest.id])
 
     return {"unenrolled": count}
 
@@ -336,7 +357,7 @@ async def get_player_points(
     contest_id: str,
     current_user: User = Depends(get_admin_user),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await get_cached_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -367,7 +388,7 @@ async def upsert_player_points(
     body: PlayerPointsBulkUpsertRequest,
     current_user: User = Depends(get_admin_user),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await get_cached_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -385,6 +406,8 @@ async def upsert_player_points(
 
     # Upsert
     updated_docs: list[PlayerContestPoints] = []
+    # player id -> change in contest points, applied to the leaderboard store afterwards
+    contest_deltas: Dict[str, float] = {}
     now = now_ist()
     for poid, pts in valid_items:
         existing = await PlayerContestPoints.find_one({
@@ -392,6 +415,7 @@ async def upsert_player_points(
             "player_id": poid,
         })
         if existing:
+            contest_deltas[str(poid)] = contest_deltas.get(str(poid), 0.0) + pts - float(existing.points or 0.0)
             existing.points = pts
             existing.updated_at = now
             await existing.save()
@@ -405,6 +429,8 @@ async def upsert_player_points(
             )
             await doc.insert()
             updated_docs.append(doc)
+            contest_deltas[str(poid)] = contest_deltas.get(str(poid), 0.0) + pts
+    await apply_contest_point_changes(contest.id, contest_deltas)
 
     # Build response with player details
     pid_set = [doc.player_id for doc in updated_docs]
@@ -424,6 +450,7 @@ async def upsert_player_points(
             updated_at=doc.updated_at,
         ))
     # If this is a full contest (not daily), mirror these points into Player.points
+    global_deltas: Dict[str, float] = {}
     try:
         if contest.contest_type != "daily" and updated_docs:
             # Batch update players so that Player.points equals the contest total for this contest
@@ -431,14 +458,61 @@ async def upsert_player_points(
                 try:
                     player = await Player.get(doc.player_id)
                     if player:
-                        player.points = float(doc.points or 0.0)
+                        new_points = float(doc.points or 0.0)
+                        global_deltas[str(player.id)] = global_deltas.get(str(player.id), 0.0) + new_points - float(player.points or 0.0)
+                        player.points = new_points
                         player.updated_at = now_ist()
                         await player.save()
+                        publish_local(PLAYERS, player.id)
                 except Exception:
                     # continue best-effort for each player, do not fail the response
                     continue
     except Exception:
         # Non-blocking
         pass
+    await apply_global_point_changes(global_deltas)
 
     return resp
+
+
+class FinalizeResponse(BaseModel):
+    contest_id: str
+    version: int
+    teams: int
+    pages: int
+    finalized_at: datetime
+
+
+@router.post("/{contest_id}/finalize", response_model=FinalizeResponse)
+@admission_class(BULK)
+async def finalize_contest_standings(
+    contest_id: str,
+    refinalize: bool = Query(False),
+    current_user: User = Depends(get_admin_user),
+):
+    """Freeze the standings of an ended contest; later views are served from the snapshot.
+
+    Points changed after finalization only show once the contest is
+    re-finalized with refinalize=true.
+    """
+    contest = await Contest.get(contest_id)
+    if not contest:
+        raise HTTPException(status_code=404, detail="Contest not found")
+    if to_ist(contest.end_at) > now_ist():
+        raise HTTPException(status_code=400, detail="Contest has not ended yet")
+    if contest.finalized_version is not None and not refinalize:
+        raise HTTPException(status_code=409, detail="Contest is already finalized. Use refinalize=true to rebuild its standings.")
+
+    try:
+        result = await finalize_contest(contest)
+    except FinalizeConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    # The live ranking is no longer read
+    await invalidate_leaderboards([contest.id])
+    return FinalizeResponse(
+        contest_id=result.contest_id,
+        version=result.version,
+        teams=result.teams,
+        pages=result.pages,
+        finalized_at=to_ist(result.finalized_at),
+    )
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.common.metrics.slow_queries import get_slow_query_recorder
+from app.schemas.admin.diagnostics import SlowQueryListResponse
+from app.utils.dependencies import get_admin_user
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/diagnostics", tags=["Admin - Diagnostics"])
+
+
+@router.get("/slow-queries", response_model=SlowQueryListResponse)
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=500, description="Max query shapes to return"),
+    current_user: User = Depends(get_admin_user),
+):
+    """
+    Slowest query shapes seen since startup, with explain flags
+    (COLLSCAN, IN_MEMORY_SORT, UNWIND). Requires SLOW_QUERY_ENABLED.
+    """
+    recorder = get_slow_query_recorder()
+    if recorder is None:
+        return SlowQueryListResponse(enabled=False, queries=[])
+    return SlowQueryListResponse(
+        enabled=True,
+        threshold_ms=recorder.threshold_ms,
+        queries=[entry.to_dict() for entry in recorder.worst(limit)],
+    )
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(current_user: User = Depends(get_admin_user)):
+    """Reset the slow-query buffer (e.g. after adding an index)."""
+    recorder = get_slow_query_recorder()
+    if recorder is not None:
+        recorder.clear()
+    return {"message": "Slow query log cleared"}
@@ -4,16 +4,22 @@ from beanie.operators import RegEx, Or, And
 from datetime import datetime
 
 from app.models.admin.player import Player
-from app.models.team import Team
-from app.models.player import Player as PublicPlayer
 from beanie import PydanticObjectId
 from app.schemas.admin.player import (
     PlayerCreate,
     PlayerUpdate,
     PlayerResponse,
     PlayerListResponse,
+    TeamRecomputeJobResponse,
+    TeamRecomputeRequest,
 )
 from app.utils.dependencies import get_admin_user
+from app.services.queries import find_page
+from app.services.leaderboard_store import apply_global_point_changes
+from app.services.team_totals import start_team_recompute
+from app.models.admin.team_recompute_job import TeamRecomputeJob
+from app.common.guards.admission import BULK, admission_class
+from app.common.invalidation import DELETE, INSERT, PLAYERS, publish_local
 from app.models.user import User
 
 router = APIRouter(prefix="/api/admin/players", tags=["Admin - Players"]) 
@@ -53,16 +59,10 @@ async def get_players(
     else:
         query = Player.find_all()
     
-    # Get total count
-    total = await query.count()
-    
-    # Apply sorting
+    # Apply sorting and pagination; total count comes back in the same round trip
     sort_direction = -1 if sort_order == "desc" else 1
-    query = query.sort((sort_by, sort_direction))
-    
-    # Apply pagination
     skip = (page - 1) * page_size
-    players = await query.skip(skip).limit(page_size).to_list()
+    players, total = await find_page(query, skip=skip, limit=page_size, sort=[(sort_by, sort_direction)])
     
     # Convert to response format
     player_responses = [
@@ -151,6 +151,7 @@ async def create_player(
     )
     
     await player.insert()
+    publish_local(PLAYERS, player.id, INSERT)
     
     return PlayerResponse(
         id=str(player.id),
@@ -184,48 +185,24 @@ async def update_player(
     
     # Update only provided fields
     update_data = player_data.model_dump(exclude_unset=True)
+    recompute_job_id = None
     
     if update_data:
+        previous_points = float(player.points or 0.0)
         for field, value in update_data.items():
             setattr(player, field, value)
         
         player.updated_at = datetime.utcnow()
         await player.save()
+        publish_local(PLAYERS, player.id)
 
-        # If points changed, recompute totals for all impacted teams
-        if "points" in update_data:
-            # Teams store player_ids as strings of ObjectId
-            impacted_teams = await Team.find({"player_ids": player_id}).to_list()
-
-            # Collect all needed player ObjectIds in one pass
-            all_player_ids = set()
-            team_player_ids_map = {}
-            for team in impacted_teams:
-                player_object_ids = []
-                for pid in team.player_ids:
-                    try:
-                        obj_id = PydanticObjectId(pid)
-                        player_object_ids.append(obj_id)
-                        all_player_ids.add(obj_id)
-                    except Exception:
-                        continue
-                team_player_ids_map[team.id] = player_object_ids
-
-            # Fetch all players needed across all teams in a single query
-            players = []
-            if all_player_ids:
-                players = await PublicPlayer.find({"_id": {"$in": list(all_player_ids)}}).to_list()
-
-            # Build lookup of player -> points
-            player_points_map = {p.id: float(p.points or 0.0) for p in players}
+        # Totals of the teams that picked this player are recomputed in the background
+        if "points" in update_data or "price" in update_data:
+            job = await start_team_recompute("player_update", [player_id], requested_by=str(current_user.id))
+            recompute_job_id = str(job.id)
 
-            # Update each team's total using the pre-fetched points
-            for team in impacted_teams:
-                player_object_ids = team_player_ids_map.get(team.id, [])
-                total = sum(player_points_map.get(obj_id, 0.0) for obj_id in player_object_ids)
-                team.total_points = total
-                team.updated_at = datetime.utcnow()
-                await team.save()
+        if "points" in update_data:
+            await apply_global_point_changes({player_id: float(player.points or 0.0) - previous_points})
     
     return PlayerResponse(
         id=str(player.id),
@@ -239,6 +216,7 @@ async def update_player(
         stats=player.stats,
         created_at=player.created_at,
         updated_at=player.updated_at,
+        recompute_job_id=recompute_job_id,
     )
 
 
@@ -257,5 +235,54 @@ async def delete_player(
         raise HTTPException(status_code=404, detail="Player not found")
     
     await player.delete()
+    publish_local(PLAYERS, player.id, DELETE)
+    # Teams that picked this player no longer score its points
+    await apply_global_point_changes({player_id: -float(player.points or 0.0)})
+    await start_team_recompute("player_delete", [player_id], requested_by=str(current_user.id))
     
     return None
+
+
+def _job_response(job: TeamRecomputeJob) -> TeamRecomputeJobResponse:
+    return TeamRecomputeJobResponse(
+        id=str(job.id),
+        reason=job.reason,
+        player_ids=job.player_ids,
+        status=job.status.value,
+        total_teams=job.total_teams,
+        processed_teams=job.processed_teams,
+        batches=job.batches,
+        progress=job.progress,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+    )
+
+
+@router.post("/recompute-totals", response_model=TeamRecomputeJobResponse, status_code=202)
+@admission_class(BULK)
+async def recompute_team_totals(
+    payload: TeamRecomputeRequest,
+    current_user: User = Depends(get_admin_user),
+):
+    """
+    Recompute total points and value of the teams picking the given players
+    (every team when omitted), e.g. after a bulk player import.
+    Runs in the background; poll the returned job for progress.
+    """
+    job = await start_team_recompute("manual", payload.player_ids, requested_by=str(current_user.id))
+    return _job_response(job)
+
+
+@router.get("/recompute-totals/{job_id}", response_model=TeamRecomputeJobResponse)
+async def get_recompute_job(
+    job_id: str,
+    current_user: User = Depends(get_admin_user),
+):
+    """Progress of a team totals recompute."""
+    job = await TeamRecomputeJob.get(job_id) if PydanticObjectId.is_valid(job_id) else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Recompute job not found")
+    return _job_response(job)
+
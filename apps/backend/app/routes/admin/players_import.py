@@ -1,10 +1,9 @@
 """Admin players import routes"""
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query, Request
+from fastapi.responses import Response
 
 from app.models.user import User
-from app.models.admin.slot import Slot
 from app.models.admin.import_log import ImportLog
 from app.schemas.admin.player_import import (
     ImportResponse,
@@ -12,8 +11,11 @@ from app.schemas.admin.player_import import (
     ImportLogListResponse,
 )
 from app.utils.dependencies import get_admin_user
-from app.utils.import_players.import_template import generate_xlsx_template, generate_csv_template
+from app.services.queries import find_page
+from app.services.import_templates import import_templates
 from app.services.player_import.import_service import PlayerImportService
+from app.common.responses import etag_matches, not_modified
+from app.common.guards.admission import BULK, admission_class
 
 
 router = APIRouter(prefix="/api/admin/players/import", tags=["Admin - Players Import"])
@@ -21,45 +23,35 @@ router = APIRouter(prefix="/api/admin/players/import", tags=["Admin - Players Im
 
 @router.get("/template")
 async def get_template(
+    request: Request,
     format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
     current_user: User = Depends(get_admin_user),
 ):
     """
     Download import template file
     
+    The template is served from a per-worker cache keyed by the current slot
+    codes, with an ETag so an unchanged template is answered with a 304.
+    
     Args:
         format: File format (xlsx or csv)
         
     Returns:
         Template file download
     """
-    if format == "xlsx":
-        # Get current slot codes for dropdown
-        slots = await Slot.find_all().limit(50).to_list()
-        slot_codes = [slot.code for slot in slots]
-        
-        template_file = await generate_xlsx_template(slot_codes)
-        
-        return StreamingResponse(
-            template_file,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename=players_import_template.xlsx"
-            }
-        )
-    else:  # csv
-        template_content = generate_csv_template()
-        
-        return StreamingResponse(
-            iter([template_content]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=players_import_template.csv"
-            }
-        )
+    template = await import_templates.get(format)
+    headers = {
+        "Content-Disposition": f"attachment; filename={template.filename}",
+        "Cache-Control": "private, no-cache",
+        "ETag": template.etag,
+    }
+    if etag_matches(request, template.etag):
+        return not_modified(template.etag, headers)
+    return Response(content=template.body, media_type=template.media_type, headers=headers)
 
 
 @router.post("", response_model=ImportResponse)
+@admission_class(BULK)
 async def import_players(
     file: UploadFile = File(...),
     dry_run: bool = Form(True),
@@ -109,10 +101,8 @@ async def get_import_logs(
 ):
     """Get import history logs"""
     query = ImportLog.find(ImportLog.user_id == str(current_user.id))
-    total = await query.count()
-    
     skip = (page - 1) * page_size
-    logs = await query.sort([("started_at", -1)]).skip(skip).limit(page_size).to_list()
+    logs, total = await find_page(query, skip=skip, limit=page_size, sort=[("started_at", -1)])
     
     log_responses = [
         ImportLogResponse(
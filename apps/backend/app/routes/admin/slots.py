@@ -3,7 +3,6 @@ from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel
 from beanie.operators import RegEx, Or, And
-from beanie import PydanticObjectId
 
 from app.models.admin.slot import Slot
 from app.models.admin.player import Player as AdminPlayer
@@ -18,6 +17,17 @@ from app.schemas.admin.player import (
     PlayerListResponse,
 )
 from app.utils.dependencies import get_admin_user
+from app.common.guards.admission import BULK, admission_class
+from app.services.queries import find_page
+from app.common.invalidation import DELETE, INSERT, PLAYERS, SLOTS, publish_local
+from app.services.slot_assignments import (
+    SlotWriteStats,
+    assign_players,
+    clear_slot,
+    migrate_legacy_slots,
+    slot_has_players,
+    unassign_players,
+)
 from app.models.user import User
 
 router = APIRouter(prefix="/api/admin/slots", tags=["Admin - Slots"])
@@ -60,9 +70,8 @@ async def get_slots(
     else:
         query = Slot.find_all()
 
-    total = await query.count()
     skip = (page - 1) * page_size
-    slots = await query.skip(skip).limit(page_size).to_list()
+    slots, total = await find_page(query, skip=skip, limit=page_size)
 
     slot_responses = []
     for slot in slots:
@@ -77,6 +86,7 @@ async def get_slots(
 
 
 @router.post("/migrate")
+@admission_class(BULK)
 async def migrate_slots_from_players(
     dry_run: bool = Query(False, description="When true, does not write changes; returns a plan only."),
     current_user: User = Depends(get_admin_user),
@@ -85,84 +95,11 @@ async def migrate_slots_from_players(
 
     - Creates Slots with code `SLOT_<VALUE>` and name `Slot <VALUE>` for any non-ObjectId values.
     - Updates players whose `slot` equals the legacy value to the new Slot ObjectId string.
-    - Returns a summary of created slots and updated players counts.
-    """
-    players_with_slots = await AdminPlayer.find(AdminPlayer.slot != None).to_list()
-    legacy_values = set()
-    for p in players_with_slots:
-        if p.slot:
-            legacy_values.add(p.slot)
-
-    created = []
-    updated_counts = {}
-
-    for val in legacy_values:
-        # If val matches an existing Slot id, prefer that
-        slot_doc = None
-        # Treat as id only if it's a valid ObjectId
-        try:
-            oid = PydanticObjectId(val)  # may raise
-            slot_doc = await Slot.get(oid)
-        except Exception:
-            slot_doc = None
-        if not slot_doc:
-            # Create a new slot with code/name derived from legacy value if missing
-            code = f"SLOT_{str(val).upper()}"
-            name = f"Slot {val}"
-            # Ensure uniqueness for code/name variants
-            existing_by_code = await Slot.find_one(Slot.code == code)
-            if existing_by_code:
-                slot_doc = existing_by_code
-            else:
-                existing_by_name = await Slot.find_one(Slot.name == name)
-                if existing_by_name:
-                    slot_doc = existing_by_name
-                else:
-                    if not dry_run:
-                        slot_doc = Slot(
-                            code=code,
-                            name=name,
-                            min_select=4,
-                            max_select=4,
-                            created_at=datetime.utcnow(),
-                            updated_at=datetime.utcnow(),
-                        )
-                        await slot_doc.insert()
-                    created.append({"legacy": val, "code": code, "name": name})
-
-        if slot_doc:
-            # Normalize players pointing to this legacy value
-            numeric_alt = None
-            if isinstance(val, str) and val.isdigit():
-                try:
-                    numeric_alt = int(val)
-                except Exception:
-                    numeric_alt = None
-
-            if not dry_run:
-                conditions = [AdminPlayer.slot == val]
-                if numeric_alt is not None:
-                    conditions.append(AdminPlayer.slot == numeric_alt)
-                query = AdminPlayer.find(Or(*conditions)) if len(conditions) > 1 else AdminPlayer.find(AdminPlayer.slot == val)
-                players_to_update = await query.to_list()
-
-                for p in players_to_update:
-                    p.slot = str(slot_doc.id)
-                    await p.save()
-                updated_counts[str(val)] = len(players_to_update)
-            else:
-                conditions = [AdminPlayer.slot == val]
-                if numeric_alt is not None:
-                    conditions.append(AdminPlayer.slot == numeric_alt)
-                query = AdminPlayer.find(Or(*conditions)) if len(conditions) > 1 else AdminPlayer.find(AdminPlayer.slot == val)
-                count = await query.count()
-                updated_counts[str(val)] = count
+    - Returns a summary of created slots and updated players counts, plus round trips and timing.
 
-    return {
-        "dry_run": dry_run,
-        "created_slots": created,
-        "normalized_players": updated_counts,
-    }
+    Distinct values come from one aggregation; all players are repointed with one bulk write.
+    """
+    return (await migrate_legacy_slots(dry_run=dry_run)).to_dict()
 
 
 @router.post("", response_model=SlotResponse, status_code=201)
@@ -192,6 +129,7 @@ async def create_slot(
         updated_at=now,
     )
     await slot.insert()
+    publish_local(SLOTS, slot.id, INSERT)
     return await build_slot_response(slot)
 
 
@@ -230,6 +168,7 @@ async def update_slot(
         setattr(slot, k, v)
     slot.updated_at = datetime.utcnow()
     await slot.save()
+    publish_local(SLOTS, slot.id)
     return await build_slot_response(slot)
 
 
@@ -244,19 +183,16 @@ async def delete_slot(
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
 
-    players_in_slot = await AdminPlayer.find(AdminPlayer.slot == slot_id).to_list()
-    if players_in_slot and not force:
-        raise HTTPException(status_code=409, detail="Slot has assigned players. Use force=true to unassign and delete.")
-
-    unassigned = 0
-    if players_in_slot:
-        for player in players_in_slot:
-            player.slot = None
-            await player.save()
-        unassigned = len(players_in_slot)
+    if not force:
+        if await slot_has_players(slot_id):
+            raise HTTPException(status_code=409, detail="Slot has assigned players. Use force=true to unassign and delete.")
+        stats = SlotWriteStats()
+    else:
+        stats = await clear_slot(slot_id)
 
     await slot.delete()
-    return {"message": "Slot successfully deleted", "unassigned_players": unassigned}
+    publish_local(SLOTS, slot.id, DELETE)
+    return {"message": "Slot successfully deleted", "unassigned_players": stats.modified, "stats": stats.to_dict()}
 
 
 @router.get("/{slot_id}/players", response_model=PlayerListResponse)
@@ -279,9 +215,8 @@ async def get_slot_players(
         conditions.append(AdminPlayer.team == team)
 
     query = AdminPlayer.find(And(*conditions)) if len(conditions) > 1 else AdminPlayer.find(AdminPlayer.slot == slot_id)
-    total = await query.count()
     skip = (page - 1) * page_size
-    players = await query.skip(skip).limit(page_size).to_list()
+    players, total = await find_page(query, skip=skip, limit=page_size)
 
     return {
         "players": [
@@ -314,14 +249,8 @@ async def assign_players_to_slot(
     slot = await Slot.get(slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
-    assigned = 0
-    for pid in body.player_ids:
-        player = await AdminPlayer.get(pid)
-        if player:
-            player.slot = str(slot.id)
-            await player.save()
-            assigned += 1
-    return {"assigned": assigned}
+    stats = await assign_players(str(slot.id), body.player_ids)
+    return {"assigned": stats.matched, "stats": stats.to_dict()}
 
 
 @router.delete("/{slot_id}/players/{player_id}")
@@ -340,6 +269,7 @@ async def unassign_player_from_slot(
         return {"unassigned": 0}
     player.slot = None
     await player.save()
+    publish_local(PLAYERS, player.id)
     return {"unassigned": 1}
 
 
@@ -352,11 +282,5 @@ async def bulk_unassign_players_from_slot(
     slot = await Slot.get(slot_id)
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
-    count = 0
-    for pid in body.player_ids:
-        player = await AdminPlayer.get(pid)
-        if player and player.slot == slot_id:
-            player.slot = None
-            await player.save()
-            count += 1
-    return {"unassigned": count}
+    stats = await unassign_players(slot_id, body.player_ids)
+    return {"unassigned": stats.modified, "stats": stats.to_dict()}
@@ -5,31 +5,36 @@ from beanie import PydanticObjectId
 from app.models.user import User
 from app.models.team import Team
 from app.models.team_contest_enrollment import TeamContestEnrollment
-from app.models.contest import Contest
+from app.services.contest_cache import get_contest
 from app.utils.dependencies import get_admin_user
+from app.services.queries import count_by, find_page
+from app.common.metrics import query_budget
+from app.common.guards.admission import HEAVY, admission_class
 
 router = APIRouter(prefix="/api/admin", tags=["Admin - Users & Teams"])
 
 
 @router.get("/users-with-teams")
+@query_budget(3)
+@admission_class(HEAVY)
 async def users_with_teams(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None, description="Search username or full_name"),
     current_user: User = Depends(get_admin_user),
 ):
-    # naive approach: filter users by search, then count teams per user
+    # filter users by search, then count teams for the whole page in one aggregation
     q = User.find_all()
     if search:
         from beanie.operators import Or, RegEx
         q = User.find(Or(RegEx(User.username, search, options="i"), RegEx(User.full_name, search, options="i")))
-    total = await q.count()
     skip = (page - 1) * page_size
-    users = await q.skip(skip).limit(page_size).to_list()
+    users, total = await find_page(q, skip=skip, limit=page_size)
 
+    team_counts = await count_by(Team, "user_id", [u.id for u in users])
     results = []
     for u in users:
-        count = await Team.find(Team.user_id == u.id).count()
+        count = team_counts.get(str(u.id), 0)
         if count > 0:
             results.append({
                 "user_id": str(u.id),
@@ -64,13 +69,12 @@ async def get_user_teams_admin(
         raise HTTPException(status_code=404, detail="User not found")
 
     q = Team.find(Team.user_id == user.id)
-    total = await q.count()
     skip = (page - 1) * page_size
-    teams = await q.skip(skip).limit(page_size).sort(-Team.created_at).to_list()
+    teams, total = await find_page(q, skip=skip, limit=page_size, sort=[-Team.created_at])
 
     enrollments_map = {}
     if contest_id:
-        contest = await Contest.get(contest_id)
+        contest = await get_contest(contest_id)
         if contest:
             team_ids = [t.id for t in teams]
             if team_ids:
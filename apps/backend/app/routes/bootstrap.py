@@ -0,0 +1,127 @@
+import asyncio
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Request, Response
+
+from app.models.admin.slot import Slot
+from app.models.player import Player
+from app.models.sponsor import Sponsor
+from app.schemas.bootstrap import BootstrapResponse
+from app.schemas.sponsor import SponsorResponse
+from app.routes.contests import to_contest_response, _compute_status
+from app.routes.slots import to_public
+from app.routes.sponsors import sponsor_to_response
+from app.services import hot_players as hot_svc
+from app.services.bootstrap import CachedSection, encode_with_etag
+from app.services.carousel_feed import carousel_feed
+from app.services.contest_cache import contest_cache
+from app.common.consts.index import HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
+from app.common.enums.contests import ContestStatus, ContestVisibility
+from app.common.invalidation import PLAYERS, SLOTS, SPONSORS
+from app.common.metrics import query_budget
+from app.common.responses import etag_matches, not_modified
+from app.services.queries import count_by, find_page
+from config.settings import settings
+
+router = APIRouter(prefix="/api/bootstrap", tags=["bootstrap"])
+
+# Same page sizes as the endpoints each section stands in for
+SPONSORS_PAGE_SIZE = 100
+CONTESTS_PAGE_SIZE = 10
+SLOTS_PAGE_SIZE = 20
+HOT_PLAYER_IDS_LIMIT = 1000
+
+# Clients revalidate with the ETag every time; the payload itself is cached server-side
+BOOTSTRAP_CACHE_CONTROL = "no-cache"
+
+
+async def _load_sponsors() -> List[Dict[str, Any]]:
+    sponsors, _ = await find_page(
+        Sponsor.find({"active": True}),
+        skip=0,
+        limit=SPONSORS_PAGE_SIZE,
+        sort=["+priority", "-created_at"],
+    )
+    return [SponsorResponse(**sponsor_to_response(s)).model_dump(mode="json", by_alias=True) for s in sponsors]
+
+
+async def _load_slots() -> Dict[str, Any]:
+    slots, total = await find_page(Slot.find_all(), skip=0, limit=SLOTS_PAGE_SIZE)
+    counts = await count_by(Player, "slot", [str(s.id) for s in slots])
+    return {
+        "slots": [to_public(s, counts.get(str(s.id), 0)).model_dump(mode="json") for s in slots],
+        "total": total,
+    }
+
+
+async def _load_hot_player_ids() -> Dict[str, Any]:
+    rows = await hot_svc.aggregate_hot_global(skip=0, limit=HOT_PLAYER_IDS_LIMIT)
+    thr = HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
+    ids = [str(r["_id"]) for r in rows if int(r.get("selection_count", 0)) >= thr and r.get("_id")]
+    return {"player_ids": ids, "threshold": thr}
+
+
+_ttl = settings.bootstrap_cache_ttl_seconds
+_sponsors = CachedSection("sponsors", _load_sponsors, _ttl, collections=[SPONSORS])
+_slots = CachedSection("slots", _load_slots, _ttl, collections=[SLOTS, PLAYERS])
+# Selection counts move with every team write; bounded by the TTL only
+_hot_player_ids = CachedSection("hot_player_ids", _load_hot_player_ids, _ttl)
+
+
+async def _carousel() -> List[Dict[str, Any]]:
+    return list((await carousel_feed.get()).images)
+
+
+async def _contests_by_status() -> Dict[ContestStatus, Dict[str, Any]]:
+    """Public live and ongoing contests from the contest cache; status depends on the clock, so never cached."""
+    by_status: Dict[ContestStatus, list] = {ContestStatus.ONGOING: [], ContestStatus.LIVE: []}
+    for contest in await contest_cache.all():
+        if contest.visibility != ContestVisibility.PUBLIC:
+            continue
+        status = _compute_status(contest)
+        if status in by_status:
+            by_status[status].append(contest)
+    pages = {}
+    for status, contests in by_status.items():
+        contests.sort(key=lambda c: c.start_at, reverse=True)
+        pages[status] = {
+            "contests": [
+                (await to_contest_response(c)).model_dump(mode="json") for c in contests[:CONTESTS_PAGE_SIZE]
+            ],
+            "total": len(contests),
+            "page": 1,
+            "page_size": CONTESTS_PAGE_SIZE,
+        }
+    return pages
+
+
+@router.get("", response_model=BootstrapResponse)
+@query_budget(6)
+async def get_bootstrap(request: Request):
+    """
+    Homepage data in one round trip: active sponsors, the carousel feed, ongoing
+    and live contests, slots and hot player ids.
+
+    Sections come from per-worker caches invalidated on admin writes. Send the
+    ETag back in If-None-Match to get an empty 304 when nothing changed.
+    """
+    sponsors, carousel, contests, slots, hot_players = await asyncio.gather(
+        _sponsors.get(),
+        _carousel(),
+        _contests_by_status(),
+        _slots.get(),
+        _hot_player_ids.get(),
+    )
+    body, etag = encode_with_etag({
+        "sponsors": sponsors,
+        "carousel": carousel,
+        "ongoing_contests": contests[ContestStatus.ONGOING],
+        "live_contests": contests[ContestStatus.LIVE],
+        "slots": slots,
+        "hot_players": hot_players,
+    })
+    headers = {"Cache-Control": BOOTSTRAP_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+    return Response(content=body, media_type="application/json", headers={**headers, "ETag": etag})
+
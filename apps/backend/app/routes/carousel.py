@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, Response
 from typing import Optional
 from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
 from pymongo.errors import DuplicateKeyError
 
 from app.models.carousel import CarouselImage
@@ -14,11 +16,21 @@ from app.schemas.carousel import (
     ReorderRequest
 )
 from app.utils.dependencies import get_current_active_user
+from app.services.queries import find_page
 from app.utils.gridfs import (
     upload_carousel_image_to_gridfs,
     open_carousel_image_stream,
     delete_carousel_image_from_gridfs,
 )
+from app.common.invalidation import CAROUSEL, DELETE, INSERT, invalidation_bus, publish_local
+from app.common.responses import RawJSONResponse, etag_matches, not_modified
+from app.services.carousel_feed import (
+    carousel_feed,
+    drop_position,
+    image_version,
+    save_positions,
+    versioned_image_url,
+)
 
 router = APIRouter(prefix="/api/v1/carousel", tags=["carousel"])
 
@@ -30,13 +42,21 @@ def carousel_to_response(carousel: CarouselImage) -> dict:
     # Convert HttpUrl to string for JSON serialization
     if carousel_dict.get("link_url"):
         carousel_dict["link_url"] = str(carousel_dict["link_url"])
+    carousel_dict["image_url"] = versioned_image_url(carousel_dict)
     return carousel_dict
 
 
+# Homepage clients may reuse the feed briefly, then revalidate with its ETag
+FEED_CACHE_CONTROL = "public, max-age=60"
+# A versioned image URL never changes content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
 # Public endpoints (no authentication required)
 
 @router.get("/", response_model=CarouselImagesListResponse)
 async def get_carousel_images(
+    request: Request,
     active: Optional[bool] = Query(True, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(100, ge=1, le=100, description="Items per page")
@@ -47,22 +67,39 @@ async def get_carousel_images(
     - **active**: Filter by active status (default: true, only active images)
     - **page**: Page number for pagination
     - **page_size**: Number of items per page (max 100)
+
+    Active images are served from the cached feed, without querying MongoDB.
     """
+    if active:
+        feed = await carousel_feed.get()
+        etag = f'"{feed.version}-{page}-{page_size}"'
+        headers = {"Cache-Control": FEED_CACHE_CONTROL}
+        if etag_matches(request, etag):
+            return not_modified(etag, headers)
+        skip = (page - 1) * page_size
+        return RawJSONResponse(
+            {
+                "images": list(feed.images[skip:skip + page_size]),
+                "total": len(feed.images),
+                "page": page,
+                "page_size": page_size,
+            },
+            headers={**headers, "ETag": etag},
+        )
+
     # Build query
     query = {}
     
     if active is not None:
         query["active"] = active
     
-    # Get total count
-    total = await CarouselImage.find(query).count()
-    
-    # Get carousel images with pagination, sorted by display_order and created_at
-    images = await CarouselImage.find(query)\
-        .sort("+display_order", "+created_at")\
-        .skip((page - 1) * page_size)\
-        .limit(page_size)\
-        .to_list()
+    # Get carousel images with pagination (sorted by display_order and created_at) and total count
+    images, total = await find_page(
+        CarouselImage.find(query),
+        skip=(page - 1) * page_size,
+        limit=page_size,
+        sort=["+display_order", "+created_at"],
+    )
     
     return CarouselImagesListResponse(
         images=[CarouselImageResponse(**carousel_to_response(img)) for img in images],
@@ -72,15 +109,41 @@ async def get_carousel_images(
     )
 
 
+@router.get("/feed")
+async def get_carousel_feed(request: Request):
+    """
+    Active carousel images in display order (Public endpoint)
+
+    Returns {"version", "images"}. The feed is rebuilt only after an admin change,
+    its version is the ETag, and image URLs carry content hashes (?v=) so they
+    can be cached indefinitely.
+    """
+    feed = await carousel_feed.get()
+    headers = {"Cache-Control": FEED_CACHE_CONTROL}
+    if etag_matches(request, feed.etag):
+        return not_modified(feed.etag, headers)
+    return Response(content=feed.body, media_type="application/json", headers={**headers, "ETag": feed.etag})
+
+
 @router.get("/{carousel_id}/image")
-async def get_carousel_image(carousel_id: str):
+async def get_carousel_image(
+    carousel_id: str,
+    request: Request,
+    v: Optional[str] = Query(None, description="Content version from the feed's image_url"),
+):
     """Serve the carousel image file (Public endpoint)"""
     carousel = await CarouselImage.get(carousel_id)
     if not carousel or not carousel.image_file_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    version = image_version({"image_hash": carousel.image_hash, "image_file_id": carousel.image_file_id})
+    etag = f'"{version}"'
+    # Only the current version may be cached for good; anything else revalidates
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL if v == version else "no-cache", "ETag": etag}
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
     stream, content_type = await open_carousel_image_stream(carousel.image_file_id)
     data = await stream.read()
-    return Response(content=data, media_type=content_type)
+    return Response(content=data, media_type=content_type, headers=headers)
 
 
 # Admin endpoints (authentication required)
@@ -106,6 +169,8 @@ async def create_carousel_image(
     # Create new carousel image
     carousel = CarouselImage(**data)
     await carousel.insert()
+    await save_positions({str(carousel.id): carousel.display_order})
+    publish_local(CAROUSEL, carousel.id, INSERT)
     
     return CarouselImageResponse(**carousel_to_response(carousel))
 
@@ -154,10 +219,13 @@ async def update_carousel_image(
     # Update fields
     update_data = carousel_data.model_dump(exclude_unset=True)
     if update_data:
+        if update_data.get("display_order") is not None:
+            await save_positions({str(carousel.id): update_data["display_order"]})
         update_data["updated_at"] = datetime.utcnow()
         for field, value in update_data.items():
             setattr(carousel, field, value)
         await carousel.save()
+        publish_local(CAROUSEL, carousel.id)
     
     return CarouselImageResponse(**carousel_to_response(carousel))
 
@@ -186,6 +254,8 @@ async def delete_carousel_image(
         await delete_carousel_image_from_gridfs(carousel.image_file_id)
     
     await carousel.delete()
+    await drop_position(carousel.id)
+    publish_local(CAROUSEL, carousel.id, DELETE)
     return None
 
 
@@ -218,14 +288,16 @@ async def upload_carousel_image(
     
     # Save new image to GridFS
     try:
-        file_id = await upload_carousel_image_to_gridfs(file, filename_prefix=f"carousel_{carousel_id}")
-        # Update carousel with API URL and file id
+        file_id, content_hash = await upload_carousel_image_to_gridfs(file, filename_prefix=f"carousel_{carousel_id}")
+        # Update carousel with API URL, file id and content hash
         carousel.image_file_id = file_id
+        carousel.image_hash = content_hash
         carousel.image_url = f"/api/v1/carousel/{carousel_id}/image"
         carousel.updated_at = datetime.utcnow()
         await carousel.save()
+        publish_local(CAROUSEL, carousel.id)
         return UploadResponse(
-            url=carousel.image_url,
+            url=versioned_image_url(carousel.model_dump()),
             message="Image uploaded successfully"
         )
     except HTTPException:
@@ -258,6 +330,7 @@ async def toggle_active(
     carousel.active = not carousel.active
     carousel.updated_at = datetime.utcnow()
     await carousel.save()
+    publish_local(CAROUSEL, carousel.id)
     
     return CarouselImageResponse(**carousel_to_response(carousel))
 
@@ -272,16 +345,38 @@ async def reorder_carousel_images(
     
     Requires authentication. Updates the display_order for multiple carousel images.
     Expects a list of {id: str, display_order: int} objects.
+
+    The new order is first written to the carousel order document in one
+    atomic update, so the public feed switches to it all at once on every
+    worker. The images' own display_order is then updated in one bulk write.
     """
+    now = datetime.utcnow()
+    orders = {}
     for item in reorder_data.image_orders:
         carousel_id = item.get("id")
         new_order = item.get("display_order")
         
-        if carousel_id and new_order is not None:
-            carousel = await CarouselImage.get(carousel_id)
-            if carousel:
-                carousel.display_order = new_order
-                carousel.updated_at = datetime.utcnow()
-                await carousel.save()
+        if carousel_id and new_order is not None and ObjectId.is_valid(str(carousel_id)):
+            if not isinstance(new_order, int) or new_order < 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid display_order for {carousel_id}"
+                )
+            orders[ObjectId(str(carousel_id))] = new_order
+
+    updated = 0
+    collection = CarouselImage.get_motor_collection()
+    existing = await collection.distinct("_id", {"_id": {"$in": list(orders)}}) if orders else []
+    if existing:
+        await save_positions({str(oid): orders[oid] for oid in existing})
+        result = await collection.bulk_write(
+            [
+                UpdateOne({"_id": oid}, {"$set": {"display_order": orders[oid], "updated_at": now}})
+                for oid in existing
+            ],
+            ordered=False,
+        )
+        updated = result.matched_count
+        invalidation_bus.flush([CAROUSEL], reason="reorder")
     
-    return {"message": "Carousel images reordered successfully"}
+    return {"message": "Carousel images reordered successfully", "updated": updated}
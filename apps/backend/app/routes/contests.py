@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
-from typing import Optional, List, Dict, Annotated
+from typing import Any, Optional, List, Dict, Annotated
 from beanie import PydanticObjectId
 from beanie.operators import Or, RegEx
+from dataclasses import dataclass
 from datetime import datetime
 from pydantic import BaseModel
 from bson import ObjectId
@@ -15,14 +16,29 @@ from app.models.player import Player
 from app.models.player_contest_points import PlayerContestPoints
 from app.utils.security import decode_token
 from app.schemas.contest import ContestListResponse, ContestResponse
-from app.schemas.leaderboard import LeaderboardResponseSchema, LeaderboardEntrySchema
+from app.schemas.leaderboard import LeaderboardResponseSchema
 from app.utils.dependencies import get_current_active_user
+from app.services.queries import find_page
+from app.services.read_models import UserCard
+from app.services.standings import RankedStanding, compute_contest_standings
+from app.services.leaderboard_store import contest_scope, leaderboard_page, refresh_team
+from app.services.contest_snapshots import frozen_leaderboard_page, frozen_team_breakdown, is_finalized
+from app.services.team_locks import forget_teams
+from app.services.contest_cache import ContestSnapshot, get_contest
+from app.models.contest_standings import ContestTeamBreakdown
 from app.schemas.enrollment import EnrollmentResponse
 from app.common.enums.contests import ContestVisibility, ContestStatus
 from app.common.enums.enrollments import EnrollmentStatus
+from app.common.metrics import query_budget
+from app.common.singleflight import SingleFlight
+from app.common.guards.admission import HEAVY, TEAM_WRITE, admission_class
+from app.common.responses import RawJSONResponse
 
 router = APIRouter(prefix="/api/contests", tags=["contests"])
 
+# Concurrent views of the same contest team share one computation
+_contest_team_views = SingleFlight("get_team_in_contest", timeout=10.0)
+
 class EnrollRequest(BaseModel):
     team_id: str
 
@@ -45,7 +61,7 @@ class ContestTeamResponse(BaseModel):
     vice_captain_id: Optional[str] = None
     players: List[ContestTeamPlayerSchema]
 
-def _compute_status(contest: Contest) -> ContestStatus:
+def _compute_status(contest: ContestSnapshot) -> ContestStatus:
     now = now_ist()
     # Ensure contest times are in IST for comparison
     start = to_ist(contest.start_at)
@@ -57,15 +73,9 @@ def _compute_status(contest: Contest) -> ContestStatus:
     return ContestStatus.LIVE
 
 
-async def to_contest_response(contest: Contest, skip_save: bool = False) -> ContestResponse:
+async def to_contest_response(contest: ContestSnapshot, skip_save: bool = False) -> ContestResponse:
     # Derive status from time window to reflect real-time lifecycle
     computed = _compute_status(contest)
-    # Update in-memory status without persisting (saves go to DB asynchronously)
-    if contest.status != computed and contest.status != ContestStatus.ARCHIVED:
-        contest.status = computed
-        contest.updated_at = now_ist()
-        # Skip immediate save for performance; status updates are idempotent
-        # and will be persisted on next write operation or background task
     return ContestResponse(
         id=str(contest.id),
         code=contest.code,
@@ -77,9 +87,10 @@ async def to_contest_response(contest: Contest, skip_save: bool = False) -> Cont
         visibility=contest.visibility,
         points_scope=contest.points_scope,
         contest_type=contest.contest_type,
-        allowed_teams=contest.allowed_teams or [],
+        allowed_teams=list(contest.allowed_teams_ordered),
         created_at=to_ist(contest.created_at),
         updated_at=to_ist(contest.updated_at),
+        finalized_at=to_ist(contest.finalized_at) if contest.finalized_at else None,
     )
 
 
@@ -130,12 +141,11 @@ async def list_public_contests(
         for cond in conditions:
             query = query.find(cond)
 
-    total = await query.count()
     skip = (page - 1) * page_size
-    rows = await query.skip(skip).limit(page_size).sort("-start_at").to_list()
+    rows, total = await find_page(query, skip=skip, limit=page_size, sort=["-start_at"])
 
     # Convert to responses with computed status
-    items = [await to_contest_response(c) for c in rows]
+    items = [await to_contest_response(ContestSnapshot.from_document(c)) for c in rows]
     return {
         "contests": items,
         "total": total,
@@ -168,7 +178,7 @@ async def list_my_enrollments(current_user: User = Depends(get_current_active_us
 
 @router.get("/{contest_id}", response_model=ContestResponse)
 async def get_public_contest(contest_id: str):
-    contest = await Contest.get(contest_id)
+    contest = await get_contest(contest_id)
     if not contest or contest.visibility != ContestVisibility.PUBLIC:
         raise HTTPException(status_code=404, detail="Contest not found")
     return await to_contest_response(contest)
@@ -177,7 +187,7 @@ async def get_public_contest(contest_id: str):
 @router.get("/{contest_id}/me", response_model=ContestResponse)
 async def get_contest_if_enrolled(contest_id: str, current_user: User = Depends(get_current_active_user)):
     """Return contest details if it's public OR the current user is enrolled (active)."""
-    contest = await Contest.get(contest_id)
+    contest = await get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
     if contest.visibility == ContestVisibility.PUBLIC:
@@ -193,133 +203,52 @@ async def get_contest_if_enrolled(contest_id: str, current_user: User = Depends(
     return await to_contest_response(contest)
 
 
+def _leaderboard_entry(ranked: RankedStanding) -> Dict[str, Any]:
+    """A row shaped like LeaderboardEntrySchema."""
+    team, user = ranked.standing.team, ranked.standing.user
+    return {
+        "rank": ranked.rank,
+        "username": user.username,
+        "displayName": user.display_name,
+        "teamName": team.team_name,
+        "points": float(ranked.standing.points),
+        "rankChange": team.rank_change,
+        "avatarUrl": user.avatar_url,
+        "teamId": str(team.id) if team.id is not None else None,
+    }
+
+
 @router.get("/{contest_id}/leaderboard", response_model=LeaderboardResponseSchema)
+@query_budget(6)
+@admission_class(HEAVY)
 async def contest_leaderboard(
     contest_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     current_user: Optional[User] = Depends(get_optional_current_user),
 ):
-    contest = await Contest.get(contest_id)
+    contest = await get_contest(contest_id)
     if not contest or contest.visibility != ContestVisibility.PUBLIC:
         raise HTTPException(status_code=404, detail="Contest not found")
 
-    # fetch active enrollments
-    enrollments = await TeamContestEnrollment.find({
-        "contest_id": contest.id,
-        "status": EnrollmentStatus.ACTIVE,
-    }).to_list()
-
-    if not enrollments:
-        return LeaderboardResponseSchema(entries=[], currentUserEntry=None)
-
-    team_ids = [enr.team_id for enr in enrollments]
-
-    # fetch teams in batch
-    teams = await Team.find({"_id": {"$in": team_ids}}).to_list()
-    teams_by_id: Dict[str, Team] = {str(t.id): t for t in teams}
-
-    # fetch users in batch
-    user_ids = list({t.user_id for t in teams})
-    users = await User.find({"_id": {"$in": user_ids}}).to_list()
-    users_by_id: Dict[str, User] = {str(u.id): u for u in users}
-
-    # compute points and build entries using per-contest player points
-    # 1) Collect all player ObjectIds across enrolled teams
-    from bson import ObjectId as _OID
-    all_player_ids: set[PydanticObjectId] = set()
-    team_player_oids_map: Dict[str, list[PydanticObjectId]] = {}
-    for enr in enrollments:
-        team = teams_by_id.get(str(enr.team_id))
-        if not team:
-            continue
-        oids: list[PydanticObjectId] = []
-        for pid in team.player_ids:
-            if _OID.is_valid(pid):
-                try:
-                    oids.append(PydanticObjectId(pid))
-                except Exception:
-                    continue
-        team_player_oids_map[str(enr.team_id)] = oids
-        all_player_ids.update(oids)
-
-    # 2) Fetch all PlayerContestPoints for this contest once
-    pcp_docs = []
-    if all_player_ids:
-        pcp_docs = await PlayerContestPoints.find({
-            "contest_id": contest.id,
-            "player_id": {"$in": list(all_player_ids)},
-        }).to_list()
-
-    # 3) Build lookup: player_id(str) -> points(float)
-    pcp_points_map: Dict[str, float] = {str(doc.player_id): float(doc.points or 0.0) for doc in pcp_docs}
-
-    # 4) Sum per team and build computed list (apply C/VC multipliers)
-    computed = []
-    for enr in enrollments:
-        team = teams_by_id.get(str(enr.team_id))
-        if not team:
-            continue
-        user = users_by_id.get(str(team.user_id))
-        if not user:
-            continue
-        oids = team_player_oids_map.get(str(enr.team_id), [])
-        # Sum using string form to match map keys, with captain/vice multipliers
-        total = 0.0
-        captain_id = str(team.captain_id) if team.captain_id else None
-        vice_id = str(team.vice_captain_id) if team.vice_captain_id else None
-        for oid in oids:
-            pid = str(oid)
-            base = float(pcp_points_map.get(pid, 0.0))
-            if captain_id and pid == captain_id:
-                base *= 2.0
-            elif vice_id and pid == vice_id:
-                base *= 1.5
-            total += base
-        points = float(total)
-        computed.append((team, user, float(points)))
-
-    # sort by points desc
-    computed.sort(key=lambda tup: tup[2], reverse=True)
-
-    # pagination
-    sliced = computed[skip: skip + limit]
-
-    entries: List[LeaderboardEntrySchema] = []
-    current_user_entry: Optional[LeaderboardEntrySchema] = None
-
-    for idx, (team, user, points) in enumerate(sliced, start=skip + 1):
-        entry = LeaderboardEntrySchema(
-            rank=idx,
-            username=user.username,
-            displayName=user.full_name or user.username,
-            teamName=team.team_name,
-            points=points,
-            rankChange=team.rank_change,
-            avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-            teamId=str(team.id),
+    user = UserCard.from_user(current_user) if current_user else None
+    if is_finalized(contest):
+        page = await frozen_leaderboard_page(contest, skip=skip, limit=limit, user=user)
+    else:
+        page = await leaderboard_page(
+            contest_scope(contest.id),
+            lambda: compute_contest_standings(contest.id),
+            skip=skip,
+            limit=limit,
+            user=user,
         )
-        entries.append(entry)
-
-    if current_user:
-        # find current user's best-ranked team entry within this contest
-        for rank_idx, (team, user, points) in enumerate(computed, start=1):
-            if str(user.id) == str(current_user.id):
-                current_user_entry = LeaderboardEntrySchema(
-                    rank=rank_idx,
-                    username=user.username,
-                    displayName=user.full_name or user.username,
-                    teamName=team.team_name,
-                    points=points,
-                    rankChange=team.rank_change,
-                    avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-                    teamId=str(team.id),
-                )
-                break
-
-    return LeaderboardResponseSchema(entries=entries, currentUserEntry=current_user_entry)
+    return RawJSONResponse({
+        "entries": [_leaderboard_entry(entry) for entry in page.entries],
+        "currentUserEntry": _leaderboard_entry(page.current_user_entry) if page.current_user_entry else None,
+    })
 
 @router.post("/{contest_id}/enroll", response_model=EnrollmentResponse)
+@admission_class(TEAM_WRITE)
 async def enroll_in_contest(
     contest_id: str,
     body: EnrollRequest,
@@ -333,7 +262,7 @@ async def enroll_in_contest(
     - Team must belong to the current user
     - Idempotent: if already enrolled and active, return existing enrollment
     """
-    contest = await Contest.get(contest_id)
+    contest = await get_contest(contest_id)
     if not contest or contest.visibility != "public":
         raise HTTPException(status_code=404, detail="Contest not found")
 
@@ -356,7 +285,7 @@ async def enroll_in_contest(
         raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing")
 
     # If daily contest with restrictions: validate team players belong to allowed teams
-    if contest.contest_type == "daily" and contest.allowed_teams:
+    if contest.restricts_teams:
         # Load players of the team and ensure their real-world team is allowed
         from bson import ObjectId as _OID
         pid_oids = [PydanticObjectId(pid) for pid in team.player_ids if _OID.is_valid(pid)]
@@ -369,7 +298,7 @@ async def enroll_in_contest(
                     detail={
                         "message": "Team contains players from disallowed teams for this daily contest",
                         "disallowed_players": disallowed,
-                        "allowed_teams": contest.allowed_teams,
+                        "allowed_teams": list(contest.allowed_teams_ordered),
                     },
                 )
 
@@ -402,6 +331,8 @@ async def enroll_in_contest(
         enrolled_at=now_ist(),
     )
     await enr.insert()  # type: ignore
+    forget_teams([team.id])
+    await refresh_team(team, contest_ids=[contest.id], include_global=False)
 
     return EnrollmentResponse(
         id=str(enr.id),
@@ -414,12 +345,47 @@ async def enroll_in_contest(
     )
 
 
+@dataclass(frozen=True)
+class _ContestTeamView:
+    """Everything get_team_in_contest needs, independent of who asks."""
+
+    owner_id: str
+    computed_status: ContestStatus
+    response: Optional[ContestTeamResponse]  # None when the team is not enrolled
+
+
 @router.get("/{contest_id}/teams/{team_id}", response_model=ContestTeamResponse)
 async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optional[User] = Depends(get_optional_current_user)):
-    contest = await Contest.get(contest_id)
+    view = await _contest_team_views.do(
+        {"contest_id": contest_id, "team_id": team_id},
+        lambda: _contest_team_view(contest_id, team_id),
+    )
+
+    # Allow team owner anytime; others only when contest is ONGOING or COMPLETED
+    is_owner = current_user is not None and view.owner_id == str(current_user.id)
+    if not is_owner and view.computed_status not in (ContestStatus.ONGOING, ContestStatus.COMPLETED):
+        raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing or completed")
+
+    if view.response is None:
+        raise HTTPException(status_code=404, detail="Team is not enrolled in this contest")
+    return view.response
+
+
+async def _contest_team_view(contest_id: str, team_id: str) -> _ContestTeamView:
+    contest = await get_contest(contest_id)
     if not contest:
         raise HTTPException(status_code=404, detail="Contest not found")
 
+    computed_status = _compute_status(contest)
+    if is_finalized(contest):
+        frozen = await frozen_team_breakdown(contest, team_id)
+        if frozen:
+            return _ContestTeamView(
+                owner_id=str(frozen.user_id),
+                computed_status=computed_status,
+                response=_frozen_team_response(frozen),
+            )
+
     try:
         team = await Team.get(PydanticObjectId(team_id))
     except Exception:
@@ -427,19 +393,16 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    # Allow team owner anytime; others only when contest is ONGOING or COMPLETED
-    computed_status = _compute_status(contest)
-    is_owner = current_user is not None and str(team.user_id) == str(current_user.id)
-    if not is_owner and computed_status not in (ContestStatus.ONGOING, ContestStatus.COMPLETED):
-        raise HTTPException(status_code=403, detail="Team details visible when contest is ongoing or completed")
-
+    if is_finalized(contest):
+        # Not among the final standings
+        return _ContestTeamView(owner_id=str(team.user_id), computed_status=computed_status, response=None)
     enr = await TeamContestEnrollment.find_one({
         "team_id": team.id,
         "contest_id": contest.id,
         "status": EnrollmentStatus.ACTIVE,
     })
     if not enr:
-        raise HTTPException(status_code=404, detail="Team is not enrolled in this contest")
+        return _ContestTeamView(owner_id=str(team.user_id), computed_status=computed_status, response=None)
 
     # Load players for price/name/team details
     player_ids_valid = [PydanticObjectId(pid) for pid in team.player_ids if ObjectId.is_valid(pid)]
@@ -481,7 +444,7 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
 
     team_points = float(sum(item.contest_points for item in player_items))
 
-    return ContestTeamResponse(
+    response = ContestTeamResponse(
         team_id=str(team.id),
         team_name=team.team_name,
         contest_id=str(contest.id),
@@ -490,4 +453,30 @@ async def get_team_in_contest(contest_id: str, team_id: str, current_user: Optio
         captain_id=str(team.captain_id) if team.captain_id else None,
         vice_captain_id=str(team.vice_captain_id) if team.vice_captain_id else None,
         players=player_items,
-    )
\ No newline at end of file
+    )
+    return _ContestTeamView(owner_id=str(team.user_id), computed_status=computed_status, response=response)
+
+
+def _frozen_team_response(frozen: ContestTeamBreakdown) -> ContestTeamResponse:
+    players = [
+        ContestTeamPlayerSchema(
+            id=p.id,
+            name=p.name,
+            team=p.team,
+            price=p.price,
+            base_points=0.0,
+            contest_points=p.contest_points,
+            slot=p.slot,
+        )
+        for p in frozen.players
+    ]
+    return ContestTeamResponse(
+        team_id=str(frozen.team_id),
+        team_name=frozen.team_name,
+        contest_id=str(frozen.contest_id),
+        base_points=0.0,
+        contest_points=float(sum(p.contest_points for p in players)),
+        captain_id=frozen.captain_id,
+        vice_captain_id=frozen.vice_captain_id,
+        players=players,
+    )
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
-from typing import Optional, List, Tuple
+from fastapi import APIRouter, Depends, Header, Query
+from typing import Any, Dict, Optional
 from app.models.user import User
-from app.models.team import Team
-from app.schemas.leaderboard import LeaderboardResponseSchema, LeaderboardEntrySchema
+from app.schemas.leaderboard import LeaderboardResponseSchema
 from app.utils.security import decode_token
-from beanie import PydanticObjectId
-from app.models.player import Player as PublicPlayer
-from datetime import datetime
+from app.common.metrics import query_budget
+from app.common.guards.admission import HEAVY, admission_class
+from app.common.responses import RawJSONResponse
+from app.services.read_models import UserCard
+from app.services.standings import RankedStanding, compute_global_standings
+from app.services.leaderboard_store import GLOBAL_SCOPE, leaderboard_page
 
 router = APIRouter(prefix="/api/leaderboard", tags=["leaderboard"])
 
@@ -33,108 +35,51 @@ async def get_optional_current_user(authorization: Optional[str] = Header(None))
         return None
 
 
-async def _compute_team_points(team: Team) -> float:
-    """Sum current points of all players in a team."""
-    player_object_ids = []
-    for pid in team.player_ids:
-        try:
-            player_object_ids.append(PydanticObjectId(pid))
-        except Exception:
-            continue
-    if not player_object_ids:
-        return 0.0
-    players = await PublicPlayer.find({"_id": {"$in": player_object_ids}}).to_list()
-    return float(sum(float(p.points or 0.0) for p in players))
-
-
 @router.get("", response_model=LeaderboardResponseSchema)
+@query_budget(5)
+@admission_class(HEAVY)
 async def get_leaderboard(
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default: all teams)"),
     current_user: Optional[User] = Depends(get_optional_current_user),
-) -> LeaderboardResponseSchema:
+):
     """
     Get the global leaderboard with all teams ranked by total points.
     If user is authenticated, also returns their position.
     """
     try:
-        # Fetch all teams
-        teams = await Team.find_all().to_list()
+        page = await leaderboard_page(
+            GLOBAL_SCOPE,
+            compute_global_standings,
+            skip=skip,
+            limit=limit,
+            user=UserCard.from_user(current_user) if current_user else None,
+        )
 
         # If no teams exist, return mock data for development
-        if not teams:
+        if not page.total:
             return _get_mock_leaderboard(current_user)
 
-        # Build leaderboard entries
-        entries = []
-        current_user_entry = None
-        
-        # Compute points for all teams with a single players query to avoid N+1
-        # 1) Collect all player ObjectIds across teams
-        all_player_ids: set[PydanticObjectId] = set()
-        team_player_ids_map: dict[str, list[PydanticObjectId]] = {}
-        for team in teams:
-            obj_ids: list[PydanticObjectId] = []
-            for pid in team.player_ids:
-                try:
-                    obj_ids.append(PydanticObjectId(pid))
-                except Exception:
-                    continue
-            team_player_ids_map[str(team.id)] = obj_ids
-            all_player_ids.update(obj_ids)
-
-        # 2) Fetch all needed players once
-        players = []
-        if all_player_ids:
-            players = await PublicPlayer.find({"_id": {"$in": list(all_player_ids)}}).to_list()
-
-        # 3) Build a points lookup
-        player_points_map = {str(p.id): float(p.points or 0.0) for p in players}
-
-        # 4) Compute per-team totals using the lookup and optionally sync stored totals
-        team_points_list: List[Tuple[Team, float]] = []
-        for team in teams:
-            ids_for_team = team_player_ids_map.get(str(team.id), [])
-            computed_points = sum(player_points_map.get(str(obj_id), 0.0) for obj_id in ids_for_team)
-            team_points_list.append((team, float(computed_points)))
-            # Sync stored total if differs
-            try:
-                if float(team.total_points or 0.0) != float(computed_points):
-                    team.total_points = float(computed_points)
-                    team.updated_at = datetime.utcnow()
-                    await team.save()
-            except Exception:
-                pass
-
-        # Sort by computed points desc
-        team_points_list.sort(key=lambda x: x[1], reverse=True)
-
-        for idx, (team, points) in enumerate(team_points_list):
-            rank = idx + 1
-            # Get user info for this team
-            user = await User.get(team.user_id)
-            if not user:
-                continue
-            
-            entry = LeaderboardEntrySchema(
-                rank=rank,
-                username=user.username,
-                displayName=user.full_name or user.username,
-                teamName=team.team_name,
-                points=points,
-                rankChange=team.rank_change,
-                avatarUrl=user.avatar_url if hasattr(user, "avatar_url") else None,
-            )
-            
-            entries.append(entry)
-            
-            # Check if this is the current user's team
-            if current_user and str(team.user_id) == str(current_user.id):
-                current_user_entry = entry
-        
-        return LeaderboardResponseSchema(
-            entries=entries,
-            currentUserEntry=current_user_entry
-        )
+        return RawJSONResponse({
+            "entries": [_leaderboard_entry(entry) for entry in page.entries],
+            "currentUserEntry": _leaderboard_entry(page.current_user_entry) if page.current_user_entry else None,
+        })
     except Exception as e:
         # In case of error, return mock data
         print(f"Error fetching leaderboard: {e}")
-        return _get_mock_leaderboard(current_user)
\ No newline at end of file
+        return _get_mock_leaderboard(current_user)
+
+
+def _leaderboard_entry(ranked: RankedStanding) -> Dict[str, Any]:
+    """A row shaped like LeaderboardEntrySchema."""
+    team, user = ranked.standing.team, ranked.standing.user
+    return {
+        "rank": ranked.rank,
+        "username": user.username,
+        "displayName": user.display_name,
+        "teamName": team.team_name,
+        "points": float(ranked.standing.points),
+        "rankChange": team.rank_change,
+        "avatarUrl": user.avatar_url,
+        "teamId": None,
+    }
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.common.metrics import registry
+from config.settings import get_settings
+
+settings = get_settings()
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint (request latency and per-route DB counters).
+
+    When METRICS_TOKEN is configured the scraper must send it as a Bearer token.
+    In production the endpoint is not served at all until a token is configured.
+    """
+    if not settings.metrics_token:
+        if settings.is_production:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    elif authorization != f"Bearer {settings.metrics_token}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,8 +2,10 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from beanie import PydanticObjectId
 from app.models.player import Player
-from app.models.contest import Contest
+from app.services.contest_cache import get_contest
 from app.schemas.player import PlayerOut
+from app.services.read_models import PLAYER_OUT_PROJECTION, player_out_row
+from app.common.responses import RawJSONResponse
 
 router = APIRouter(prefix="/api/players", tags=["players"])
 
@@ -22,6 +24,7 @@ def serialize_player(player: Player) -> PlayerOut:
         injury_status=player.injury_status,
         image_url=player.image_url,
         created_at=player.created_at,
+        updated_at=player.updated_at,
     )
 
 @router.get("", response_model=List[PlayerOut])
@@ -37,20 +40,18 @@ async def list_players(
         query = {"slot": str(slot)}
     # If contest_id provided and contest is daily with restrictions, apply allowed team filter
     if contest_id:
-        try:
-            contest = await Contest.get(PydanticObjectId(contest_id))
-        except Exception:
-            contest = None
-        if contest and contest.contest_type == "daily" and contest.allowed_teams:
+        contest = await get_contest(contest_id)
+        if contest and contest.restricts_teams:
             # add team in allowed_teams filter together with slot if present
-            team_filter = {"team": {"$in": contest.allowed_teams}}
+            team_filter = {"team": {"$in": list(contest.allowed_teams_ordered)}}
             if query:
                 query = {"$and": [query, team_filter]}
             else:
                 query = team_filter
 
-    players = await Player.find(query).sort("+name").skip(skip).limit(limit).to_list()
-    return [serialize_player(player) for player in players]
+    # Projected rows straight to JSON; response_model still documents the shape
+    cursor = Player.get_motor_collection().find(query, PLAYER_OUT_PROJECTION).sort("name", 1).skip(skip).limit(limit)
+    return RawJSONResponse([player_out_row(doc) async for doc in cursor])
 
 @router.get("/{id}", response_model=PlayerOut)
 async def get_player(id: str):
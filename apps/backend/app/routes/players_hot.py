@@ -1,59 +1,35 @@
-from typing import List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal, Tuple
 from fastapi import APIRouter, HTTPException, Query
 from beanie import PydanticObjectId
 
 from app.schemas.player_hot import PlayerHot, PlayerHotIds, PlayerHotSingle
-from app.schemas.player import PlayerOut
 from app.models.player import Player
 from app.services import hot_players as svc
+from app.services.read_models import fetch_player_rows
+from app.common.responses import RawJSONResponse
 from app.common.consts.index import HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
+from app.common.metrics import query_budget
+from app.common.singleflight import SingleFlight
+from app.common.guards.admission import HEAVY, admission_class
 
 router = APIRouter(prefix="/api/players", tags=["players", "hot"])
 
-
-def _serialize_player(player: Player) -> PlayerOut:
-    return PlayerOut(
-        id=str(player.id),
-        name=player.name,
-        team=player.team,
-        price=player.price,
-        slot=player.slot,
-        points=player.points,
-        is_available=player.is_available,
-        stats=player.stats,
-        form=player.form,
-        injury_status=player.injury_status,
-        image_url=player.image_url,
-        created_at=player.created_at,
-        updated_at=player.updated_at,
-    )
+# Concurrent identical listings share one aggregation and player fetch
+_hot_listings = SingleFlight("list_hot_players", timeout=10.0)
 
 
-@router.get("/hot", response_model=List[PlayerHot])
-async def list_hot_players(
-    contest_id: Optional[str] = Query(None),
-    threshold: Optional[int] = Query(None, ge=1),
-    limit: int = Query(200, ge=1, le=1000),
-    skip: int = Query(0, ge=0),
-    sort: Literal["count_desc", "name_asc"] = Query("count_desc"),
-):
-    """List players with their selection counts and hot flag.
-
-    If contest_id is provided, counts are computed among teams enrolled (active) in that contest.
-    """
-    thr = threshold or HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
-
+async def _counted_players(contest_id: Optional[str], skip: int, limit: int) -> List[Tuple[Dict[str, Any], int]]:
+    """Players with their selection counts, most selected first (shared between callers, read-only)."""
     if contest_id:
         rows = await svc.aggregate_hot_in_contest(contest_id, skip=skip, limit=limit)
     else:
         rows = await svc.aggregate_hot_global(skip=skip, limit=limit)
 
     player_ids = [r["_id"] for r in rows if r.get("_id")]
-    # Fetch Players in one query
-    players = await Player.find({"_id": {"$in": [PydanticObjectId(pid) for pid in player_ids if pid]}}).to_list()
-    players_by_id = {str(p.id): p for p in players}
+    # Fetch projected players in one query
+    players_by_id = await fetch_player_rows(player_ids)
 
-    items: List[PlayerHot] = []
+    counted: List[Tuple[Dict[str, Any], int]] = []
     for r in rows:
         pid = r.get("_id")
         if not pid:
@@ -62,22 +38,44 @@ async def list_hot_players(
         if not p:
             # Player might be deleted; skip
             continue
-        count = int(r.get("selection_count", 0))
-        items.append(
-            PlayerHot(
-                player=_serialize_player(p),
-                selection_count=count,
-                is_hot=count >= thr,
-            )
-        )
+        counted.append((p, int(r.get("selection_count", 0))))
+    return counted
+
+
+@router.get("/hot", response_model=List[PlayerHot])
+@query_budget(2)
+@admission_class(HEAVY)
+async def list_hot_players(
+    contest_id: Optional[str] = Query(None),
+    threshold: Optional[int] = Query(None, ge=1),
+    limit: int = Query(200, ge=1, le=1000),
+    skip: int = Query(0, ge=0),
+    sort: Literal["count_desc", "name_asc"] = Query("count_desc"),
+):
+    """List players with their selection counts and hot flag.
+
+    If contest_id is provided, counts are computed among teams enrolled (active) in that contest.
+    """
+    thr = threshold or HOT_PLAYER_TEAM_SELECTIONS_THRESHOLD
+
+    counted = await _hot_listings.do(
+        {"contest_id": contest_id, "skip": skip, "limit": limit},
+        lambda: _counted_players(contest_id, skip, limit),
+    )
+    items = [
+        {"player": player, "selection_count": count, "is_hot": count >= thr}
+        for player, count in counted
+    ]
 
     if sort == "name_asc":
-        items.sort(key=lambda x: x.player.name.lower())
+        items.sort(key=lambda x: x["player"]["name"].lower())
 
-    return items
+    return RawJSONResponse(items)
 
 
 @router.get("/hot/ids", response_model=PlayerHotIds)
+@query_budget(1)
+@admission_class(HEAVY)
 async def list_hot_player_ids(
     contest_id: Optional[str] = Query(None),
     threshold: Optional[int] = Query(None, ge=1),
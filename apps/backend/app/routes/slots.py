@@ -4,6 +4,8 @@ from typing import Optional
 from app.models.admin.slot import Slot
 from app.models.player import Player
 from app.schemas.slot import SlotPublic, SlotListPublic
+from app.services.queries import count_by, find_page
+from app.common.metrics import query_budget
 
 router = APIRouter(prefix="/api/slots", tags=["slots"])
 
@@ -24,18 +26,17 @@ def to_public(slot: Slot, player_count: int) -> SlotPublic:
 
 
 @router.get("", response_model=SlotListPublic)
+@query_budget(2)
 async def list_slots(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
 ):
-    total = await Slot.find_all().count()
     skip = (page - 1) * page_size
-    slots = await Slot.find_all().skip(skip).limit(page_size).to_list()
+    slots, total = await find_page(Slot.find_all(), skip=skip, limit=page_size)
 
-    results: list[SlotPublic] = []
-    for s in slots:
-        cnt = await Player.find(Player.slot == str(s.id)).count()
-        results.append(to_public(s, cnt))
+    # Player counts for the whole page in one aggregation
+    counts = await count_by(Player, "slot", [str(s.id) for s in slots])
+    results: list[SlotPublic] = [to_public(s, counts.get(str(s.id), 0)) for s in slots]
 
     return {"slots": results, "total": total}
 
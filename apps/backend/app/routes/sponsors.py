@@ -14,6 +14,8 @@ from app.schemas.sponsor import (
     UploadResponse
 )
 from app.utils.dependencies import get_current_active_user
+from app.services.queries import find_page
+from app.common.invalidation import DELETE, INSERT, SPONSORS, publish_local
 from app.utils.gridfs import (
     upload_sponsor_logo_to_gridfs,
     open_sponsor_logo_stream,
@@ -112,15 +114,13 @@ async def get_sponsors(
     if active is not None:
         query["active"] = active
     
-    # Get total count
-    total = await Sponsor.find(query).count()
-    
-    # Get sponsors with pagination, sorted by priority and created_at
-    sponsors = await Sponsor.find(query)\
-        .sort("+priority", "-created_at")\
-        .skip((page - 1) * page_size)\
-        .limit(page_size)\
-        .to_list()
+    # Get sponsors with pagination (sorted by priority and created_at) and total count
+    sponsors, total = await find_page(
+        Sponsor.find(query),
+        skip=(page - 1) * page_size,
+        limit=page_size,
+        sort=["+priority", "-created_at"],
+    )
     
     return SponsorsListResponse(
         sponsors=[SponsorResponse(**sponsor_to_response(s)) for s in sponsors],
@@ -203,6 +203,7 @@ async def create_sponsor(
     sponsor = Sponsor(**data)
     try:
         await sponsor.insert()
+        publish_local(SPONSORS, sponsor.id, INSERT)
     except DuplicateKeyError:
         # Likely (featured, priority) unique index violation
         raise HTTPException(
@@ -263,6 +264,7 @@ async def update_sponsor(
             setattr(sponsor, field, value)
         try:
             await sponsor.save()
+            publish_local(SPONSORS, sponsor.id)
         except DuplicateKeyError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -298,6 +300,7 @@ async def delete_sponsor(
         await delete_sponsor_logo_from_gridfs(sponsor.logo_file_id)
     
     await sponsor.delete()
+    publish_local(SPONSORS, sponsor.id, DELETE)
     return None
 
 
@@ -336,6 +339,7 @@ async def upload_sponsor_logo(
         sponsor.logo = f"/api/v1/sponsors/{sponsor_id}/logo"
         sponsor.updated_at = datetime.utcnow()
         await sponsor.save()
+        publish_local(SPONSORS, sponsor.id)
         return UploadResponse(
             url=sponsor.logo,
             message="Logo uploaded successfully"
@@ -385,6 +389,7 @@ async def toggle_featured(
         sponsor.priority = await _get_next_priority(sponsor.featured)
     sponsor.updated_at = datetime.utcnow()
     await sponsor.save()
+    publish_local(SPONSORS, sponsor.id)
     
     return SponsorDetailResponse(
         sponsor=SponsorResponse(**sponsor_to_response(sponsor))
@@ -413,6 +418,7 @@ async def toggle_active(
     sponsor.active = not sponsor.active
     sponsor.updated_at = datetime.utcnow()
     await sponsor.save()
+    publish_local(SPONSORS, sponsor.id)
     
     return SponsorDetailResponse(
         sponsor=SponsorResponse(**sponsor_to_response(sponsor))
@@ -4,18 +4,51 @@ from beanie import PydanticObjectId
 from datetime import datetime
 
 from app.models.team import Team
-from app.models.player import Player
 from app.models.team_contest_enrollment import TeamContestEnrollment
-from app.models.contest import Contest
 from app.models.user import User
-from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamsListResponse
+from app.schemas.team import (
+    TeamCreate, TeamUpdate, TeamResponse, TeamsListResponse, TeamDuplicatesResponse,
+    TeamBatchCreate, TeamBatchResponse, TeamBatchResult,
+)
 from app.utils.dependencies import get_current_active_user
-from app.models.admin.slot import Slot
+from app.services.queries import find_page
+from app.services.leaderboard_store import refresh_new_teams, refresh_team, remove_teams
+from app.services.team_locks import forget_teams, is_team_locked
+from app.common.guards.admission import TEAM_WRITE, admission_class
+from app.utils.team_fingerprint import team_fingerprint
+from app.services.team_validation import (
+    TeamValidationError,
+    check_captaincy,
+    check_daily_contest,
+    check_player_ids,
+    check_slots,
+    load_team_rules,
+    validate_new_team,
+)
 
 router = APIRouter(prefix="/api/teams", tags=["teams"])
 
 
+def _team_response(team: Team) -> TeamResponse:
+    return TeamResponse(
+        id=str(team.id),
+        user_id=str(team.user_id),
+        team_name=team.team_name,
+        player_ids=team.player_ids,
+        captain_id=team.captain_id,
+        vice_captain_id=team.vice_captain_id,
+        total_points=team.total_points,
+        total_value=team.total_value,
+        rank=team.rank,
+        rank_change=team.rank_change,
+        contest_id=team.contest_id,
+        created_at=team.created_at,
+        updated_at=team.updated_at
+    )
+
+
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
+@admission_class(TEAM_WRITE)
 async def create_team(
     team_data: TeamCreate,
     current_user: User = Depends(get_current_active_user)
@@ -23,110 +56,20 @@ async def create_team(
     """
     Create a new fantasy team for the current user
     """
-    # Validate that captain and vice-captain are in the player list
-    if team_data.captain_id not in team_data.player_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Captain must be one of the selected players"
-        )
-    
-    if team_data.vice_captain_id not in team_data.player_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Vice-captain must be one of the selected players"
-        )
-    
-    if team_data.captain_id == team_data.vice_captain_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Captain and vice-captain must be different players"
-        )
-    
-    # Calculate total value of the team
-    # Convert string IDs to PydanticObjectId
-    player_object_ids = []
-    for pid in team_data.player_ids:
-        try:
-            player_object_ids.append(PydanticObjectId(pid))
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid player ID: {pid}"
-            )
-    
-    players = await Player.find({"_id": {"$in": player_object_ids}}).to_list()
-    total_value = sum(player.price for player in players)
-    
-    # Verify all player IDs are valid
-    if len(players) != len(team_data.player_ids):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Some player IDs are invalid"
-        )
-
-    # Enforce per-slot constraints
-    # Count players per slot (ignore players without a slot)
-    slot_counts: Dict[str, int] = {}
-    for p in players:
-        if p.slot:
-            slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
-
-    # Build validation set: slots present in selection + all slots with min_select > 0
-    present_slot_ids = list(slot_counts.keys())
-    present_slot_oids = []
-    for sid in present_slot_ids:
-        try:
-            present_slot_oids.append(PydanticObjectId(sid))
-        except Exception:
-            # If slot id is malformed, skip; it won't be validated
-            continue
-    slots_present = await Slot.find({"_id": {"$in": present_slot_oids}}).to_list() if present_slot_oids else []
-    slots_with_min = await Slot.find(Slot.min_select > 0).to_list()
-
-    # Merge unique slots by id
-    slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots_present}
-    for s in slots_with_min:
-        slots_by_id.setdefault(str(s.id), s)
-
-    violations = []
-    for sid, slot in slots_by_id.items():
-        count = slot_counts.get(sid, 0)
-        if count < slot.min_select or count > slot.max_select:
-            violations.append(
-                {
-                    "slot": {"id": sid, "code": slot.code, "name": slot.name},
-                    "expected": {"min_select": slot.min_select, "max_select": slot.max_select},
-                    "actual": count,
-                }
-            )
-    if violations:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "message": "Team violates per-slot selection constraints",
-                "violations": violations,
-            },
+    rules = await load_team_rules(team_data.player_ids, [team_data.contest_id])
+    try:
+        players = validate_new_team(
+            rules,
+            team_data.player_ids,
+            team_data.captain_id,
+            team_data.vice_captain_id,
+            team_data.contest_id,
         )
+    except TeamValidationError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
 
-    # If tied to a contest, enforce allowed teams for daily contests
-    if team_data.contest_id:
-        try:
-            contest = await Contest.get(PydanticObjectId(team_data.contest_id))
-        except Exception:
-            contest = None
-        if not contest:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contest_id")
-        if contest.contest_type == "daily" and contest.allowed_teams:
-            disallowed = [p.name for p in players if p.team and p.team not in contest.allowed_teams]
-            if disallowed:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={
-                        "message": "Selected players include teams disallowed for this daily contest",
-                        "disallowed_players": disallowed,
-                        "allowed_teams": contest.allowed_teams,
-                    },
-                )
+    fingerprint = team_fingerprint(team_data.player_ids, team_data.captain_id, team_data.vice_captain_id)
+    total_value = sum(player.price for player in players)
     
     # Create team document
     team = Team(
@@ -136,25 +79,73 @@ async def create_team(
         captain_id=team_data.captain_id,
         vice_captain_id=team_data.vice_captain_id,
         total_value=total_value,
-        contest_id=team_data.contest_id
+        contest_id=team_data.contest_id,
+        fingerprint=fingerprint,
     )
     
     await team.insert()
+    await refresh_team(team, contest_ids=[])
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
+    return _team_response(team)
+
+
+@router.post("/batch", response_model=TeamBatchResponse)
+@admission_class(TEAM_WRITE)
+async def create_teams_batch(
+    batch: TeamBatchCreate,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create several teams for the current user in one request.
+
+    Players, slots and contests are fetched once for the whole batch and the
+    accepted teams are written with a single insert. Each team is checked
+    exactly as a single create would check it; rejected teams carry the same
+    status code and detail, and do not stop the rest of the batch.
+    """
+    rules = await load_team_rules(
+        [pid for t in batch.teams for pid in t.player_ids],
+        [t.contest_id for t in batch.teams],
+    )
+    fingerprints = [team_fingerprint(t.player_ids, t.captain_id, t.vice_captain_id) for t in batch.teams]
+
+    results: List[TeamBatchResult] = []
+    new_teams: List[Team] = []
+    for index, (team_data, fingerprint) in enumerate(zip(batch.teams, fingerprints)):
+        try:
+            players = validate_new_team(
+                rules,
+                team_data.player_ids,
+                team_data.captain_id,
+                team_data.vice_captain_id,
+                team_data.contest_id,
+            )
+        except TeamValidationError as exc:
+            results.append(TeamBatchResult(index=index, status_code=exc.status_code, error=exc.detail))
+            continue
+
+        team = Team(
+            id=PydanticObjectId(),
+            user_id=current_user.id,
+            team_name=team_data.team_name,
+            player_ids=team_data.player_ids,
+            captain_id=team_data.captain_id,
+            vice_captain_id=team_data.vice_captain_id,
+            total_value=sum(player.price for player in players),
+            contest_id=team_data.contest_id,
+            fingerprint=fingerprint,
+        )
+        new_teams.append(team)
+        results.append(TeamBatchResult(index=index, status_code=status.HTTP_201_CREATED, team=_team_response(team)))
+
+    if new_teams:
+        await Team.insert_many(new_teams)
+        await refresh_new_teams(new_teams)
+
+    return TeamBatchResponse(
+        results=results,
+        created=len(new_teams),
+        rejected=len(results) - len(new_teams),
     )
 
 
@@ -167,32 +158,14 @@ async def get_user_teams(
     """
     Get all teams created by the current user
     """
-    teams = await Team.find(
-        Team.user_id == current_user.id
-    ).sort("-created_at").skip(skip).limit(limit).to_list()
-    
-    total = await Team.find(Team.user_id == current_user.id).count()
-    
-    team_responses = [
-        TeamResponse(
-            id=str(team.id),
-            user_id=str(team.user_id),
-            team_name=team.team_name,
-            player_ids=team.player_ids,
-            captain_id=team.captain_id,
-            vice_captain_id=team.vice_captain_id,
-            total_points=team.total_points,
-            total_value=team.total_value,
-            rank=team.rank,
-            rank_change=team.rank_change,
-            contest_id=team.contest_id,
-            created_at=team.created_at,
-            updated_at=team.updated_at
-        )
-        for team in teams
-    ]
+    teams, total = await find_page(
+        Team.find(Team.user_id == current_user.id),
+        skip=skip,
+        limit=limit,
+        sort=["-created_at"],
+    )
     
-    return TeamsListResponse(teams=team_responses, total=total)
+    return TeamsListResponse(teams=[_team_response(team) for team in teams], total=total)
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
@@ -224,24 +197,56 @@ async def get_team(
             detail="You don't have permission to access this team"
         )
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
+    return _team_response(team)
+
+
+@router.get("/{team_id}/duplicates", response_model=TeamDuplicatesResponse)
+async def get_team_duplicates(
+    team_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Count the teams (and distinct users) with exactly this team's players, captain and vice-captain
+    """
+    try:
+        team = await Team.get(PydanticObjectId(team_id))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found"
+        )
+
+    if not team:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found"
+        )
+
+    if team.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this team"
+        )
+
+    fingerprint = team.fingerprint or team_fingerprint(team.player_ids, team.captain_id, team.vice_captain_id)
+    pipeline = [
+        {"$match": {"fingerprint": fingerprint}},
+        {"$group": {"_id": "$user_id", "teams": {"$sum": 1}}},
+        {"$group": {"_id": None, "users": {"$sum": 1}, "teams": {"$sum": "$teams"}}},
+    ]
+    rows = await Team.get_motor_collection().aggregate(pipeline).to_list(length=1)
+    counts = rows[0] if rows else {"users": 0, "teams": 0}
+
+    return TeamDuplicatesResponse(
+        team_id=str(team.id),
+        fingerprint=fingerprint,
+        teams=counts["teams"],
+        users=counts["users"],
     )
 
 
 @router.put("/{team_id}", response_model=TeamResponse)
+@admission_class(TEAM_WRITE)
 async def update_team(
     team_id: str,
     team_data: TeamUpdate,
@@ -272,26 +277,11 @@ async def update_team(
         )
     
     # Lock edits only if team is enrolled in a contest that is currently ongoing
-    active_enrs = await TeamContestEnrollment.find({
-        "team_id": team.id,
-        "status": "active",
-    }).to_list()
-    if active_enrs:
-        from datetime import datetime as _dt
-        contest_ids = [enr.contest_id for enr in active_enrs]
-        # Ongoing = status active AND start_at <= now < end_at
-        now = _dt.utcnow()
-        active_contest_count = await Contest.find({
-            "_id": {"$in": contest_ids},
-            "status": "ongoing",
-            "start_at": {"$lte": now},
-            "end_at": {"$gt": now},
-        }).count()
-        if active_contest_count > 0:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
-            )
+    if await is_team_locked(team.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
+        )
     
     # Update fields
     update_data = team_data.model_dump(exclude_unset=True)
@@ -303,95 +293,25 @@ async def update_team(
             captain_id = update_data.get("captain_id", team.captain_id)
             vice_captain_id = update_data.get("vice_captain_id", team.vice_captain_id)
             
-            if captain_id and captain_id not in player_ids:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Captain must be one of the selected players"
-                )
-            
-            if vice_captain_id and vice_captain_id not in player_ids:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Vice-captain must be one of the selected players"
-                )
-            
-            if captain_id and vice_captain_id and captain_id == vice_captain_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Captain and vice-captain must be different players"
-                )
+            try:
+                check_captaincy(player_ids, captain_id, vice_captain_id)
+            except TeamValidationError as exc:
+                raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+
+            update_data["fingerprint"] = team_fingerprint(player_ids, captain_id, vice_captain_id)
             
             # Recalculate total value and validate per-slot constraints if player_ids changed
             if "player_ids" in update_data:
-                # Convert string IDs to PydanticObjectId
-                player_object_ids = []
-                for pid in player_ids:
-                    try:
-                        player_object_ids.append(PydanticObjectId(pid))
-                    except Exception:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Invalid player ID: {pid}"
-                        )
-                players = await Player.find({"_id": {"$in": player_object_ids}}).to_list()
-                update_data["total_value"] = sum(player.price for player in players)
-
-                # If team belongs to a daily contest with restrictions, enforce allowed teams
-                if team.contest_id:
-                    try:
-                        contest = await Contest.get(PydanticObjectId(team.contest_id))
-                    except Exception:
-                        contest = None
-                    if contest and contest.contest_type == "daily" and contest.allowed_teams:
-                        disallowed = [p.name for p in players if p.team and p.team not in contest.allowed_teams]
-                        if disallowed:
-                            raise HTTPException(
-                                status_code=status.HTTP_400_BAD_REQUEST,
-                                detail={
-                                    "message": "Selected players include teams disallowed for this daily contest",
-                                    "disallowed_players": disallowed,
-                                    "allowed_teams": contest.allowed_teams,
-                                },
-                            )
-
-                # Per-slot constraints validation (same as create)
-                slot_counts: Dict[str, int] = {}
-                for p in players:
-                    if p.slot:
-                        slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
-                present_slot_ids = list(slot_counts.keys())
-                present_slot_oids = []
-                for sid in present_slot_ids:
-                    try:
-                        present_slot_oids.append(PydanticObjectId(sid))
-                    except Exception:
-                        continue
-                slots_present = await Slot.find({"_id": {"$in": present_slot_oids}}).to_list() if present_slot_oids else []
-                slots_with_min = await Slot.find(Slot.min_select > 0).to_list()
-
-                slots_by_id: Dict[str, Slot] = {str(s.id): s for s in slots_present}
-                for s in slots_with_min:
-                    slots_by_id.setdefault(str(s.id), s)
-
-                violations = []
-                for sid, slot in slots_by_id.items():
-                    count = slot_counts.get(sid, 0)
-                    if count < slot.min_select or count > slot.max_select:
-                        violations.append(
-                            {
-                                "slot": {"id": sid, "code": slot.code, "name": slot.name},
-                                "expected": {"min_select": slot.min_select, "max_select": slot.max_select},
-                                "actual": count,
-                            }
-                        )
-                if violations:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail={
-                            "message": "Team violates per-slot selection constraints",
-                            "violations": violations,
-                        },
-                    )
+                try:
+                    check_player_ids(player_ids)
+                    rules = await load_team_rules(player_ids, [team.contest_id])
+                    players = rules.players_for(player_ids)
+                    update_data["total_value"] = sum(player.price for player in players)
+                    # If team belongs to a daily contest with restrictions, enforce allowed teams
+                    check_daily_contest(rules.contest(team.contest_id), players)
+                    check_slots(rules, players)
+                except TeamValidationError as exc:
+                    raise HTTPException(status_code=exc.status_code, detail=exc.detail)
         
         update_data["updated_at"] = datetime.utcnow()
         
@@ -399,25 +319,14 @@ async def update_team(
             setattr(team, key, value)
         
         await team.save()
+        if {"player_ids", "captain_id", "vice_captain_id"} & update_data.keys():
+            await refresh_team(team)
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
-    )
+    return _team_response(team)
 
 
 @router.patch("/{team_id}/rename", response_model=TeamResponse)
+@admission_class(TEAM_WRITE)
 async def rename_team(
     team_id: str,
     team_name: str,
@@ -460,46 +369,18 @@ async def rename_team(
         )
     
     # Lock edits only if team is enrolled in a contest that is currently ongoing
-    active_enrs = await TeamContestEnrollment.find({
-        "team_id": team.id,
-        "status": "active",
-    }).to_list()
-    if active_enrs:
-        from datetime import datetime as _dt
-        contest_ids = [enr.contest_id for enr in active_enrs]
-        now = _dt.utcnow()
-        active_contest_count = await Contest.find({
-            "_id": {"$in": contest_ids},
-            "status": "ongoing",
-            "start_at": {"$lte": now},
-            "end_at": {"$gt": now},
-        }).count()
-        if active_contest_count > 0:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
-            )
+    if await is_team_locked(team.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Team is locked due to an active contest. Try again when the contest is paused/off.",
+        )
     
     # Update team name
     team.team_name = team_name.strip()
     team.updated_at = datetime.utcnow()
     await team.save()
     
-    return TeamResponse(
-        id=str(team.id),
-        user_id=str(team.user_id),
-        team_name=team.team_name,
-        player_ids=team.player_ids,
-        captain_id=team.captain_id,
-        vice_captain_id=team.vice_captain_id,
-        total_points=team.total_points,
-        total_value=team.total_value,
-        rank=team.rank,
-        rank_change=team.rank_change,
-        contest_id=team.contest_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at
-    )
+    return _team_response(team)
 
 
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -545,5 +426,7 @@ async def delete_team(
             await enr.save()
 
     await team.delete()
+    forget_teams([team.id])
+    await remove_teams([team.id], contest_ids=[enr.contest_id for enr in active_enrollments], include_global=True)
     
     return None
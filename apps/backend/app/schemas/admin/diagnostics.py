@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class SlowQueryResponse(BaseModel):
+    command: str
+    collection: str
+    route: str
+    shape: str
+    count: int
+    max_ms: float
+    avg_ms: float
+    flags: List[str]
+    plan_summary: Optional[str] = None
+    last_seen: datetime
+
+
+class SlowQueryListResponse(BaseModel):
+    enabled: bool
+    threshold_ms: Optional[float] = None
+    queries: List[SlowQueryResponse]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -33,6 +33,8 @@ class PlayerResponse(PlayerBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    # Set when the change started a background recompute of team totals
+    recompute_job_id: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -43,3 +45,23 @@ class PlayerListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class TeamRecomputeRequest(BaseModel):
+    # Recompute only teams picking these players; omit for every team
+    player_ids: Optional[List[str]] = None
+
+
+class TeamRecomputeJobResponse(BaseModel):
+    id: str
+    reason: str
+    player_ids: Optional[List[str]] = None
+    status: str
+    total_teams: int
+    processed_teams: int
+    batches: int
+    progress: float
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
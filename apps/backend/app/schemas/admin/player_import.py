@@ -49,6 +49,8 @@ class ImportResponse(BaseModel):
     has_more_errors: bool = False
     job_id: Optional[str] = None
     idempotency_key: Optional[str] = None
+    checksum: Optional[str] = None  # SHA256 of the uploaded file
+    reused_dry_run: bool = False  # Committed rows validated by an earlier dry run of the file
 
 
 class ImportLogResponse(BaseModel):
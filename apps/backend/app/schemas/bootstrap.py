@@ -0,0 +1,18 @@
+from typing import List
+from pydantic import BaseModel
+
+from app.schemas.carousel import CarouselImageResponse
+from app.schemas.contest import ContestListResponse
+from app.schemas.player_hot import PlayerHotIds
+from app.schemas.slot import SlotListPublic
+from app.schemas.sponsor import SponsorResponse
+
+
+class BootstrapResponse(BaseModel):
+    """Everything the homepage loads on a cold start, each part shaped like its own endpoint"""
+    sponsors: List[SponsorResponse]  # GET /api/v1/sponsors (active)
+    carousel: List[CarouselImageResponse]  # GET /api/v1/carousel/feed
+    ongoing_contests: ContestListResponse  # GET /api/contests?status=ongoing
+    live_contests: ContestListResponse  # GET /api/contests?status=live
+    slots: SlotListPublic  # GET /api/slots
+    hot_players: PlayerHotIds  # GET /api/players/hot/ids
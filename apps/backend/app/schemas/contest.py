@@ -86,8 +86,10 @@ class ContestResponse(BaseModel):
     allowed_teams: List[str]
     created_at: datetime
     updated_at: datetime
+    # set once the standings are frozen
+    finalized_at: Optional[datetime] = None
 
-    @field_validator('start_at', 'end_at', 'created_at', 'updated_at', mode='before')
+    @field_validator('start_at', 'end_at', 'created_at', 'updated_at', 'finalized_at', mode='before')
     @classmethod
     def ensure_ist(cls, v):
         """Ensure all datetime fields are in IST timezone"""
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import datetime
 
+MAX_TEAMS_PER_BATCH = 20
+
 
 class TeamCreate(BaseModel):
     """Schema for creating a new team"""
@@ -113,3 +115,31 @@ class TeamsListResponse(BaseModel):
                 "total": 1
             }
         }
+
+
+class TeamDuplicatesResponse(BaseModel):
+    """How many teams share a team's exact composition"""
+    team_id: str
+    fingerprint: str
+    teams: int  # including this one
+    users: int
+
+
+class TeamBatchCreate(BaseModel):
+    """Schema for creating several teams in one request"""
+    teams: List[TeamCreate] = Field(..., min_length=1, max_length=MAX_TEAMS_PER_BATCH)
+
+
+class TeamBatchResult(BaseModel):
+    """Outcome for one team of a batch, in request order"""
+    index: int
+    status_code: int  # what a single create would have returned
+    team: Optional[TeamResponse] = None
+    error: Optional[Any] = None  # same detail as a single create's error
+
+
+class TeamBatchResponse(BaseModel):
+    """Schema for batch team creation response"""
+    results: List[TeamBatchResult]
+    created: int
+    rejected: int
@@ -0,0 +1,67 @@
+"""Cached sections of the homepage bootstrap payload.
+
+On a cold start the app needs sponsors, the carousel, live and ongoing
+contests, slots and the hot player ids. GET /api/bootstrap returns them in
+one response. Each part is a CachedSection: its rows are loaded once, kept
+until a write to one of its collections is published on the invalidation bus
+(or BOOTSTRAP_CACHE_TTL_SECONDS passes), and shared by concurrent requests.
+All sections are fetched in parallel, and the assembled payload carries an
+ETag. A client that already has the current payload gets an empty 304.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Iterable, Tuple
+
+from app.common.invalidation import InvalidationEvent, invalidation_bus
+from app.common.responses import dumps
+from app.common.singleflight import SingleFlight
+
+
+class CachedSection:
+    """One lazily loaded, invalidation-aware part of a cached payload."""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_seconds: float,
+        collections: Iterable[str] = (),
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._loader = loader
+        self._value: Any = None
+        self._expires_at = 0.0
+        # Bumped on invalidation, so a load that raced a write is not kept
+        self._generation = 0
+        self._loads = SingleFlight(f"bootstrap_{name}", timeout=10.0)
+        for collection in collections:
+            invalidation_bus.subscribe(collection, self._on_change)
+
+    async def get(self) -> Any:
+        if time.monotonic() >= self._expires_at:
+            return await self._loads.do({}, self._load)
+        return self._value
+
+    async def _load(self) -> Any:
+        generation = self._generation
+        value = await self._loader()
+        if generation == self._generation:
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl_seconds
+        return value
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+        self._generation += 1
+
+    def _on_change(self, event: InvalidationEvent) -> None:
+        self.invalidate()
+
+
+def encode_with_etag(content: Any) -> Tuple[bytes, str]:
+    """The encoded payload and an ETag derived from its bytes (same on every worker)."""
+    body = dumps(content)
+    return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
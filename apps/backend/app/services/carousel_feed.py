@@ -0,0 +1,151 @@
+"""Precomputed feed of the active carousel images.
+
+Every homepage load asks for the active carousel. Images change only when an
+admin edits them. So each worker keeps the feed built: the active images in
+display order, already shaped like CarouselImageResponse and encoded once.
+The feed is rebuilt on the first read after an admin mutation (a
+``publish_local(CAROUSEL, ...)`` in the carousel routes, or the change stream
+for other workers), and at least every CAROUSEL_FEED_TTL_SECONDS.
+
+Image URLs in the feed carry the content hash of the image
+(``/api/v1/carousel/{id}/image?v=<hash>``). A new upload changes the URL, so
+the image endpoint can let clients and CDNs cache a versioned URL forever.
+
+``version`` is a hash of the encoded feed. It is the same on every worker that
+built the same feed, so it doubles as an ETag.
+
+The feed is sorted by the ``positions`` of the CarouselOrder document, not by
+each image's own ``display_order``. Every display order change is written
+there first (``save_positions``), in one single-document update, and only
+then copied onto the images. A feed built while a reorder is being copied
+therefore still shows either the old order or the new one, never a mix, on
+every worker and without a transaction.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.common.invalidation import CAROUSEL, InvalidationEvent, invalidation_bus
+from app.common.responses import dumps
+from app.common.singleflight import SingleFlight
+from app.models.carousel import CarouselImage, CarouselOrder
+from config.settings import settings
+
+# Hex digits of the content hash kept in image URLs
+IMAGE_VERSION_LENGTH = 16
+# _id of the single CarouselOrder document
+ORDER_ID = "carousel"
+
+
+async def load_positions() -> Dict[str, int]:
+    doc = await CarouselOrder.get_motor_collection().find_one({"_id": ORDER_ID}, {"positions": 1})
+    return dict((doc or {}).get("positions") or {})
+
+
+async def save_positions(positions: Mapping[str, int]) -> None:
+    """Set the display order of some images in one atomic update of the order document."""
+    if not positions:
+        return
+    update = {f"positions.{image_id}": int(order) for image_id, order in positions.items()}
+    update["updated_at"] = datetime.utcnow()
+    await CarouselOrder.get_motor_collection().update_one({"_id": ORDER_ID}, {"$set": update}, upsert=True)
+
+
+async def drop_position(image_id: Any) -> None:
+    await CarouselOrder.get_motor_collection().update_one(
+        {"_id": ORDER_ID}, {"$unset": {f"positions.{image_id}": ""}}
+    )
+
+
+def image_version(doc: Dict[str, Any]) -> Optional[str]:
+    """Version of a carousel image's content: its hash, or the GridFS file id for images uploaded before hashing."""
+    if doc.get("image_hash"):
+        return doc["image_hash"][:IMAGE_VERSION_LENGTH]
+    return doc.get("image_file_id")
+
+
+def versioned_image_url(doc: Dict[str, Any]) -> Optional[str]:
+    url = doc.get("image_url")
+    version = image_version(doc)
+    if not url or not version:
+        return url
+    return f"{url}?v={version}"
+
+
+def feed_row(doc: Dict[str, Any], display_order: Optional[int] = None) -> Dict[str, Any]:
+    """A carousel_images document shaped like CarouselImageResponse."""
+    if display_order is None:
+        display_order = doc.get("display_order")
+    return {
+        "_id": str(doc["_id"]),
+        "title": doc.get("title"),
+        "subtitle": doc.get("subtitle"),
+        "image_url": versioned_image_url(doc),
+        "link_url": str(doc["link_url"]) if doc.get("link_url") else None,
+        "display_order": int(display_order or 0),
+        "active": bool(doc.get("active", True)),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+@dataclass(frozen=True)
+class CarouselFeed:
+    version: str
+    images: Tuple[Dict[str, Any], ...]
+    # {"version", "images"} encoded once for the feed endpoint
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+class CarouselFeedCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._feed: Optional[CarouselFeed] = None
+        self._expires_at = 0.0
+        # Bumped on invalidation, so a build that raced a write is not kept
+        self._generation = 0
+        self._builds = SingleFlight("carousel_feed", timeout=10.0)
+
+    async def get(self) -> CarouselFeed:
+        feed = self._feed
+        if feed is None or time.monotonic() >= self._expires_at:
+            feed = await self._builds.do({}, self.build)
+        return feed
+
+    async def build(self) -> CarouselFeed:
+        generation = self._generation
+        docs = await CarouselImage.get_motor_collection().find({"active": True}).to_list(None)
+        # Read after the images: a reorder's new positions are in place before any image changes
+        positions = await load_positions()
+        rows = [feed_row(doc, positions.get(str(doc["_id"]))) for doc in docs]
+        rows.sort(key=lambda row: (row["display_order"], row["created_at"] or datetime.min))
+        images = tuple(rows)
+        version = hashlib.sha256(dumps(images)).hexdigest()[:IMAGE_VERSION_LENGTH]
+        feed = CarouselFeed(version=version, images=images, body=dumps({"version": version, "images": images}))
+        if generation == self._generation:
+            self._feed = feed
+            self._expires_at = time.monotonic() + self.ttl_seconds
+        return feed
+
+    def invalidate(self) -> None:
+        # The next read rebuilds
+        self._expires_at = 0.0
+        self._generation += 1
+
+
+carousel_feed = CarouselFeedCache(settings.carousel_feed_ttl_seconds)
+
+
+def _on_carousel_change(event: InvalidationEvent) -> None:
+    carousel_feed.invalidate()
+
+
+invalidation_bus.subscribe(CAROUSEL, _on_carousel_change)
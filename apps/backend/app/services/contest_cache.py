@@ -0,0 +1,205 @@
+"""In-process cache of contest metadata.
+
+Nearly every contest-scoped request starts by loading its contest: the
+player list filtered for a daily contest, every public contest route, team
+create/update validation. Contests change rarely and there are few of them.
+So each worker keeps all of them in memory as immutable ContestSnapshot
+objects, indexed by id and by code.
+
+The cache is filled at boot and reloaded whole at least every
+CONTEST_CACHE_TTL_SECONDS. An entry is dropped as soon as its contest is
+written, via a ``publish_local`` in the admin routes or the change stream
+for other workers. A lookup that misses (e.g. a contest created by another
+worker moments ago) falls back to MongoDB.
+
+``version`` increases on every change, so derived responses can be tagged
+or cached against it.
+
+Routes that modify a contest keep loading the Beanie document.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+
+from app.common.enums.contests import ContestStatus, ContestType, ContestVisibility, PointsScope
+from app.common.invalidation import CONTESTS, InvalidationEvent, invalidation_bus
+from app.common.singleflight import SingleFlight
+from app.models.contest import Contest
+from config.settings import settings
+
+
+@dataclass(frozen=True, slots=True)
+class ContestSnapshot:
+    """Read-only view of a Contest document."""
+
+    id: PydanticObjectId
+    code: str
+    name: str
+    description: Optional[str]
+    start_at: datetime
+    end_at: datetime
+    status: ContestStatus
+    visibility: ContestVisibility
+    points_scope: PointsScope
+    contest_type: ContestType
+    # For membership checks; allowed_teams_ordered keeps the admin's order for display
+    allowed_teams: FrozenSet[str]
+    allowed_teams_ordered: Tuple[str, ...]
+    finalized_version: Optional[int]
+    finalized_at: Optional[datetime]
+    finalized_teams: int
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_document(cls, contest: Contest) -> "ContestSnapshot":
+        allowed = tuple(contest.allowed_teams or ())
+        return cls(
+            id=contest.id,
+            code=contest.code,
+            name=contest.name,
+            description=contest.description,
+            start_at=contest.start_at,
+            end_at=contest.end_at,
+            status=contest.status,
+            visibility=contest.visibility,
+            points_scope=contest.points_scope,
+            contest_type=contest.contest_type,
+            allowed_teams=frozenset(allowed),
+            allowed_teams_ordered=allowed,
+            finalized_version=contest.finalized_version,
+            finalized_at=contest.finalized_at,
+            finalized_teams=contest.finalized_teams,
+            created_at=contest.created_at,
+            updated_at=contest.updated_at,
+        )
+
+    @property
+    def restricts_teams(self) -> bool:
+        """Daily contests may limit players to some real-world teams."""
+        return self.contest_type == ContestType.DAILY and bool(self.allowed_teams)
+
+
+class ContestCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._by_id: Dict[str, ContestSnapshot] = {}
+        self._by_code: Dict[str, ContestSnapshot] = {}
+        self._expires_at = 0.0
+        # False once a contest was dropped since the last full load
+        self._complete = False
+        # Bumped on invalidation, so a load that raced a write is not kept
+        self._generation = 0
+        # Requests arriving while the cache is stale share one reload
+        self._reloads = SingleFlight("contest_cache", timeout=10.0)
+
+    async def load(self) -> None:
+        """(Re)load every contest."""
+        generation = self._generation
+        contests = await Contest.find_all().to_list()
+        if generation != self._generation:
+            return
+        self._by_id = {}
+        self._by_code = {}
+        for contest in contests:
+            self._put(ContestSnapshot.from_document(contest))
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        self._complete = True
+        self.version += 1
+
+    async def get(self, contest_id) -> Optional[ContestSnapshot]:
+        if not contest_id or not ObjectId.is_valid(str(contest_id)):
+            return None
+        await self._ensure_fresh()
+        snapshot = self._by_id.get(str(contest_id))
+        if snapshot is None:
+            snapshot = await self._fetch({"_id": ObjectId(str(contest_id))})
+        return snapshot
+
+    async def by_code(self, code: str) -> Optional[ContestSnapshot]:
+        await self._ensure_fresh()
+        snapshot = self._by_code.get(code)
+        if snapshot is None:
+            snapshot = await self._fetch({"code": code})
+        return snapshot
+
+    async def all(self) -> List[ContestSnapshot]:
+        """Every contest."""
+        await self._ensure_fresh()
+        if not self._complete:
+            await self._reloads.do({}, self.load)
+        return list(self._by_id.values())
+
+    async def get_many(self, contest_ids: Iterable) -> Dict[str, ContestSnapshot]:
+        """Snapshots of the known contests among ``contest_ids``, by id string."""
+        await self._ensure_fresh()
+        found: Dict[str, ContestSnapshot] = {}
+        missing: List[ObjectId] = []
+        for contest_id in {str(cid) for cid in contest_ids if cid}:
+            snapshot = self._by_id.get(contest_id)
+            if snapshot is not None:
+                found[contest_id] = snapshot
+            elif ObjectId.is_valid(contest_id):
+                missing.append(ObjectId(contest_id))
+        if missing:
+            generation = self._generation
+            for contest in await Contest.find({"_id": {"$in": missing}}).to_list():
+                snapshot = ContestSnapshot.from_document(contest)
+                if generation == self._generation:
+                    self._put(snapshot)
+                found[str(contest.id)] = snapshot
+        return found
+
+    def invalidate(self, contest_id=None) -> None:
+        """Drop one contest, or everything when ``contest_id`` is None."""
+        if contest_id is None:
+            self._by_id = {}
+            self._by_code = {}
+            self._expires_at = 0.0
+        else:
+            snapshot = self._by_id.pop(str(contest_id), None)
+            if snapshot is not None:
+                self._by_code.pop(snapshot.code, None)
+        self._complete = False
+        self._generation += 1
+        self.version += 1
+
+    async def _ensure_fresh(self) -> None:
+        if time.monotonic() >= self._expires_at:
+            await self._reloads.do({}, self.load)
+
+    async def _fetch(self, query) -> Optional[ContestSnapshot]:
+        generation = self._generation
+        contest = await Contest.find_one(query)
+        if contest is None:
+            return None
+        snapshot = ContestSnapshot.from_document(contest)
+        if generation == self._generation:
+            self._put(snapshot)
+        return snapshot
+
+    def _put(self, snapshot: ContestSnapshot) -> None:
+        self._by_id[str(snapshot.id)] = snapshot
+        self._by_code[snapshot.code] = snapshot
+
+
+contest_cache = ContestCache(settings.contest_cache_ttl_seconds)
+
+
+def _on_contest_change(event: InvalidationEvent) -> None:
+    contest_cache.invalidate(None if event.is_flush else event.document_id)
+
+
+invalidation_bus.subscribe(CONTESTS, _on_contest_change)
+
+
+async def get_contest(contest_id) -> Optional[ContestSnapshot]:
+    """The contest's snapshot, or None if there is no such contest."""
+    return await contest_cache.get(contest_id)
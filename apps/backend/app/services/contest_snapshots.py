@@ -0,0 +1,352 @@
+"""Frozen standings of finalized contests.
+
+Once a contest has ended its leaderboard cannot change. ``finalize_contest``
+ranks it one last time and writes two kinds of immutable documents
+(app.models.contest_standings):
+
+- the leaderboard, as ContestStandingsPage documents of STANDINGS_PAGE_SIZE
+  entries each;
+- one ContestTeamBreakdown per ranked team, holding the per-player payload of
+  get_team_in_contest.
+
+It then points ``Contest.finalized_version`` at them. From then on the
+contest leaderboard and contest team views are read from the snapshot instead
+of being recomputed on every view. A version never changes, so pages are also
+kept in a small in-process cache.
+
+Re-finalizing (e.g. after a points correction) claims the next version
+atomically, writes it, swaps the pointer if no newer version was swapped in
+meanwhile, and only then drops older versions. Other workers may still hold
+the previous ``finalized_version`` in their contest cache. When a page or
+breakdown of that version is gone, readers re-read the pointer and retry
+with the current version, so they always see one complete snapshot.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.common.invalidation import CONTESTS, publish_local
+from app.models.contest import Contest
+from app.models.contest_standings import ContestStandingsPage, ContestTeamBreakdown
+from app.services.read_models import TeamCard, UserCard, fetch_contest_points, fetch_player_cards
+from app.services.standings import (
+    LeaderboardPage,
+    RankedStanding,
+    Standing,
+    compute_contest_standings,
+    contest_multiplier,
+)
+from app.utils.read_routing import primary_reads
+from app.utils.timezone import now_ist
+
+STANDINGS_PAGE_SIZE = 100
+INSERT_CHUNK = 1000
+PAGE_CACHE_SIZE = 512
+
+# (contest id, version, page) -> entries; safe to keep because versions are immutable
+_page_cache: "OrderedDict[Tuple[str, int, int], List[RankedStanding]]" = OrderedDict()
+
+
+@dataclass
+class FinalizeResult:
+    contest_id: str
+    version: int
+    teams: int
+    pages: int
+    finalized_at: datetime
+
+
+class FinalizeConflict(Exception):
+    """A newer finalization of the contest was swapped in while this one ran."""
+
+
+def is_finalized(contest: Contest) -> bool:
+    return contest.finalized_version is not None
+
+
+async def _claim_version(contest_oid: ObjectId, finalized_version: Optional[int]) -> int:
+    """Reserve the next snapshot version; concurrent callers get distinct versions."""
+    contests = Contest.get_motor_collection()
+    # Contests finalized before versions were claimed start counting from their current version
+    await contests.update_one(
+        {"_id": contest_oid, "finalizing_version": None},
+        {"$set": {"finalizing_version": finalized_version or 0}},
+    )
+    doc = await contests.find_one_and_update(
+        {"_id": contest_oid},
+        {"$inc": {"finalizing_version": 1}},
+        projection={"finalizing_version": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    return int(doc["finalizing_version"])
+
+
+async def finalize_contest(contest: Contest) -> FinalizeResult:
+    """Write a new frozen snapshot of the contest's standings and serve reads from it.
+
+    Raises:
+        FinalizeConflict: a concurrent, later finalization already replaced this one
+    """
+    contest_oid = ObjectId(str(contest.id))
+    version = await _claim_version(contest_oid, contest.finalized_version)
+    # The snapshot is final; read it from the primary, not a possibly lagging secondary
+    with primary_reads():
+        standings = (await compute_contest_standings(contest.id)).standings()
+        player_ids = {pid for s in standings for pid in s.team.player_ids}
+        players = await fetch_player_cards(player_ids)
+        points_by_player = await fetch_contest_points(contest.id, player_ids)
+    now = datetime.utcnow()
+
+    pages = [
+        {
+            "contest_id": contest_oid,
+            "version": version,
+            "page": page,
+            "entries": [
+                _entry_doc(rank, standing)
+                for rank, standing in enumerate(
+                    standings[start:start + STANDINGS_PAGE_SIZE], start=start + 1
+                )
+            ],
+            "created_at": now,
+        }
+        for page, start in enumerate(range(0, len(standings), STANDINGS_PAGE_SIZE))
+    ]
+    breakdowns = [
+        _breakdown_doc(contest_oid, version, rank, standing, players, points_by_player, now)
+        for rank, standing in enumerate(standings, start=1)
+    ]
+
+    pages_collection = ContestStandingsPage.get_motor_collection()
+    breakdowns_collection = ContestTeamBreakdown.get_motor_collection()
+    # Leftovers of an interrupted run of this version
+    await pages_collection.delete_many({"contest_id": contest_oid, "version": version})
+    await breakdowns_collection.delete_many({"contest_id": contest_oid, "version": version})
+    for start in range(0, len(pages), INSERT_CHUNK):
+        await pages_collection.insert_many(pages[start:start + INSERT_CHUNK], ordered=False)
+    for start in range(0, len(breakdowns), INSERT_CHUNK):
+        await breakdowns_collection.insert_many(breakdowns[start:start + INSERT_CHUNK], ordered=False)
+
+    finalized_at = now_ist()
+    # Only move the pointer forward: a slower run must not replace a newer snapshot
+    swapped = await Contest.get_motor_collection().update_one(
+        {
+            "_id": contest_oid,
+            "$or": [{"finalized_version": None}, {"finalized_version": {"$lt": version}}],
+        },
+        {"$set": {
+            "finalized_version": version,
+            "finalized_at": finalized_at,
+            "finalized_teams": len(standings),
+            "updated_at": finalized_at,
+        }},
+    )
+    if not swapped.matched_count:
+        mine = {"contest_id": contest_oid, "version": version}
+        await pages_collection.delete_many(mine)
+        await breakdowns_collection.delete_many(mine)
+        raise FinalizeConflict(f"A newer finalization of contest {contest.id} is already in place")
+    contest.finalized_version = version
+    contest.finalized_at = finalized_at
+    contest.finalized_teams = len(standings)
+    publish_local(CONTESTS, contest.id)
+
+    # Readers have switched to the new version; later versions may still be being written
+    stale = {"contest_id": contest_oid, "version": {"$lt": version}}
+    await pages_collection.delete_many(stale)
+    await breakdowns_collection.delete_many(stale)
+
+    return FinalizeResult(
+        contest_id=str(contest.id),
+        version=version,
+        teams=len(standings),
+        pages=len(pages),
+        finalized_at=finalized_at,
+    )
+
+
+def _entry_doc(rank: int, standing: Standing) -> Dict[str, Any]:
+    team, user = standing.team, standing.user
+    return {
+        "rank": rank,
+        "team_id": team.id,
+        "team_name": team.team_name,
+        "user_id": user.id,
+        "username": user.username,
+        "full_name": user.full_name,
+        "avatar_url": user.avatar_url,
+        "points": standing.points,
+        "rank_change": team.rank_change,
+    }
+
+
+def _breakdown_doc(
+    contest_oid: ObjectId,
+    version: int,
+    rank: int,
+    standing: Standing,
+    players: Mapping[str, Any],
+    points_by_player: Mapping[str, float],
+    now: datetime,
+) -> Dict[str, Any]:
+    team = standing.team
+    items = []
+    for pid in team.player_ids:
+        player = players.get(pid)
+        if not player:
+            continue
+        items.append({
+            "id": pid,
+            "name": player.name,
+            "team": player.team,
+            "price": float(player.price or 0.0),
+            "contest_points": float(points_by_player.get(pid, 0.0)) * contest_multiplier(team, pid),
+            "slot": player.slot,
+        })
+    return {
+        "contest_id": contest_oid,
+        "version": version,
+        "team_id": ObjectId(team.id),
+        "user_id": ObjectId(team.user_id),
+        "rank": rank,
+        "team_name": team.team_name,
+        "points": standing.points,
+        "rank_change": team.rank_change,
+        "captain_id": team.captain_id,
+        "vice_captain_id": team.vice_captain_id,
+        "players": items,
+        "created_at": now,
+    }
+
+
+def _ranked_from_entry(entry: Mapping[str, Any]) -> RankedStanding:
+    team = TeamCard(
+        id=entry["team_id"],
+        user_id=entry["user_id"],
+        team_name=entry.get("team_name", ""),
+        player_ids=(),
+        rank_change=entry.get("rank_change"),
+    )
+    user = UserCard(
+        id=entry["user_id"],
+        username=entry.get("username", ""),
+        full_name=entry.get("full_name"),
+        avatar_url=entry.get("avatar_url"),
+    )
+    return RankedStanding(entry["rank"], Standing(team, user, float(entry.get("points") or 0.0)))
+
+
+async def _load_pages(contest_id: str, version: int, pages: range) -> Dict[int, List[RankedStanding]]:
+    loaded: Dict[int, List[RankedStanding]] = {}
+    missing = []
+    for page in pages:
+        cached = _page_cache.get((contest_id, version, page))
+        if cached is None:
+            missing.append(page)
+        else:
+            _page_cache.move_to_end((contest_id, version, page))
+            loaded[page] = cached
+    if missing:
+        cursor = ContestStandingsPage.get_motor_collection().find(
+            {"contest_id": ObjectId(contest_id), "version": version, "page": {"$in": missing}},
+            {"page": 1, "entries": 1},
+        )
+        async for doc in cursor:
+            entries = [_ranked_from_entry(entry) for entry in doc.get("entries") or ()]
+            loaded[doc["page"]] = entries
+            _page_cache[(contest_id, version, doc["page"])] = entries
+        while len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+    return loaded
+
+
+async def _current_pointer(contest_id: str) -> Tuple[Optional[int], int]:
+    """The contest's finalized version and team count as stored now, bypassing the contest cache."""
+    doc = await Contest.get_motor_collection().find_one(
+        {"_id": ObjectId(contest_id)}, {"finalized_version": 1, "finalized_teams": 1}
+    )
+    if not doc:
+        return None, 0
+    return doc.get("finalized_version"), int(doc.get("finalized_teams") or 0)
+
+
+async def _newer_pointer(contest_id: str, version: int) -> Optional[Tuple[int, int]]:
+    """(version, teams) if the contest was re-finalized past ``version``, else None.
+
+    The caller's contest came from a cache that has not seen the swap yet, so
+    this worker's cache entry is dropped too.
+    """
+    current, teams = await _current_pointer(contest_id)
+    if current is None or current == version:
+        return None
+    publish_local(CONTESTS, contest_id)
+    return current, teams
+
+
+async def _page_entries(contest_id: str, version: int, skip: int, end: int) -> Optional[List[RankedStanding]]:
+    """Entries ranked skip+1 .. end, or None if a page of the version is gone."""
+    entries: List[RankedStanding] = []
+    if skip >= end:
+        return entries
+    first, last = skip // STANDINGS_PAGE_SIZE, (end - 1) // STANDINGS_PAGE_SIZE
+    pages = await _load_pages(contest_id, version, range(first, last + 1))
+    for page in range(first, last + 1):
+        if page not in pages:
+            return None
+        entries.extend(ranked for ranked in pages[page] if skip < ranked.rank <= end)
+    return entries
+
+
+async def frozen_leaderboard_page(
+    contest: Contest,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    user: Optional[UserCard] = None,
+) -> LeaderboardPage:
+    """A leaderboard page of a finalized contest, plus ``user``'s best entry."""
+    contest_id, version, total = str(contest.id), contest.finalized_version, contest.finalized_teams
+    entries = await _page_entries(contest_id, version, skip, total if limit is None else min(total, skip + limit))
+    if entries is None:
+        newer = await _newer_pointer(contest_id, version)
+        if newer is not None:
+            version, total = newer
+            entries = await _page_entries(contest_id, version, skip, total if limit is None else min(total, skip + limit))
+        entries = entries or []
+
+    current = None
+    if user and ObjectId.is_valid(user.id):
+        doc = await ContestTeamBreakdown.get_motor_collection().find_one(
+            {"contest_id": ObjectId(contest_id), "version": version, "user_id": ObjectId(user.id)},
+            {"team_id": 1, "rank": 1, "team_name": 1, "points": 1, "rank_change": 1},
+            sort=[("rank", 1)],
+        )
+        if doc:
+            team = TeamCard(
+                id=str(doc["team_id"]),
+                user_id=user.id,
+                team_name=doc.get("team_name", ""),
+                player_ids=(),
+                rank_change=doc.get("rank_change"),
+            )
+            current = RankedStanding(doc["rank"], Standing(team, user, float(doc.get("points") or 0.0)))
+    return LeaderboardPage(entries=entries, current_user_entry=current, total=total)
+
+
+async def frozen_team_breakdown(contest: Contest, team_id: Any) -> Optional[ContestTeamBreakdown]:
+    """A team's frozen breakdown, or None if it was not ranked at finalization."""
+    if not ObjectId.is_valid(str(team_id)):
+        return None
+    query = {"contest_id": contest.id, "team_id": ObjectId(str(team_id))}
+    breakdown = await ContestTeamBreakdown.find_one({**query, "version": contest.finalized_version})
+    if breakdown is None:
+        # Either not ranked, or the version was dropped by a re-finalization this worker has not seen
+        newer = await _newer_pointer(str(contest.id), contest.finalized_version)
+        if newer is not None:
+            breakdown = await ContestTeamBreakdown.find_one({**query, "version": newer[0]})
+    return breakdown
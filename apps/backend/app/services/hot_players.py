@@ -6,6 +6,7 @@ from beanie import PydanticObjectId
 from app.models.team import Team
 from app.models.team_contest_enrollment import TeamContestEnrollment
 from app.common.enums.enrollments import EnrollmentStatus
+from app.utils.read_routing import heavy_read_collection
 
 
 async def count_global(player_id: str) -> int:
@@ -45,7 +46,7 @@ async def aggregate_hot_global(skip: int = 0, limit: int = 200) -> List[Dict[str
     Returns list of documents: {"_id": player_id_str, "selection_count": int}
     sorted by selection_count desc.
     """
-    coll = Team.get_motor_collection()
+    coll = heavy_read_collection(Team)
     pipeline = [
         {"$unwind": "$player_ids"},
         {"$group": {"_id": "$player_ids", "selection_count": {"$sum": 1}}},
@@ -67,7 +68,7 @@ async def aggregate_hot_in_contest(contest_id: str, skip: int = 0, limit: int =
     except Exception:
         return []
 
-    enr_coll = TeamContestEnrollment.get_motor_collection()
+    enr_coll = heavy_read_collection(TeamContestEnrollment)
     team_collection_name = Team.get_motor_collection().name
     pipeline = [
         {"$match": {"contest_id": contest_oid, "status": EnrollmentStatus.ACTIVE}},
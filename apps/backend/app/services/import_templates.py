@@ -0,0 +1,107 @@
+"""Cached player import templates.
+
+The XLSX template is a styled openpyxl workbook with a dropdown of slot codes.
+It only changes when the slot codes do. Each worker keeps the last template
+built per format, keyed by a version: a hash of the template revision and,
+for XLSX, the slot codes in the dropdown. The slot codes themselves are a
+CachedSection that is invalidated by writes to slots (or after
+IMPORT_TEMPLATE_CACHE_TTL_SECONDS). So a repeated download costs no query
+and no workbook build. A new version is built once, in the threadpool,
+shared by concurrent downloads.
+
+The version does not depend on the worker or the build time, so it doubles as
+an ETag. A client that already has the template gets an empty 304.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.common.invalidation import SLOTS
+from app.common.singleflight import SingleFlight
+from app.models.admin.slot import Slot
+from app.services.bootstrap import CachedSection
+from app.utils.import_players.import_template import (
+    TEMPLATE_COLUMNS,
+    build_xlsx_template,
+    generate_csv_template,
+)
+from config.settings import settings
+
+# Bump when the layout of the generated templates changes, so cached copies and ETags roll over
+TEMPLATE_REVISION = 1
+
+# Slot codes offered in the XLSX dropdown (the formula length limits it)
+MAX_TEMPLATE_SLOT_CODES = 50
+
+MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+
+
+@dataclass(frozen=True)
+class ImportTemplate:
+    format: str
+    version: str
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.format}-{self.version}"'
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+    @property
+    def filename(self) -> str:
+        return f"players_import_template.{self.format}"
+
+
+async def _load_slot_codes() -> Tuple[str, ...]:
+    cursor = Slot.get_motor_collection().find({}, {"code": 1}).sort("_id", 1).limit(MAX_TEMPLATE_SLOT_CODES)
+    return tuple([doc["code"] async for doc in cursor if doc.get("code")])
+
+
+def template_version(file_format: str, slot_codes: Tuple[str, ...] = ()) -> str:
+    """Hash of everything the template content depends on."""
+    parts = [str(TEMPLATE_REVISION), file_format, ",".join(TEMPLATE_COLUMNS), *slot_codes]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _build(file_format: str, slot_codes: Tuple[str, ...]) -> bytes:
+    if file_format == "xlsx":
+        return build_xlsx_template(list(slot_codes))
+    return generate_csv_template().encode()
+
+
+class ImportTemplateCache:
+    def __init__(self, ttl_seconds: float):
+        self._slot_codes = CachedSection("template_slot_codes", _load_slot_codes, ttl_seconds, collections=(SLOTS,))
+        self._templates: Dict[str, ImportTemplate] = {}
+        self._builds = SingleFlight("import_template", timeout=30.0)
+
+    async def get(self, file_format: str) -> ImportTemplate:
+        slot_codes = await self._slot_codes.get() if file_format == "xlsx" else ()
+        version = template_version(file_format, slot_codes)
+        template = self._templates.get(file_format)
+        if template is None or template.version != version:
+            template = await self._builds.do(
+                {"format": file_format, "version": version},
+                lambda: self._build(file_format, slot_codes, version),
+            )
+        return template
+
+    async def _build(self, file_format: str, slot_codes: Tuple[str, ...], version: str) -> ImportTemplate:
+        body = await run_in_threadpool(_build, file_format, slot_codes)
+        template = ImportTemplate(format=file_format, version=version, body=body)
+        # Keyed by content, so a build that raced a slot change is still right for its version
+        self._templates[file_format] = template
+        return template
+
+
+import_templates = ImportTemplateCache(settings.import_template_cache_ttl_seconds)
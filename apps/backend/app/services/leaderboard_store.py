@@ -0,0 +1,495 @@
+"""Redis sorted-set backend for the global and per-contest leaderboards.
+
+When REDIS_URL is set (and the ``redis`` package is installed), every
+leaderboard scope keeps its team scores in one sorted set:
+
+    lb:global              member = team id, score = global points
+    lb:contest:<id>        member = team id, score = contest points (C x2, VC x1.5)
+
+All uvicorn workers and instances share these sets. Reads serve a page with
+ZREVRANGE and the current user's best rank with ZREVRANK, so they no longer
+load every enrolled team and player. Point updates apply per-team deltas
+(ZADD XX INCR). A created, edited or newly enrolled team has its own score
+recomputed and set. Unenrolled or deleted teams are removed. Bulk admin
+operations drop the whole set, which is rebuilt from MongoDB
+(app.services.standings) on its next read. Every set also expires after
+LEADERBOARD_CACHE_TTL_SECONDS, which bounds drift from float deltas or a
+missed update.
+
+A rebuild is only stored if no delta or invalidation hit the scope while it
+was computing. A per-scope generation counter is WATCHed to check this.
+
+Without Redis, or while Redis is unreachable, everything falls back to the
+MongoDB computation, which ranks identically.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from bson import ObjectId
+
+from config.settings import settings
+from app.common.singleflight import SingleFlight
+from app.utils.read_routing import primary_reads
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.common.enums.enrollments import EnrollmentStatus
+from app.services.read_models import (
+    TeamCard,
+    UserCard,
+    fetch_contests_points,
+    fetch_player_points,
+    fetch_team_cards,
+    fetch_teams_with_players,
+    fetch_user_cards,
+    fetch_user_team_cards,
+)
+from app.services.standings import (
+    LeaderboardPage,
+    RankedStanding,
+    Ranking,
+    Standing,
+    contest_multiplier,
+    contest_team_points,
+    global_team_points,
+    paginate,
+)
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError, WatchError
+except ImportError:  # optional dependency
+    aioredis = None
+
+    class RedisError(Exception):
+        pass
+
+    class WatchError(RedisError):
+        pass
+
+
+logger = logging.getLogger("app.leaderboard_store")
+
+GLOBAL_SCOPE = "global"
+# Marks a built set (so an empty contest is distinguishable from a missing key); always ranks last
+BUILT_MARKER = "~built"
+ZADD_CHUNK = 5000
+STANDINGS_TIMEOUT_SECONDS = 30.0
+PAGE_TIMEOUT_SECONDS = 5.0
+
+
+def contest_scope(contest_id: Any) -> str:
+    return f"contest:{contest_id}"
+
+
+class LeaderboardStore:
+    """Team scores per leaderboard scope in Redis sorted sets."""
+
+    def __init__(self, client, ttl_seconds: int = 3600, prefix: str = "lb", retry_after_seconds: float = 30.0):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.retry_after_seconds = retry_after_seconds
+        self._retry_at = 0.0
+        # Set when an update could not be applied; sets are flushed before Redis is trusted again
+        self._dirty = False
+
+    def _key(self, scope: str) -> str:
+        return f"{self.prefix}:{scope}"
+
+    def _generation_key(self, scope: str) -> str:
+        return f"{self.prefix}:{scope}:gen"
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def mark_failed(self, exc: Exception) -> None:
+        """Back off after a Redis error; updates missed meanwhile force a flush later."""
+        if self.available:
+            logger.warning("Leaderboard store unavailable, using MongoDB for %ss: %s", self.retry_after_seconds, exc)
+        self._retry_at = time.monotonic() + self.retry_after_seconds
+        self._dirty = True
+
+    async def ensure_consistent(self) -> None:
+        """Drop every set if this worker missed updates while Redis was failing."""
+        if not self._dirty:
+            return
+        async for key in self.client.scan_iter(match=f"{self.prefix}:*", count=500):
+            if key.endswith(":gen"):
+                await self.client.incr(key)
+            else:
+                await self.client.delete(key)
+        self._dirty = False
+
+    async def generation(self, scope: str) -> int:
+        return int(await self.client.get(self._generation_key(scope)) or 0)
+
+    async def replace(self, scope: str, scores: Iterable[Tuple[str, float]], generation: int) -> bool:
+        """Store a freshly computed ranking unless the scope changed since ``generation`` was read."""
+        key, gen_key = self._key(scope), self._generation_key(scope)
+        async with self.client.pipeline(transaction=True) as pipe:
+            await pipe.watch(gen_key)
+            if int(await pipe.get(gen_key) or 0) != generation:
+                return False
+            pipe.multi()
+            pipe.delete(key)
+            pipe.zadd(key, {BUILT_MARKER: float("-inf")})
+            chunk: Dict[str, float] = {}
+            for team_id, points in scores:
+                chunk[team_id] = points
+                if len(chunk) >= ZADD_CHUNK:
+                    pipe.zadd(key, chunk)
+                    chunk = {}
+            if chunk:
+                pipe.zadd(key, chunk)
+            pipe.expire(key, self.ttl_seconds)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def page(self, scope: str, skip: int, limit: Optional[int]) -> Optional[Tuple[List[Tuple[str, float]], int]]:
+        """(team id, score) pairs ranked ``skip + 1``.. and the set size, or None when not built."""
+        stop = -1 if limit is None else skip + limit - 1
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._key(scope))
+            pipe.zrevrange(self._key(scope), skip, stop, withscores=True)
+            size, members = await pipe.execute()
+        if not size:
+            return None
+        return [(m, float(s)) for m, s in members if m != BUILT_MARKER], size - 1
+
+    async def best_rank(self, scope: str, team_ids: List[str]) -> Optional[Tuple[int, str, float]]:
+        """Best (1-based rank, team id, score) among ``team_ids``."""
+        if not team_ids:
+            return None
+        key = self._key(scope)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for team_id in team_ids:
+                pipe.zrevrank(key, team_id)
+                pipe.zscore(key, team_id)
+            replies = await pipe.execute()
+        best = None
+        for team_id, rank, score in zip(team_ids, replies[::2], replies[1::2]):
+            if rank is not None and (best is None or rank < best[0]):
+                best = (rank, team_id, float(score))
+        return None if best is None else (best[0] + 1, best[1], best[2])
+
+    async def increment(self, scope: str, deltas: Mapping[str, float]) -> None:
+        """Add per-team deltas to a built set; teams not in it are left out."""
+        gen_key = self._generation_key(scope)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, self.ttl_seconds)
+            for team_id, delta in deltas.items():
+                pipe.zadd(self._key(scope), {team_id: delta}, xx=True, incr=True)
+            await pipe.execute()
+
+    async def upsert(self, scores_by_scope: Mapping[str, Mapping[str, float]]) -> None:
+        """Set team scores in the scopes that are built; missing scopes are left to rebuild."""
+        keys = {scope: self._key(scope) for scope in scores_by_scope}
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                await pipe.watch(*keys.values())
+                built = {scope: await pipe.exists(key) for scope, key in keys.items()}
+                pipe.multi()
+                for scope, scores in scores_by_scope.items():
+                    gen_key = self._generation_key(scope)
+                    pipe.incr(gen_key)
+                    pipe.expire(gen_key, self.ttl_seconds)
+                    if built[scope] and scores:
+                        pipe.zadd(keys[scope], dict(scores))
+                await pipe.execute()
+        except WatchError:
+            # A set was rebuilt or dropped meanwhile; drop it again rather than guess
+            await self.invalidate(scores_by_scope)
+
+    async def remove(self, scopes: Iterable[str], team_ids: List[str]) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            for scope in scopes:
+                gen_key = self._generation_key(scope)
+                pipe.incr(gen_key)
+                pipe.expire(gen_key, self.ttl_seconds)
+                if team_ids:
+                    pipe.zrem(self._key(scope), *team_ids)
+            await pipe.execute()
+
+    async def invalidate(self, scopes: Iterable[str]) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            for scope in scopes:
+                gen_key = self._generation_key(scope)
+                pipe.incr(gen_key)
+                pipe.expire(gen_key, self.ttl_seconds)
+                pipe.delete(self._key(scope))
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_store: Optional[LeaderboardStore] = None
+_configured = False
+
+
+def get_leaderboard_store() -> Optional[LeaderboardStore]:
+    """The configured store, or None when leaderboards are served from MongoDB only."""
+    global _store, _configured
+    if not _configured:
+        _configured = True
+        if settings.redis_url and aioredis is not None:
+            client = aioredis.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=1.0,
+                socket_timeout=1.0,
+            )
+            _store = LeaderboardStore(client, ttl_seconds=settings.leaderboard_cache_ttl_seconds)
+        elif settings.redis_url:
+            logger.warning("REDIS_URL is set but the redis package is not installed; leaderboards use MongoDB")
+    return _store
+
+
+def set_leaderboard_store(store: Optional[LeaderboardStore]) -> None:
+    """Install (or with None, disable) the store, e.g. one backed by fakeredis."""
+    global _store, _configured
+    _store = store
+    _configured = True
+
+
+async def close_leaderboard_store() -> None:
+    if _store is not None:
+        await _store.close()
+
+
+def _usable_store() -> Optional[LeaderboardStore]:
+    # While backing off, updates are skipped; the store is already marked for a flush
+    store = get_leaderboard_store()
+    return store if store is not None and store.available else None
+
+
+# Concurrent readers of the same ranking share one computation (see app.common.singleflight)
+_standings_flight = SingleFlight("leaderboard_standings", timeout=STANDINGS_TIMEOUT_SECONDS)
+_pages_flight = SingleFlight("leaderboard_page", timeout=PAGE_TIMEOUT_SECONDS)
+
+
+async def leaderboard_page(
+    scope: str,
+    compute: Callable[[], Awaitable[Ranking]],
+    skip: int = 0,
+    limit: Optional[int] = None,
+    user: Optional[UserCard] = None,
+) -> LeaderboardPage:
+    """A leaderboard page, plus ``user``'s best entry.
+
+    The page is served from Redis. If the scope is not built yet, it is
+    rebuilt from ``compute``. Without a usable store, ``compute`` builds the
+    whole page. Only the shared part is coalesced across concurrent requests:
+    the full ranking, or the Redis page. The user's own entry is looked up
+    per request.
+    """
+    store = _usable_store()
+    if store is not None:
+        try:
+            shared = await _pages_flight.do(
+                {"scope": scope, "skip": skip, "limit": limit},
+                lambda: _store_page(store, scope, skip, limit),
+            )
+            if shared is not None:
+                entries, total = shared
+                current = await _store_user_entry(store, scope, user) if user else None
+                return LeaderboardPage(entries=entries, current_user_entry=current, total=total)
+        except RedisError as exc:
+            store.mark_failed(exc)
+            store = None
+
+    ranking = await _standings_flight.do({"scope": scope}, lambda: _compute_and_store(store, scope, compute))
+    return paginate(ranking, skip, limit, user.id if user else None)
+
+
+async def _compute_and_store(
+    store: Optional[LeaderboardStore],
+    scope: str,
+    compute: Callable[[], Awaitable[Ranking]],
+) -> Ranking:
+    if store is None:
+        return await compute()
+    try:
+        generation = await store.generation(scope)
+    except RedisError as exc:
+        store.mark_failed(exc)
+        return await compute()
+    # The stored set outlives this request; it must not miss a write a secondary has not seen yet
+    with primary_reads():
+        ranking = await compute()
+    try:
+        await store.replace(scope, ranking.scores(), generation)
+    except RedisError as exc:
+        store.mark_failed(exc)
+    return ranking
+
+
+async def _store_page(
+    store: LeaderboardStore,
+    scope: str,
+    skip: int,
+    limit: Optional[int],
+) -> Optional[Tuple[List[RankedStanding], int]]:
+    """Hydrated page entries and the ranking size, or None when the scope is not built."""
+    await store.ensure_consistent()
+    ranked = await store.page(scope, skip, limit)
+    if ranked is None:
+        return None
+    members, total = ranked
+    teams = {t.id: t for t in await fetch_team_cards([team_id for team_id, _ in members])}
+    users = await fetch_user_cards({t.user_id for t in teams.values()})
+
+    entries = []
+    for rank, (team_id, points) in enumerate(members, start=skip + 1):
+        team = teams.get(team_id)
+        user = users.get(team.user_id) if team else None
+        if user:
+            entries.append(RankedStanding(rank, Standing(team, user, points)))
+    return entries, total
+
+
+async def _store_user_entry(store: LeaderboardStore, scope: str, user: UserCard) -> Optional[RankedStanding]:
+    teams = {t.id: t for t in await fetch_user_team_cards(user.id)}
+    best = await store.best_rank(scope, list(teams))
+    if best is None:
+        return None
+    rank, team_id, points = best
+    return RankedStanding(rank, Standing(teams[team_id], user, points))
+
+
+async def _apply_point_changes(scope: str, deltas: Mapping[str, float], weight) -> None:
+    store = _usable_store()
+    deltas = {str(pid): float(delta) for pid, delta in deltas.items() if delta}
+    if store is None or not deltas:
+        return
+    team_deltas: Dict[str, float] = {}
+    with primary_reads():
+        teams = await fetch_teams_with_players(deltas)
+    for team in teams:
+        change = 0.0
+        for oid in team.player_object_ids():
+            pid = str(oid)
+            if pid in deltas:
+                change += deltas[pid] * weight(team, pid)
+        if change:
+            team_deltas[team.id] = change
+    try:
+        await store.ensure_consistent()
+        await store.increment(scope, team_deltas)
+    except RedisError as exc:
+        store.mark_failed(exc)
+
+
+async def apply_contest_point_changes(contest_id: Any, deltas: Mapping[str, float]) -> None:
+    """Shift contest scores after per-contest player points changed by ``deltas`` (player id -> change)."""
+    await _apply_point_changes(contest_scope(contest_id), deltas, contest_multiplier)
+
+
+async def apply_global_point_changes(deltas: Mapping[str, float]) -> None:
+    """Shift global scores after ``Player.points`` changed by ``deltas`` (player id -> change)."""
+    await _apply_point_changes(GLOBAL_SCOPE, deltas, lambda team, pid: 1.0)
+
+
+async def invalidate_leaderboards(contest_ids: Iterable[Any] = (), include_global: bool = False) -> None:
+    """Drop the given contest (and optionally global) rankings so they rebuild on next read."""
+    store = _usable_store()
+    if store is None:
+        return
+    scopes = [contest_scope(cid) for cid in {str(cid) for cid in contest_ids}]
+    if include_global:
+        scopes.append(GLOBAL_SCOPE)
+    if not scopes:
+        return
+    try:
+        await store.ensure_consistent()
+        await store.invalidate(scopes)
+    except RedisError as exc:
+        store.mark_failed(exc)
+
+
+async def _active_contest_ids(team_id: Any) -> List[ObjectId]:
+    cursor = TeamContestEnrollment.get_motor_collection().find(
+        {"team_id": ObjectId(str(team_id)), "status": EnrollmentStatus.ACTIVE.value},
+        {"contest_id": 1},
+    )
+    return [doc["contest_id"] async for doc in cursor]
+
+
+async def refresh_team(team: Team, contest_ids: Optional[Iterable[Any]] = None, include_global: bool = True) -> None:
+    """Recompute one team's scores and set them in the built rankings it belongs to.
+
+    Call after a team is created, edited or enrolled. ``contest_ids`` defaults
+    to every contest the team is actively enrolled in.
+    """
+    store = _usable_store()
+    if store is None:
+        return
+    card = TeamCard.from_doc(team.model_dump(by_alias=True))
+    if contest_ids is None:
+        contest_ids = await _active_contest_ids(card.id)
+    contest_ids = list({str(cid) for cid in contest_ids})
+
+    scores_by_scope: Dict[str, Dict[str, float]] = {}
+    player_ids = card.player_object_ids()
+    with primary_reads():
+        points = await fetch_player_points(player_ids) if include_global else {}
+        points_by_contest = await fetch_contests_points(contest_ids, player_ids) if contest_ids else {}
+    if include_global:
+        scores_by_scope[GLOBAL_SCOPE] = {card.id: global_team_points(card, points)}
+    if contest_ids:
+        for cid in contest_ids:
+            scores_by_scope[contest_scope(cid)] = {card.id: contest_team_points(card, points_by_contest.get(cid, {}))}
+    if not scores_by_scope:
+        return
+    try:
+        await store.ensure_consistent()
+        await store.upsert(scores_by_scope)
+    except RedisError as exc:
+        store.mark_failed(exc)
+
+
+async def refresh_new_teams(teams: Iterable[Team]) -> None:
+    """Set the global scores of freshly created teams (enrolled in no contest yet) in one batch.
+
+    One player points query and one Redis transaction for all of them,
+    instead of a refresh_team round trip per team.
+    """
+    store = _usable_store()
+    if store is None:
+        return
+    cards = [TeamCard.from_doc(team.model_dump(by_alias=True)) for team in teams]
+    if not cards:
+        return
+    with primary_reads():
+        points = await fetch_player_points(pid for card in cards for pid in card.player_object_ids())
+    scores = {card.id: global_team_points(card, points) for card in cards}
+    try:
+        await store.ensure_consistent()
+        await store.upsert({GLOBAL_SCOPE: scores})
+    except RedisError as exc:
+        store.mark_failed(exc)
+
+
+async def remove_teams(team_ids: Iterable[Any], contest_ids: Iterable[Any] = (), include_global: bool = False) -> None:
+    """Take teams out of the given rankings after they were unenrolled or deleted."""
+    store = _usable_store()
+    if store is None:
+        return
+    scopes = [contest_scope(cid) for cid in {str(cid) for cid in contest_ids}]
+    if include_global:
+        scopes.append(GLOBAL_SCOPE)
+    if not scopes:
+        return
+    try:
+        await store.ensure_consistent()
+        await store.remove(scopes, [str(tid) for tid in team_ids])
+    except RedisError as exc:
+        store.mark_failed(exc)
@@ -0,0 +1,149 @@
+"""Validated rows of dry-run imports, kept for the commit of the same file.
+
+Admins run every import as a dry run first, then upload the same file again
+with dry_run=false. Without this, the commit re-parses the file and validates
+every row again, each row with its own slot and name-conflict queries. A dry
+run now stores its outcome (valid rows, errors, conflicts) under the file's
+SHA-256 checksum, the user and the import options, for
+IMPORT_DRY_RUN_TTL_SECONDS. The commit of a matching file goes straight to the
+write phase.
+
+Validation depends on the players (name conflicts) and the slots (slot
+lookup), so a stored outcome is only reused while ``catalog_version()`` is the
+same as when it was validated. Any insert, delete or update of a player or
+slot in between makes the commit validate the file again, as before.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+
+from app.models.admin.import_dry_run import ImportDryRun
+from app.models.admin.player import Player
+from app.models.admin.slot import Slot
+from config.settings import settings
+
+# One row per collection: how many documents, the newest _id and the latest update
+_FINGERPRINT_PIPELINE = [
+    {
+        "$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "last_id": {"$max": "$_id"},
+            "last_update": {"$max": "$updated_at"},
+        }
+    }
+]
+
+
+async def _fingerprint(collection) -> str:
+    rows = await collection.aggregate(_FINGERPRINT_PIPELINE).to_list(length=1)
+    if not rows:
+        return "0"
+    row = rows[0]
+    return f"{row['count']}:{row['last_id']}:{row['last_update']}"
+
+
+async def catalog_version() -> str:
+    """A fingerprint of the players and slots collections that changes with any write to them."""
+    players, slots = await asyncio.gather(
+        _fingerprint(Player.get_motor_collection()),
+        _fingerprint(Slot.get_motor_collection()),
+    )
+    return hashlib.sha256(f"{players}|{slots}".encode()).hexdigest()[:16]
+
+
+def _key(checksum: str, user_id: str, conflict_policy: str, slot_strategy: str, header_row: int) -> Dict[str, Any]:
+    return {
+        "checksum": checksum,
+        "user_id": user_id,
+        "conflict_policy": conflict_policy,
+        "slot_strategy": slot_strategy,
+        "header_row": header_row,
+    }
+
+
+def _stored_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    stored = {k: v for k, v in row.items() if k != "_existing_player"}
+    if row.get("_is_update"):
+        stored["_existing_id"] = str(row["_existing_player"].id)
+    return stored
+
+
+async def save_dry_run(
+    checksum: str,
+    user_id: str,
+    conflict_policy: str,
+    slot_strategy: str,
+    header_row: int,
+    file_format: str,
+    total_rows: int,
+    valid_data: List[Dict[str, Any]],
+    errors: List[Dict[str, Any]],
+    conflicts: List[Dict[str, Any]],
+) -> Optional[ImportDryRun]:
+    """Store a dry run's outcome, replacing an earlier dry run of the same file and options."""
+    ttl = settings.import_dry_run_ttl_seconds
+    if ttl <= 0:
+        return None
+    key = _key(checksum, user_id, conflict_policy, slot_strategy, header_row)
+    # After validation, so slots created by slot_strategy=create are part of the version
+    version = await catalog_version()
+    now = datetime.utcnow()
+    await ImportDryRun.find(key).delete()
+    dry_run = ImportDryRun(
+        **key,
+        catalog_version=version,
+        format=file_format,
+        total_rows=total_rows,
+        valid_rows=[_stored_row(row) for row in valid_data],
+        errors=errors,
+        conflicts=conflicts,
+        created_at=now,
+        expires_at=now + timedelta(seconds=ttl),
+    )
+    await dry_run.insert()
+    return dry_run
+
+
+async def load_dry_run(
+    checksum: str,
+    user_id: str,
+    conflict_policy: str,
+    slot_strategy: str,
+    header_row: int,
+) -> Optional[ImportDryRun]:
+    """The unexpired dry run of this file and options, if the catalog has not changed since."""
+    if settings.import_dry_run_ttl_seconds <= 0:
+        return None
+    key = _key(checksum, user_id, conflict_policy, slot_strategy, header_row)
+    # The TTL monitor only runs every minute, so check expiry here too
+    dry_run, version = await asyncio.gather(
+        ImportDryRun.find_one({**key, "expires_at": {"$gt": datetime.utcnow()}}),
+        catalog_version(),
+    )
+    if dry_run is None or dry_run.catalog_version != version:
+        return None
+    return dry_run
+
+
+async def restore_rows(dry_run: ImportDryRun) -> Optional[List[Dict[str, Any]]]:
+    """The dry run's valid rows as validate_and_process_rows returned them, or None if a player to update is gone."""
+    ids = {row["_existing_id"] for row in dry_run.valid_rows if row.get("_is_update")}
+    existing: Dict[str, Player] = {}
+    if ids:
+        players = await Player.find({"_id": {"$in": [ObjectId(pid) for pid in ids]}}).to_list()
+        existing = {str(p.id): p for p in players}
+        if len(existing) != len(ids):
+            return None
+    rows = []
+    for stored in dry_run.valid_rows:
+        row = {k: v for k, v in stored.items() if k != "_existing_id"}
+        if stored.get("_is_update"):
+            row["_existing_player"] = existing[stored["_existing_id"]]
+        rows.append(row)
+    return rows
@@ -1,11 +1,19 @@
 """Player import service - Business logic for importing players"""
 import hashlib
+import io
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from fastapi import UploadFile
 
 from app.models.admin.player import Player
 from app.models.admin.import_log import ImportLog
+from app.common.invalidation import PLAYERS, invalidation_bus
+from app.services.leaderboard_store import apply_global_point_changes
+from app.services.player_import.dry_runs import (
+    load_dry_run,
+    restore_rows,
+    save_dry_run,
+)
 from app.utils.import_players.import_parsers import parse_xlsx, parse_csv, detect_format
 from app.utils.import_players.import_validators import (
     validate_player_row,
@@ -37,23 +45,13 @@ class PlayerImportService:
         return hashlib.sha256(content).hexdigest()
 
     @staticmethod
-    async def parse_file(
-        file: UploadFile, header_row: int = 1
-    ) -> Tuple[str, List[str], List[Dict[str, Any]], bytes]:
+    async def read_file(file: UploadFile) -> Tuple[str, bytes]:
         """
-        Parse uploaded file and return format, headers, rows, and content
-        
-        Args:
-            file: Uploaded file
-            header_row: Row number for headers (1-based)
-            
-        Returns:
-            Tuple of (format, headers, rows, file_content)
-            
+        Read uploaded file and return its format and content
+
         Raises:
-            ValueError: If file format is invalid or parsing fails
+            ValueError: If file format is invalid or the file is too large
         """
-        # Read file content
         content = await file.read()
         await file.seek(0)
 
@@ -67,16 +65,48 @@ class PlayerImportService:
                 f"File too large. Maximum size: {max_size / 1024 / 1024:.1f}MB"
             )
 
-        # Parse file
+        return file_format, content
+
+    @staticmethod
+    def parse_content(
+        file_format: str, content: bytes, header_row: int = 1
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Parse file content and return headers and rows
+
+        Raises:
+            ValueError: If parsing fails or there are too many rows
+        """
         if file_format == "xlsx":
-            headers, rows = parse_xlsx(file.file, header_row)
+            headers, rows = parse_xlsx(io.BytesIO(content), header_row)
         else:
-            headers, rows = parse_csv(file.file, header_row)
+            headers, rows = parse_csv(io.BytesIO(content), header_row)
 
         # Validate row count
         if len(rows) > MAX_ROWS:
             raise ValueError(f"Too many rows. Maximum: {MAX_ROWS}")
 
+        return headers, rows
+
+    @staticmethod
+    async def parse_file(
+        file: UploadFile, header_row: int = 1
+    ) -> Tuple[str, List[str], List[Dict[str, Any]], bytes]:
+        """
+        Parse uploaded file and return format, headers, rows, and content
+        
+        Args:
+            file: Uploaded file
+            header_row: Row number for headers (1-based)
+            
+        Returns:
+            Tuple of (format, headers, rows, file_content)
+            
+        Raises:
+            ValueError: If file format is invalid or parsing fails
+        """
+        file_format, content = await PlayerImportService.read_file(file)
+        headers, rows = PlayerImportService.parse_content(file_format, content, header_row)
         return file_format, headers, rows, content
 
     @staticmethod
@@ -183,6 +213,8 @@ class PlayerImportService:
         created_count = 0
         updated_count = 0
         skipped_count = 0
+        # player id -> points change, applied to the leaderboard store afterwards
+        point_deltas: Dict[str, float] = {}
 
         # Process in chunks
         for i in range(0, len(valid_data), CHUNK_SIZE):
@@ -195,6 +227,9 @@ class PlayerImportService:
                     existing.team = validated_data["team"]
                     existing.status = validated_data["status"]
                     existing.price = validated_data["price"]
+                    delta = float(validated_data["points"] or 0.0) - float(existing.points or 0.0)
+                    if delta:
+                        point_deltas[str(existing.id)] = delta
                     existing.points = validated_data["points"]
                     existing.slot = validated_data.get("slot")
                     existing.image_url = validated_data.get("image_url")
@@ -219,6 +254,9 @@ class PlayerImportService:
                     await new_player.insert()
                     created_count += 1
 
+        if created_count or updated_count:
+            invalidation_bus.flush([PLAYERS], reason="player import")
+        await apply_global_point_changes(point_deltas)
         return created_count, updated_count, skipped_count
 
     @staticmethod
@@ -276,6 +314,10 @@ class PlayerImportService:
     ) -> ImportResponse:
         """
         Main orchestration method for player import
+
+        A dry run stores its validated rows (see dry_runs). Committing the
+        same file with the same options reuses them while the players and
+        slots are unchanged, and skips parsing and validation.
         
         Args:
             file: Uploaded file
@@ -289,18 +331,48 @@ class PlayerImportService:
         Returns:
             ImportResponse with results
         """
-        # Parse file
-        file_format, headers, rows, content = await PlayerImportService.parse_file(
-            file, header_row
-        )
+        # Read file
+        file_format, content = await PlayerImportService.read_file(file)
 
         # Calculate checksum
         checksum = PlayerImportService.calculate_file_checksum(content)
 
-        # Validate and process rows
-        valid_data, errors, conflicts = await PlayerImportService.validate_and_process_rows(
-            rows, slot_strategy, conflict
-        )
+        # Reuse the rows validated by a dry run of this file
+        dry_run_doc = None
+        valid_data = None
+        if not dry_run:
+            dry_run_doc = await load_dry_run(checksum, user_id, conflict, slot_strategy, header_row)
+            if dry_run_doc is not None:
+                valid_data = await restore_rows(dry_run_doc)
+
+        if valid_data is not None:
+            total_rows = dry_run_doc.total_rows
+            errors = [RowError(**e) for e in dry_run_doc.errors]
+            conflicts = [ConflictDetail(**c) for c in dry_run_doc.conflicts]
+        else:
+            dry_run_doc = None
+            # Parse file
+            headers, rows = PlayerImportService.parse_content(file_format, content, header_row)
+            total_rows = len(rows)
+
+            # Validate and process rows
+            valid_data, errors, conflicts = await PlayerImportService.validate_and_process_rows(
+                rows, slot_strategy, conflict
+            )
+
+            if dry_run:
+                await save_dry_run(
+                    checksum=checksum,
+                    user_id=user_id,
+                    conflict_policy=conflict,
+                    slot_strategy=slot_strategy,
+                    header_row=header_row,
+                    file_format=file_format,
+                    total_rows=total_rows,
+                    valid_data=valid_data,
+                    errors=[e.model_dump() for e in errors],
+                    conflicts=[c.model_dump() for c in conflicts],
+                )
 
         # Get samples for preview
         samples = PlayerImportService.get_samples(valid_data)
@@ -312,6 +384,9 @@ class PlayerImportService:
 
         if not dry_run and len(errors) == 0:
             created, updated, skipped = await PlayerImportService.save_players(valid_data)
+            if dry_run_doc is not None:
+                # Used up: the write changed the catalog it was validated against
+                await dry_run_doc.delete()
 
         # Create import log
         await PlayerImportService.create_import_log(
@@ -323,7 +398,7 @@ class PlayerImportService:
             conflict_policy=conflict,
             slot_strategy=slot_strategy,
             dry_run=dry_run,
-            total_rows=len(rows),
+            total_rows=total_rows,
             created=created,
             updated=updated,
             skipped=skipped,
@@ -340,7 +415,7 @@ class PlayerImportService:
         return ImportResponse(
             dry_run=dry_run,
             format=file_format,
-            total_rows=len(rows),
+            total_rows=total_rows,
             valid_rows=len(valid_data),
             invalid_rows=len(errors),
             created=created,
@@ -350,4 +425,6 @@ class PlayerImportService:
             errors=errors[:MAX_ERRORS_RETURNED],
             samples=samples,
             has_more_errors=len(errors) > MAX_ERRORS_RETURNED,
+            checksum=checksum,
+            reused_dry_run=dry_run_doc is not None,
         )
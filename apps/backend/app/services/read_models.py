@@ -0,0 +1,290 @@
+"""Projected, lightweight read models for hot read paths.
+
+Leaderboards and hot-player listings only need a handful of fields from users,
+teams and players. Loading full Beanie documents means transferring every field
+and running full Pydantic validation per row, which dominates at tens of
+thousands of teams. The helpers here ask Motor for just the projected fields and
+wrap each raw row in a slotted dataclass without any validation. Reads are
+routed with the heavy-read preference (see app.utils.read_routing).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+
+from app.models.user import User
+from app.models.team import Team
+from app.models.player import Player
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.common.enums.enrollments import EnrollmentStatus
+from app.utils.read_routing import heavy_read_collection
+
+
+USER_CARD_PROJECTION = {"username": 1, "full_name": 1, "avatar_url": 1}
+TEAM_CARD_PROJECTION = {
+    "user_id": 1,
+    "team_name": 1,
+    "player_ids": 1,
+    "captain_id": 1,
+    "vice_captain_id": 1,
+    "total_points": 1,
+    "rank_change": 1,
+    "fingerprint": 1,
+}
+# Everything PlayerOut exposes except the (potentially large) stats dict
+PLAYER_CARD_PROJECTION = {
+    "name": 1,
+    "team": 1,
+    "price": 1,
+    "slot": 1,
+    "points": 1,
+    "is_available": 1,
+    "form": 1,
+    "injury_status": 1,
+    "image_url": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+# Everything PlayerOut exposes
+PLAYER_OUT_PROJECTION = {**PLAYER_CARD_PROJECTION, "stats": 1}
+
+
+@dataclass(frozen=True, slots=True)
+class UserCard:
+    """The user fields shown next to a leaderboard entry."""
+
+    id: str
+    username: str
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+    @property
+    def display_name(self) -> str:
+        return self.full_name or self.username
+
+    @classmethod
+    def from_doc(cls, doc: Mapping[str, Any]) -> "UserCard":
+        return cls(
+            id=str(doc["_id"]),
+            username=doc.get("username", ""),
+            full_name=doc.get("full_name"),
+            avatar_url=doc.get("avatar_url"),
+        )
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserCard":
+        return cls(id=str(user.id), username=user.username, full_name=user.full_name, avatar_url=user.avatar_url)
+
+
+@dataclass(frozen=True, slots=True)
+class TeamCard:
+    """The team fields needed to score and rank a team."""
+
+    id: str
+    user_id: str
+    team_name: str
+    player_ids: Tuple[str, ...]
+    captain_id: Optional[str] = None
+    vice_captain_id: Optional[str] = None
+    total_points: float = 0.0
+    rank_change: Optional[int] = None
+    fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_doc(cls, doc: Mapping[str, Any]) -> "TeamCard":
+        captain_id = doc.get("captain_id")
+        vice_captain_id = doc.get("vice_captain_id")
+        return cls(
+            id=str(doc["_id"]),
+            user_id=str(doc.get("user_id")),
+            team_name=doc.get("team_name", ""),
+            player_ids=tuple(str(pid) for pid in doc.get("player_ids") or ()),
+            captain_id=str(captain_id) if captain_id else None,
+            vice_captain_id=str(vice_captain_id) if vice_captain_id else None,
+            total_points=float(doc.get("total_points") or 0.0),
+            rank_change=doc.get("rank_change"),
+            fingerprint=doc.get("fingerprint"),
+        )
+
+    def player_object_ids(self) -> List[PydanticObjectId]:
+        """Valid player ids of this team as ObjectIds (malformed ids are skipped)."""
+        return [PydanticObjectId(pid) for pid in self.player_ids if ObjectId.is_valid(pid)]
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerCard:
+    """Public player fields without the stats payload."""
+
+    id: str
+    name: str
+    team: Optional[str] = None
+    price: float = 0.0
+    slot: Optional[str] = None
+    points: float = 0.0
+    is_available: bool = True
+    form: Optional[str] = None
+    injury_status: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_doc(cls, doc: Mapping[str, Any]) -> "PlayerCard":
+        slot = doc.get("slot")
+        is_available = doc.get("is_available")
+        return cls(
+            id=str(doc["_id"]),
+            name=doc.get("name", ""),
+            team=doc.get("team"),
+            price=doc.get("price") or 0.0,
+            slot=str(slot) if slot is not None else None,
+            points=doc.get("points") or 0.0,
+            is_available=True if is_available is None else bool(is_available),
+            form=doc.get("form"),
+            injury_status=doc.get("injury_status"),
+            image_url=doc.get("image_url"),
+            created_at=doc.get("created_at"),
+            updated_at=doc.get("updated_at"),
+        )
+
+
+def player_out_row(doc: Mapping[str, Any]) -> Dict[str, Any]:
+    """A raw player row as PlayerOut would serialize it, for RawJSONResponse."""
+    slot = doc.get("slot")
+    is_available = doc.get("is_available")
+    return {
+        "id": str(doc["_id"]),
+        "name": doc.get("name", ""),
+        "team": doc.get("team"),
+        "price": float(doc.get("price") or 0.0),
+        "slot": str(slot) if slot is not None else None,
+        "points": float(doc.get("points") or 0.0),
+        "is_available": True if is_available is None else bool(is_available),
+        "stats": doc.get("stats"),
+        "form": doc.get("form"),
+        "injury_status": doc.get("injury_status"),
+        "image_url": doc.get("image_url"),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+def _object_ids(ids: Iterable[Any]) -> List[ObjectId]:
+    """Deduplicate ids and keep only valid ObjectIds."""
+    out: Dict[str, ObjectId] = {}
+    for value in ids:
+        if isinstance(value, ObjectId):
+            out[str(value)] = value
+        elif value is not None and ObjectId.is_valid(str(value)):
+            out[str(value)] = ObjectId(str(value))
+    return list(out.values())
+
+
+async def fetch_user_cards(user_ids: Iterable[Any]) -> Dict[str, UserCard]:
+    """Load UserCards keyed by user id string."""
+    oids = _object_ids(user_ids)
+    if not oids:
+        return {}
+    cursor = heavy_read_collection(User).find({"_id": {"$in": oids}}, USER_CARD_PROJECTION)
+    return {str(doc["_id"]): UserCard.from_doc(doc) async for doc in cursor}
+
+
+async def fetch_team_cards(team_ids: Optional[Iterable[Any]] = None) -> List[TeamCard]:
+    """Load TeamCards for the given team ids, or for every team when ids is None."""
+    query: Dict[str, Any] = {}
+    if team_ids is not None:
+        oids = _object_ids(team_ids)
+        if not oids:
+            return []
+        query = {"_id": {"$in": oids}}
+    cursor = heavy_read_collection(Team).find(query, TEAM_CARD_PROJECTION)
+    return [TeamCard.from_doc(doc) async for doc in cursor]
+
+
+async def fetch_player_cards(player_ids: Iterable[Any]) -> Dict[str, PlayerCard]:
+    """Load PlayerCards keyed by player id string."""
+    oids = _object_ids(player_ids)
+    if not oids:
+        return {}
+    cursor = heavy_read_collection(Player).find({"_id": {"$in": oids}}, PLAYER_CARD_PROJECTION)
+    return {str(doc["_id"]): PlayerCard.from_doc(doc) async for doc in cursor}
+
+
+async def fetch_player_rows(player_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    """Load PlayerOut-shaped rows keyed by player id string."""
+    oids = _object_ids(player_ids)
+    if not oids:
+        return {}
+    cursor = heavy_read_collection(Player).find({"_id": {"$in": oids}}, PLAYER_OUT_PROJECTION)
+    return {str(doc["_id"]): player_out_row(doc) async for doc in cursor}
+
+
+async def fetch_player_points(player_ids: Iterable[Any]) -> Dict[str, float]:
+    """Load global Player.points keyed by player id string."""
+    oids = _object_ids(player_ids)
+    if not oids:
+        return {}
+    cursor = heavy_read_collection(Player).find({"_id": {"$in": oids}}, {"points": 1})
+    return {str(doc["_id"]): float(doc.get("points") or 0.0) async for doc in cursor}
+
+
+async def fetch_contest_points(contest_id: Any, player_ids: Iterable[Any]) -> Dict[str, float]:
+    """Load per-contest player points keyed by player id string."""
+    oids = _object_ids(player_ids)
+    if not oids:
+        return {}
+    cursor = heavy_read_collection(PlayerContestPoints).find(
+        {"contest_id": ObjectId(str(contest_id)), "player_id": {"$in": oids}},
+        {"player_id": 1, "points": 1},
+    )
+    return {str(doc["player_id"]): float(doc.get("points") or 0.0) async for doc in cursor}
+
+
+async def fetch_contests_points(contest_ids: Iterable[Any], player_ids: Iterable[Any]) -> Dict[str, Dict[str, float]]:
+    """Per-contest player points for several contests: contest id -> player id -> points."""
+    contest_oids = _object_ids(contest_ids)
+    oids = _object_ids(player_ids)
+    if not contest_oids or not oids:
+        return {}
+    cursor = PlayerContestPoints.get_motor_collection().find(
+        {"contest_id": {"$in": contest_oids}, "player_id": {"$in": oids}},
+        {"contest_id": 1, "player_id": 1, "points": 1},
+    )
+    out: Dict[str, Dict[str, float]] = {}
+    async for doc in cursor:
+        out.setdefault(str(doc["contest_id"]), {})[str(doc["player_id"])] = float(doc.get("points") or 0.0)
+    return out
+
+
+async def fetch_enrolled_team_ids(contest_id: Any) -> List[ObjectId]:
+    """Team ids actively enrolled in a contest, in enrollment order."""
+    cursor = heavy_read_collection(TeamContestEnrollment).find(
+        {"contest_id": ObjectId(str(contest_id)), "status": EnrollmentStatus.ACTIVE.value},
+        {"team_id": 1},
+    )
+    return [doc["team_id"] async for doc in cursor]
+
+
+async def fetch_user_team_cards(user_id: Any) -> List[TeamCard]:
+    """TeamCards of the teams owned by a user."""
+    if not ObjectId.is_valid(str(user_id)):
+        return []
+    cursor = heavy_read_collection(Team).find({"user_id": ObjectId(str(user_id))}, TEAM_CARD_PROJECTION)
+    return [TeamCard.from_doc(doc) async for doc in cursor]
+
+
+async def fetch_teams_with_players(player_ids: Iterable[Any]) -> List[TeamCard]:
+    """TeamCards of every team that selected at least one of the given players.
+
+    Used right after a write, so it reads from the primary.
+    """
+    ids = list({str(pid) for pid in player_ids})
+    if not ids:
+        return []
+    cursor = Team.get_motor_collection().find({"player_ids": {"$in": ids}}, TEAM_CARD_PROJECTION)
+    return [TeamCard.from_doc(doc) async for doc in cursor]
@@ -0,0 +1,4 @@
+"""Vectorized scoring of whole leaderboards"""
+from app.services.scoring.matrix import ScoringMatrix
+
+__all__ = ["ScoringMatrix"]
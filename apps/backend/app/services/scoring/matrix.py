@@ -0,0 +1,147 @@
+"""CSR team x player matrices that score a whole leaderboard in one product.
+
+Row i is a team composition and column j a player. Many teams share the
+same XI, captain and vice-captain (the same ``Team.fingerprint``). Each
+composition is stored and scored once, and its total is fanned out to every
+team that picked it. The stored value is the weight of player j's points in
+the composition's total: 1.0 on the global board, and the
+captain / vice-captain multipliers baked in for a contest. With every
+player's points in one dense vector, all team totals are a single sparse
+matrix-vector product, and ranking is a NumPy sort instead of per-team Python
+loops with id conversions and dict lookups:
+
+    matrix = ScoringMatrix.from_teams(teams, captain=2.0, vice_captain=1.5)
+    totals = matrix.totals(matrix.points_vector(points_by_player))
+    order = matrix.rank(totals)          # or matrix.top_k(totals, 50)
+
+Rankings match app.services.standings: points descending, then team id
+descending. Malformed player ids are skipped, as in TeamCard.player_object_ids.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+from bson import ObjectId
+
+from app.services.read_models import TeamCard
+
+
+class ScoringMatrix:
+    """Weights of each composition's players, in compressed sparse row form."""
+
+    __slots__ = ("team_ids", "team_rows", "player_ids", "columns", "indptr", "indices", "data", "_rows", "_id_rank")
+
+    def __init__(
+        self,
+        team_ids: List[str],
+        team_rows: np.ndarray,
+        player_ids: List[str],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+    ):
+        self.team_ids = team_ids
+        # Composition row of each team
+        self.team_rows = team_rows
+        self.player_ids = player_ids
+        self.columns: Dict[str, int] = {pid: j for j, pid in enumerate(player_ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        # Row of every stored weight, so the product is a single bincount
+        self._rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+        # Position of each team id in ascending id order: the tie-breaker
+        self._id_rank = np.empty(len(team_ids), dtype=np.int64)
+        self._id_rank[np.argsort(np.array(team_ids, dtype=str), kind="stable")] = np.arange(len(team_ids))
+
+    @classmethod
+    def from_teams(
+        cls,
+        teams: Sequence[TeamCard],
+        captain: float = 1.0,
+        vice_captain: float = 1.0,
+    ) -> "ScoringMatrix":
+        """Encode each distinct composition as a row, weighting captain and vice-captain picks."""
+        columns: Dict[str, int] = {}
+        player_ids: List[str] = []
+        compositions: Dict[Any, int] = {}
+        team_rows = np.empty(len(teams), dtype=np.int64)
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for i, team in enumerate(teams):
+            # Teams saved before fingerprints existed fall back to their raw composition
+            key = team.fingerprint or (tuple(sorted(team.player_ids)), team.captain_id, team.vice_captain_id)
+            row = compositions.get(key)
+            if row is not None:
+                team_rows[i] = row
+                continue
+            team_rows[i] = compositions[key] = len(compositions)
+            for pid in team.player_ids:
+                j = columns.get(pid)
+                if j is None:
+                    if not ObjectId.is_valid(pid):
+                        columns[pid] = j = -1
+                    else:
+                        columns[pid] = j = len(player_ids)
+                        player_ids.append(pid)
+                if j < 0:
+                    continue
+                indices.append(j)
+                if pid == team.captain_id:
+                    data.append(captain)
+                elif pid == team.vice_captain_id:
+                    data.append(vice_captain)
+                else:
+                    data.append(1.0)
+            indptr.append(len(indices))
+        return cls(
+            team_ids=[team.id for team in teams],
+            team_rows=team_rows,
+            player_ids=player_ids,
+            indptr=np.array(indptr, dtype=np.int64),
+            indices=np.array(indices, dtype=np.int64),
+            data=np.array(data, dtype=np.float64),
+        )
+
+    @property
+    def shape(self):
+        """(distinct compositions, players)"""
+        return len(self.indptr) - 1, len(self.player_ids)
+
+    def points_vector(self, points_by_player: Mapping[str, float]) -> np.ndarray:
+        """Dense points per column; players without points score 0."""
+        return np.fromiter(
+            (points_by_player.get(pid, 0.0) for pid in self.player_ids),
+            dtype=np.float64,
+            count=len(self.player_ids),
+        )
+
+    def totals(self, points: np.ndarray) -> np.ndarray:
+        """Every team's total: the matrix times the points vector, fanned out per team."""
+        per_composition = np.bincount(self._rows, weights=self.data * points[self.indices], minlength=len(self.indptr) - 1)
+        return per_composition[self.team_rows]
+
+    def rank(self, totals: np.ndarray) -> np.ndarray:
+        """Team indices from first to last place."""
+        return np.lexsort((self._id_rank, totals))[::-1]
+
+    def top_k(self, totals: np.ndarray, k: int) -> np.ndarray:
+        """Team indices of the first ``k`` places, without sorting the whole board."""
+        n = len(totals)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k >= n:
+            return self.rank(totals)
+        threshold = totals[np.argpartition(totals, n - k)[n - k:]].min()
+        # Everything tied with the k-th score competes on team id
+        candidates = np.flatnonzero(totals >= threshold)
+        order = np.lexsort((self._id_rank[candidates], totals[candidates]))[::-1]
+        return candidates[order[:k]]
+
+    def position(self, totals: np.ndarray, team: int) -> int:
+        """1-based rank of the team at index ``team``."""
+        score, id_rank = totals[team], self._id_rank[team]
+        ahead = (totals > score) | ((totals == score) & (self._id_rank > id_rank))
+        return int(np.count_nonzero(ahead)) + 1
@@ -0,0 +1,202 @@
+"""Set-based slot assignment for the admin slot routes.
+
+Assigning, unassigning and migrating slots touches many players at once.
+Admins reshuffle whole squads before a season, on a catalog of ~20k players.
+Each operation here is a single ``update_many`` (or one ``bulk_write`` for
+the migration) over the matching player ids, instead of a get + save per
+player. Each returns the stats of what it did, including the number of
+MongoDB round trips it took.
+
+Writes go straight to the ``players`` collection, so the PLAYERS caches are
+flushed here after any player changed.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateMany
+
+from app.common.invalidation import PLAYERS, SLOTS, invalidation_bus
+from app.models.admin.player import Player as AdminPlayer
+from app.models.admin.slot import Slot
+
+# Defaults for slots created from legacy values, as before
+LEGACY_SLOT_MIN_SELECT = 4
+LEGACY_SLOT_MAX_SELECT = 4
+
+
+@dataclass
+class SlotWriteStats:
+    requested: int = 0  # distinct player ids in the call
+    invalid: int = 0  # ids that are not ObjectIds
+    matched: int = 0  # players the write applied to
+    modified: int = 0  # players whose slot actually changed
+    round_trips: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SlotMigrationPlan:
+    """Outcome of migrate_legacy_slots, or what it would do with dry_run."""
+
+    dry_run: bool
+    created_slots: List[Dict[str, str]] = field(default_factory=list)
+    # Players per legacy value that were (or would be) repointed to a Slot id
+    normalized_players: Dict[str, int] = field(default_factory=dict)
+    # Players already referencing an existing Slot id
+    already_normalized: int = 0
+    round_trips: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _players():
+    return AdminPlayer.get_motor_collection()
+
+
+def _object_ids(player_ids: Iterable[str], stats: SlotWriteStats) -> List[ObjectId]:
+    distinct = list(dict.fromkeys(str(pid) for pid in player_ids))
+    stats.requested = len(distinct)
+    oids = [ObjectId(pid) for pid in distinct if ObjectId.is_valid(pid)]
+    stats.invalid = stats.requested - len(oids)
+    return oids
+
+
+def _finish(stats, started: float, players_changed: bool):
+    stats.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    if players_changed:
+        invalidation_bus.flush([PLAYERS], reason="slot assignment")
+    return stats
+
+
+async def assign_players(slot_id: str, player_ids: Iterable[str]) -> SlotWriteStats:
+    """Point every existing player among ``player_ids`` at the slot."""
+    started = time.perf_counter()
+    stats = SlotWriteStats()
+    oids = _object_ids(player_ids, stats)
+    if oids:
+        result = await _players().update_many({"_id": {"$in": oids}}, {"$set": {"slot": slot_id}})
+        stats.matched, stats.modified = result.matched_count, result.modified_count
+        stats.round_trips = 1
+    return _finish(stats, started, stats.modified > 0)
+
+
+async def unassign_players(slot_id: str, player_ids: Iterable[str]) -> SlotWriteStats:
+    """Clear the slot of the players among ``player_ids`` that are in it."""
+    started = time.perf_counter()
+    stats = SlotWriteStats()
+    oids = _object_ids(player_ids, stats)
+    if oids:
+        result = await _players().update_many({"_id": {"$in": oids}, "slot": slot_id}, {"$set": {"slot": None}})
+        stats.matched, stats.modified = result.matched_count, result.modified_count
+        stats.round_trips = 1
+    return _finish(stats, started, stats.modified > 0)
+
+
+async def slot_has_players(slot_id: str) -> bool:
+    return bool(await _players().count_documents({"slot": slot_id}, limit=1))
+
+
+async def clear_slot(slot_id: str) -> SlotWriteStats:
+    """Unassign every player of the slot."""
+    started = time.perf_counter()
+    stats = SlotWriteStats()
+    result = await _players().update_many({"slot": slot_id}, {"$set": {"slot": None}})
+    stats.requested = stats.matched = result.matched_count
+    stats.modified = result.modified_count
+    stats.round_trips = 1
+    return _finish(stats, started, stats.modified > 0)
+
+
+async def _legacy_slot_values() -> Dict[str, Tuple[List[Any], int]]:
+    """Distinct player slot values with their player counts, keyed by their string form.
+
+    Legacy numeric slots may be stored as ints or as digit strings; both forms
+    of one value are grouped under the same key.
+    """
+    pipeline = [
+        {"$match": {"slot": {"$nin": [None, ""]}}},
+        {"$group": {"_id": "$slot", "players": {"$sum": 1}}},
+    ]
+    values: Dict[str, Tuple[List[Any], int]] = {}
+    async for row in _players().aggregate(pipeline):
+        raw, count = row["_id"], int(row["players"])
+        key = str(raw)
+        raws, total = values.get(key, ([], 0))
+        values[key] = (raws + [raw], total + count)
+    return values
+
+
+async def migrate_legacy_slots(dry_run: bool = False) -> SlotMigrationPlan:
+    """Create Slots for legacy player slot values and repoint those players at the Slot ids.
+
+    A value that is already the id of an existing Slot is left alone. Any other
+    value maps to the Slot with code ``SLOT_<VALUE>`` or name ``Slot <VALUE>``,
+    which is created when neither exists.
+    """
+    started = time.perf_counter()
+    plan = SlotMigrationPlan(dry_run=dry_run)
+    values = await _legacy_slot_values()
+    plan.round_trips += 1
+    if not values:
+        return _finish(plan, started, False)
+
+    wanted_codes = {key: f"SLOT_{key.upper()}" for key in values}
+    wanted_names = {key: f"Slot {key}" for key in values}
+    candidate_ids = [ObjectId(key) for key in values if ObjectId.is_valid(key)]
+    or_clauses: List[Dict[str, Any]] = [
+        {"code": {"$in": list(wanted_codes.values())}},
+        {"name": {"$in": list(wanted_names.values())}},
+    ]
+    if candidate_ids:
+        or_clauses.append({"_id": {"$in": candidate_ids}})
+    existing = await Slot.get_motor_collection().find({"$or": or_clauses}, {"code": 1, "name": 1}).to_list(length=None)
+    plan.round_trips += 1
+    by_id = {str(doc["_id"]) for doc in existing}
+    by_code = {doc["code"]: str(doc["_id"]) for doc in existing}
+    by_name = {doc["name"]: str(doc["_id"]) for doc in existing}
+
+    targets: Dict[str, str] = {}
+    new_slots: List[Slot] = []
+    for key, (_, count) in values.items():
+        if key in by_id:
+            plan.already_normalized += count
+            continue
+        code, name = wanted_codes[key], wanted_names[key]
+        target = by_code.get(code) or by_name.get(name)
+        if target is None:
+            now = datetime.utcnow()
+            slot = Slot(
+                id=ObjectId(),
+                code=code,
+                name=name,
+                min_select=LEGACY_SLOT_MIN_SELECT,
+                max_select=LEGACY_SLOT_MAX_SELECT,
+                created_at=now,
+                updated_at=now,
+            )
+            new_slots.append(slot)
+            plan.created_slots.append({"legacy": key, "code": code, "name": name})
+            target = str(slot.id)
+        targets[key] = target
+        plan.normalized_players[key] = count
+
+    if not dry_run:
+        if new_slots:
+            await Slot.insert_many(new_slots)
+            plan.round_trips += 1
+            invalidation_bus.flush([SLOTS], reason="slot migration")
+        ops = [UpdateMany({"slot": {"$in": values[key][0]}}, {"$set": {"slot": target}}) for key, target in targets.items()]
+        if ops:
+            await _players().bulk_write(ops, ordered=False)
+            plan.round_trips += 1
+    return _finish(plan, started, not dry_run and bool(targets))
@@ -0,0 +1,215 @@
+"""Team standings for the global and per-contest leaderboards.
+
+Scoring rules:
+- Global: a team scores the sum of its players' ``Player.points``.
+- Contest: a team scores the sum of its players' ``PlayerContestPoints`` for
+  that contest, with the captain counted x2 and the vice-captain x1.5.
+
+Teams whose owner no longer exists are left out of both. Equal scores are
+ordered by team id, descending.
+
+The ``compute_*`` helpers score every team from MongoDB at once with a
+sparse matrix (app.services.scoring) and return a ``Ranking``. ``paginate``
+reads a page, plus the current user's best entry, out of it: only the rows
+up to the end of the page are ordered, and ``Standing`` objects are built
+for the returned rows only. The Redis-backed store
+(app.services.leaderboard_store) keeps the same rankings incrementally and
+calls ``compute_*`` to (re)build them.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.models.team import Team
+from app.services.scoring import ScoringMatrix
+from app.services.read_models import (
+    TeamCard,
+    UserCard,
+    fetch_contest_points,
+    fetch_enrolled_team_ids,
+    fetch_player_points,
+    fetch_team_cards,
+    fetch_user_cards,
+)
+
+CAPTAIN_MULTIPLIER = 2.0
+VICE_CAPTAIN_MULTIPLIER = 1.5
+
+
+@dataclass(frozen=True, slots=True)
+class Standing:
+    """A scored team together with its owner."""
+
+    team: TeamCard
+    user: UserCard
+    points: float
+
+
+@dataclass(frozen=True, slots=True)
+class RankedStanding:
+    rank: int
+    standing: Standing
+
+
+class Ranking:
+    """Every scored team of a leaderboard, read out in rank order on demand.
+
+    Teams whose owner no longer exists are scored but never ranked.
+    """
+
+    __slots__ = ("matrix", "teams", "users_by_id", "totals", "_owned")
+
+    def __init__(
+        self,
+        matrix: ScoringMatrix,
+        teams: List[TeamCard],
+        users_by_id: Dict[str, UserCard],
+        totals: np.ndarray,
+    ):
+        self.matrix = matrix
+        self.teams = teams
+        self.users_by_id = users_by_id
+        self._owned = np.fromiter((team.user_id in users_by_id for team in teams), dtype=bool, count=len(teams))
+        # Ownerless teams sink below every ranked one, so positions only count owned teams
+        self.totals = np.where(self._owned, totals, -np.inf)
+
+    @classmethod
+    def empty(cls) -> "Ranking":
+        return cls(ScoringMatrix.from_teams([]), [], {}, np.empty(0, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._owned))
+
+    def standing(self, i: int) -> Standing:
+        team = self.teams[i]
+        return Standing(team, self.users_by_id[team.user_id], float(self.totals[i]))
+
+    def page(self, skip: int = 0, limit: Optional[int] = None) -> List[RankedStanding]:
+        """Ranked entries ``skip + 1`` to ``skip + limit``."""
+        end = len(self) if limit is None else min(skip + limit, len(self))
+        if skip >= end:
+            return []
+        order = self.matrix.top_k(self.totals, end)[skip:].tolist()
+        return [RankedStanding(rank, self.standing(i)) for rank, i in enumerate(order, start=skip + 1)]
+
+    def standings(self) -> List[Standing]:
+        """The whole board in rank order."""
+        return [entry.standing for entry in self.page()]
+
+    def scores(self) -> Iterator[Tuple[str, float]]:
+        """(team id, points) of every ranked team, in no particular order."""
+        for i in np.flatnonzero(self._owned).tolist():
+            yield self.teams[i].id, float(self.totals[i])
+
+    def user_entry(self, user_id: str) -> Optional[RankedStanding]:
+        """The best-ranked entry of ``user_id``'s teams."""
+        positions = [
+            (self.matrix.position(self.totals, i), i)
+            for i, team in enumerate(self.teams)
+            if team.user_id == user_id and self._owned[i]
+        ]
+        if not positions:
+            return None
+        rank, i = min(positions)
+        return RankedStanding(rank, self.standing(i))
+
+
+@dataclass
+class LeaderboardPage:
+    entries: List[RankedStanding]
+    current_user_entry: Optional[RankedStanding]
+    total: int
+
+
+def contest_multiplier(team: TeamCard, player_id: str) -> float:
+    """Weight of a player's contest points in a team's contest total."""
+    if team.captain_id and player_id == team.captain_id:
+        return CAPTAIN_MULTIPLIER
+    if team.vice_captain_id and player_id == team.vice_captain_id:
+        return VICE_CAPTAIN_MULTIPLIER
+    return 1.0
+
+
+def contest_team_points(team: TeamCard, points_by_player: Dict[str, float]) -> float:
+    total = 0.0
+    for oid in team.player_object_ids():
+        pid = str(oid)
+        total += float(points_by_player.get(pid, 0.0)) * contest_multiplier(team, pid)
+    return float(total)
+
+
+def global_team_points(team: TeamCard, points_by_player: Dict[str, float]) -> float:
+    return float(sum(points_by_player.get(str(oid), 0.0) for oid in team.player_object_ids()))
+
+
+async def compute_contest_standings(contest_id: Any) -> Ranking:
+    """Rank the teams actively enrolled in a contest."""
+    team_ids = await fetch_enrolled_team_ids(contest_id)
+    if not team_ids:
+        return Ranking.empty()
+
+    teams = await fetch_team_cards(team_ids)
+    teams_by_id: Dict[str, TeamCard] = {t.id: t for t in teams}
+    users_by_id = await fetch_user_cards({t.user_id for t in teams})
+
+    ranked_teams: List[TeamCard] = []
+    for tid in team_ids:
+        team = teams_by_id.get(str(tid))
+        if team and team.user_id in users_by_id:
+            ranked_teams.append(team)
+
+    matrix = ScoringMatrix.from_teams(ranked_teams, CAPTAIN_MULTIPLIER, VICE_CAPTAIN_MULTIPLIER)
+    points_by_player = await fetch_contest_points(contest_id, matrix.player_ids)
+    totals = matrix.totals(matrix.points_vector(points_by_player))
+    return Ranking(matrix, ranked_teams, users_by_id, totals)
+
+
+async def compute_global_standings(sync_totals: bool = True) -> Ranking:
+    """Rank every team by the current points of its players.
+
+    With ``sync_totals`` the stored ``Team.total_points`` of teams whose total
+    drifted are brought up to date in one batched write.
+    """
+    teams = await fetch_team_cards()
+    if not teams:
+        return Ranking.empty()
+
+    matrix = ScoringMatrix.from_teams(teams)
+    points_by_player = await fetch_player_points(matrix.player_ids)
+    totals = matrix.totals(matrix.points_vector(points_by_player))
+
+    if sync_totals:
+        stored = np.fromiter((team.total_points for team in teams), dtype=np.float64, count=len(teams))
+        now = datetime.utcnow()
+        stale_totals = [
+            UpdateOne({"_id": ObjectId(teams[i].id)}, {"$set": {"total_points": float(totals[i]), "updated_at": now}})
+            for i in np.flatnonzero(totals != stored)
+        ]
+        if stale_totals:
+            try:
+                await Team.get_motor_collection().bulk_write(stale_totals, ordered=False)
+            except Exception:
+                pass
+
+    users_by_id = await fetch_user_cards({team.user_id for team in teams})
+    return Ranking(matrix, teams, users_by_id, totals)
+
+
+def paginate(
+    ranking: Ranking,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    user_id: Optional[str] = None,
+) -> LeaderboardPage:
+    """Cut a page out of a ranking and find the best-ranked entry of ``user_id``."""
+    return LeaderboardPage(
+        entries=ranking.page(skip, limit),
+        current_user_entry=ranking.user_entry(user_id) if user_id else None,
+        total=len(ranking),
+    )
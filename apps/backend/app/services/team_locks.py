@@ -0,0 +1,158 @@
+"""Whether a team is locked because a contest it is enrolled in is live.
+
+A team cannot be edited while it is actively enrolled in an ongoing contest
+whose window is open (start_at <= now < end_at). Edits peak in the minutes
+before a match, so the answer is kept in memory instead of being queried on
+every edit:
+
+- the windows of every ongoing contest that has not ended yet. The set of
+  contests locked right now is derived from them and recomputed only when the
+  clock passes the next start_at or end_at. The windows are reloaded after a
+  contest write (invalidation bus) and at least every
+  TEAM_LOCK_CACHE_TTL_SECONDS;
+- for each team asked about, the contests it is actively enrolled in. An
+  entry is dropped when the team's enrollments change (``forget_teams`` in
+  this process, any enrollment write seen on the change stream) and expires
+  after the same TTL.
+
+While no contest is locked, which is the case right up to the start of a
+match, no team is locked and nothing is queried at all.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.common.enums.contests import ContestStatus
+from app.common.enums.enrollments import EnrollmentStatus
+from app.common.invalidation import CONTESTS, ENROLLMENTS, InvalidationEvent, invalidation_bus
+from app.common.metrics.registry import team_lock_checks_total, team_lock_locked_contests
+from app.models.contest import Contest
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from config.settings import settings
+
+MAX_CACHED_TEAMS = 50_000
+
+
+class TeamLockState:
+    def __init__(self, ttl_seconds: float, max_teams: int = MAX_CACHED_TEAMS):
+        self.ttl_seconds = ttl_seconds
+        self.max_teams = max_teams
+        self._windows: Optional[List[Tuple[str, datetime, datetime]]] = None
+        self._windows_expire_at = 0.0
+        self._locked: FrozenSet[str] = frozenset()
+        self._next_boundary: Optional[datetime] = None
+        self._teams: "OrderedDict[str, Tuple[float, FrozenSet[str]]]" = OrderedDict()
+        # Bumped on invalidation, so a load that raced a write is not cached
+        self._contests_generation = 0
+        self._teams_generation = 0
+
+    def invalidate_contests(self) -> None:
+        self._windows = None
+        self._contests_generation += 1
+
+    def forget_teams(self, team_ids: Iterable) -> None:
+        for team_id in team_ids:
+            self._teams.pop(str(team_id), None)
+        self._teams_generation += 1
+
+    def clear_teams(self) -> None:
+        self._teams.clear()
+        self._teams_generation += 1
+
+    async def locked_contests(self) -> FrozenSet[str]:
+        """Ids of the contests whose locked window is open right now."""
+        now = datetime.utcnow()
+        if self._windows is None or time.monotonic() >= self._windows_expire_at:
+            await self._load_windows(now)
+        elif self._next_boundary is not None and now >= self._next_boundary:
+            self._recompute(now)
+        return self._locked
+
+    async def team_contests(self, team_id) -> FrozenSet[str]:
+        """Ids of the contests the team is actively enrolled in."""
+        key = str(team_id)
+        cached = self._teams.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._teams.move_to_end(key)
+            return cached[1]
+        if not ObjectId.is_valid(key):
+            return frozenset()
+
+        generation = self._teams_generation
+        contest_ids = await TeamContestEnrollment.get_motor_collection().distinct(
+            "contest_id",
+            {"team_id": ObjectId(key), "status": EnrollmentStatus.ACTIVE.value},
+        )
+        contests = frozenset(str(cid) for cid in contest_ids)
+        if generation == self._teams_generation:
+            self._teams[key] = (time.monotonic() + self.ttl_seconds, contests)
+            self._teams.move_to_end(key)
+            while len(self._teams) > self.max_teams:
+                self._teams.popitem(last=False)
+        return contests
+
+    async def is_locked(self, team_id) -> bool:
+        locked = await self.locked_contests()
+        if not locked:
+            team_lock_checks_total.inc(("no_live_contest",))
+            return False
+        source = "cache" if self._is_cached(team_id) else "query"
+        team_lock_checks_total.inc((source,))
+        return not locked.isdisjoint(await self.team_contests(team_id))
+
+    def _is_cached(self, team_id) -> bool:
+        cached = self._teams.get(str(team_id))
+        return cached is not None and cached[0] > time.monotonic()
+
+    async def _load_windows(self, now: datetime) -> None:
+        generation = self._contests_generation
+        cursor = Contest.get_motor_collection().find(
+            {"status": ContestStatus.ONGOING.value, "end_at": {"$gt": now}},
+            {"start_at": 1, "end_at": 1},
+        )
+        windows = [
+            (str(doc["_id"]), doc["start_at"], doc["end_at"])
+            async for doc in cursor
+            if doc.get("start_at") and doc.get("end_at")
+        ]
+        self._windows = windows
+        # A contest write during the load leaves the windows to be reloaded next time
+        self._windows_expire_at = time.monotonic() + self.ttl_seconds if generation == self._contests_generation else 0.0
+        self._recompute(now)
+
+    def _recompute(self, now: datetime) -> None:
+        windows = self._windows or []
+        self._locked = frozenset(cid for cid, start, end in windows if start <= now < end)
+        self._next_boundary = min(
+            (moment for _, start, end in windows for moment in (start, end) if moment > now),
+            default=None,
+        )
+        team_lock_locked_contests.set(len(self._locked))
+
+
+team_locks = TeamLockState(settings.team_lock_cache_ttl_seconds)
+
+
+def _on_contest_change(event: InvalidationEvent) -> None:
+    if event.touches("status", "start_at", "end_at"):
+        team_locks.invalidate_contests()
+
+
+invalidation_bus.subscribe(CONTESTS, _on_contest_change)
+# Enrollment events carry the enrollment id, not the team's, so drop every team
+invalidation_bus.subscribe(ENROLLMENTS, lambda event: team_locks.clear_teams())
+
+
+async def is_team_locked(team_id) -> bool:
+    """Whether the team is actively enrolled in a contest that is live right now."""
+    return await team_locks.is_locked(team_id)
+
+
+def forget_teams(team_ids: Iterable) -> None:
+    """Call after changing the enrollments of ``team_ids``."""
+    team_locks.forget_teams(team_ids)
@@ -0,0 +1,133 @@
+"""Background recompute of Team.total_points and Team.total_value.
+
+When a player's points or price change, the totals of every team that picked
+them change too. The admin routes no longer load those teams and their
+players into the request and save each team one by one. They start a job
+instead, and MongoDB does the work: for each batch of affected team ids, a
+single aggregation looks up the teams' players, sums points and price, and
+``$merge``s the totals back into ``teams``. Only team ids leave the server.
+
+Progress is written to a TeamRecomputeJob document after every batch, so any
+worker can report it. A job runs as a task of the worker that started it. If
+a restart interrupts it, the job stays "running"; just start another one,
+since recomputing is idempotent.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from bson import ObjectId
+
+from app.common.enums.jobs import JobStatus
+from app.models.admin.team_recompute_job import TeamRecomputeJob
+from app.models.player import Player
+from app.models.team import Team
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Keeps running jobs referenced until they finish
+_running: Set[asyncio.Task] = set()
+
+
+def team_totals_pipeline(team_ids: List[ObjectId], now: datetime) -> List[Dict[str, Any]]:
+    """Sum the current points and price of each team's players into the team document."""
+    return [
+        {"$match": {"_id": {"$in": team_ids}}},
+        # Teams store player ids as strings; convert them so the lookup can use the _id index
+        {
+            "$addFields": {
+                "player_oids": {
+                    "$map": {
+                        "input": {"$ifNull": ["$player_ids", []]},
+                        "in": {"$convert": {"input": "$$this", "to": "objectId", "onError": None, "onNull": None}},
+                    }
+                }
+            }
+        },
+        {
+            "$lookup": {
+                "from": Player.get_motor_collection().name,
+                "localField": "player_oids",
+                "foreignField": "_id",
+                "as": "players",
+            }
+        },
+        {
+            "$project": {
+                "_id": 1,
+                "total_points": {"$toDouble": {"$sum": "$players.points"}},
+                "total_value": {"$toDouble": {"$sum": "$players.price"}},
+                "updated_at": now,
+            }
+        },
+        {
+            "$merge": {
+                "into": Team.get_motor_collection().name,
+                "on": "_id",
+                "whenMatched": "merge",
+                "whenNotMatched": "discard",
+            }
+        },
+    ]
+
+
+def _team_filter(player_ids: Optional[List[str]]) -> Dict[str, Any]:
+    return {} if player_ids is None else {"player_ids": {"$in": player_ids}}
+
+
+async def recompute_team_totals(job: TeamRecomputeJob, batch_size: Optional[int] = None) -> TeamRecomputeJob:
+    """Run ``job`` to completion, saving its progress after each batch."""
+    batch_size = batch_size or settings.team_recompute_batch_size
+    teams = Team.get_motor_collection()
+    query = _team_filter(job.player_ids)
+
+    job.status = JobStatus.RUNNING
+    job.started_at = datetime.utcnow()
+    job.total_teams = await teams.count_documents(query)
+    await job.save()
+
+    try:
+        last_id: Optional[ObjectId] = None
+        while True:
+            # Page through team ids in _id order so the "every team" job never holds them all
+            page_query = query if last_id is None else {**query, "_id": {"$gt": last_id}}
+            cursor = teams.find(page_query, {"_id": 1}).sort("_id", 1).limit(batch_size)
+            batch = [doc["_id"] async for doc in cursor]
+            if not batch:
+                break
+            await teams.aggregate(team_totals_pipeline(batch, datetime.utcnow())).to_list(length=None)
+            last_id = batch[-1]
+            job.processed_teams += len(batch)
+            job.batches += 1
+            await job.save()
+    except Exception as exc:
+        logger.exception("Team totals recompute %s failed", job.id)
+        job.status = JobStatus.FAILED
+        job.error = str(exc)
+    else:
+        job.status = JobStatus.COMPLETED
+    job.completed_at = datetime.utcnow()
+    await job.save()
+    return job
+
+
+async def start_team_recompute(
+    reason: str,
+    player_ids: Optional[Iterable[str]] = None,
+    requested_by: Optional[str] = None,
+) -> TeamRecomputeJob:
+    """Record a job for the teams picking ``player_ids`` (every team when None) and run it in the background."""
+    job = TeamRecomputeJob(
+        reason=reason,
+        player_ids=None if player_ids is None else sorted({str(pid) for pid in player_ids}),
+        requested_by=requested_by,
+    )
+    await job.insert()
+    task = asyncio.get_running_loop().create_task(recompute_team_totals(job))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return job
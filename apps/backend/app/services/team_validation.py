@@ -0,0 +1,142 @@
+"""Validation of team submissions against players, slots and contest rules.
+
+Creating or editing a team needs the selected players, the slots they belong
+to (plus every slot with a minimum), and the contest for daily restrictions
+(from the contest cache). ``load_team_rules`` fetches all of that once, for
+one team or a whole batch. The checks below then run in memory. A failed
+check raises TeamValidationError with the HTTP status and detail the team
+routes return.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+
+from app.models.admin.slot import Slot
+from app.models.player import Player
+from app.services.contest_cache import ContestSnapshot, contest_cache
+
+
+class TeamValidationError(Exception):
+    def __init__(self, detail: Any, status_code: int = 400):
+        self.detail = detail
+        self.status_code = status_code
+        super().__init__(detail)
+
+
+@dataclass
+class TeamRules:
+    """Everything needed to validate a set of team submissions."""
+
+    players_by_id: Dict[str, Player] = field(default_factory=dict)
+    slots_by_id: Dict[str, Slot] = field(default_factory=dict)
+    contests_by_id: Dict[str, ContestSnapshot] = field(default_factory=dict)
+
+    def players_for(self, player_ids: Iterable[str]) -> List[Player]:
+        """The known players among ``player_ids``, each once."""
+        return [self.players_by_id[pid] for pid in dict.fromkeys(player_ids) if pid in self.players_by_id]
+
+    def contest(self, contest_id: Optional[str]) -> Optional[ContestSnapshot]:
+        return self.contests_by_id.get(str(contest_id)) if contest_id else None
+
+    def slot_violations(self, players: List[Player]) -> List[Dict[str, Any]]:
+        """Per-slot min/max breaches for the slots of ``players`` and every slot with a minimum."""
+        slot_counts: Dict[str, int] = {}
+        for p in players:
+            if p.slot:
+                slot_counts[p.slot] = slot_counts.get(p.slot, 0) + 1
+
+        violations = []
+        for sid, slot in self.slots_by_id.items():
+            if sid not in slot_counts and slot.min_select <= 0:
+                continue
+            count = slot_counts.get(sid, 0)
+            if count < slot.min_select or count > slot.max_select:
+                violations.append(
+                    {
+                        "slot": {"id": sid, "code": slot.code, "name": slot.name},
+                        "expected": {"min_select": slot.min_select, "max_select": slot.max_select},
+                        "actual": count,
+                    }
+                )
+        return violations
+
+
+async def load_team_rules(player_ids: Iterable[str], contest_ids: Iterable[str] = ()) -> TeamRules:
+    """Fetch the players and slots a set of submissions refers to (one query each) and their contests."""
+    player_oids = [PydanticObjectId(pid) for pid in {str(p) for p in player_ids} if ObjectId.is_valid(pid)]
+    players = await Player.find({"_id": {"$in": player_oids}}).to_list() if player_oids else []
+
+    slot_oids = [PydanticObjectId(p.slot) for p in players if p.slot and ObjectId.is_valid(p.slot)]
+    slot_query: Dict[str, Any] = {"min_select": {"$gt": 0}}
+    if slot_oids:
+        slot_query = {"$or": [{"_id": {"$in": list(set(slot_oids))}}, slot_query]}
+    slots = await Slot.find(slot_query).to_list()
+
+    return TeamRules(
+        players_by_id={str(p.id): p for p in players},
+        slots_by_id={str(s.id): s for s in slots},
+        contests_by_id=await contest_cache.get_many(contest_ids),
+    )
+
+
+def check_captaincy(player_ids: List[str], captain_id: Optional[str], vice_captain_id: Optional[str]) -> None:
+    """Captain and vice-captain, when set, must be two different selected players."""
+    if captain_id is not None and captain_id not in player_ids:
+        raise TeamValidationError("Captain must be one of the selected players")
+    if vice_captain_id is not None and vice_captain_id not in player_ids:
+        raise TeamValidationError("Vice-captain must be one of the selected players")
+    if captain_id is not None and captain_id == vice_captain_id:
+        raise TeamValidationError("Captain and vice-captain must be different players")
+
+
+def check_player_ids(player_ids: Iterable[str]) -> None:
+    for pid in player_ids:
+        if not ObjectId.is_valid(pid):
+            raise TeamValidationError(f"Invalid player ID: {pid}")
+
+
+def check_slots(rules: TeamRules, players: List[Player]) -> None:
+    violations = rules.slot_violations(players)
+    if violations:
+        raise TeamValidationError({
+            "message": "Team violates per-slot selection constraints",
+            "violations": violations,
+        })
+
+
+def check_daily_contest(contest: Optional[ContestSnapshot], players: List[Player]) -> None:
+    """Daily contests may restrict which real-world teams players come from."""
+    if contest and contest.restricts_teams:
+        disallowed = [p.name for p in players if p.team and p.team not in contest.allowed_teams]
+        if disallowed:
+            raise TeamValidationError({
+                "message": "Selected players include teams disallowed for this daily contest",
+                "disallowed_players": disallowed,
+                "allowed_teams": list(contest.allowed_teams_ordered),
+            })
+
+
+def validate_new_team(
+    rules: TeamRules,
+    player_ids: List[str],
+    captain_id: str,
+    vice_captain_id: str,
+    contest_id: Optional[str] = None,
+) -> List[Player]:
+    """Run every create-time check and return the selected players."""
+    check_captaincy(player_ids, captain_id, vice_captain_id)
+    check_player_ids(player_ids)
+    players = rules.players_for(player_ids)
+    if len(players) != len(player_ids):
+        raise TeamValidationError("Some player IDs are invalid")
+    check_slots(rules, players)
+    if contest_id:
+        contest = rules.contest(contest_id)
+        if not contest:
+            raise TeamValidationError("Invalid contest_id")
+        check_daily_contest(contest, players)
+    return players
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional, Tuple
 from fastapi import UploadFile, HTTPException, status
 from bson import ObjectId
@@ -154,8 +155,8 @@ async def open_sponsor_logo_stream(file_id: str):
     return stream, (content_type or "application/octet-stream")
 
 
-async def upload_carousel_image_to_gridfs(file: UploadFile, filename_prefix: str) -> str:
-    """Upload carousel image to GridFS (bucket 'carousel_images') and return file id"""
+async def upload_carousel_image_to_gridfs(file: UploadFile, filename_prefix: str) -> Tuple[str, str]:
+    """Upload carousel image to GridFS (bucket 'carousel_images') and return file id and SHA-256 of the content"""
     _validate_image_file(file)
 
     file.file.seek(0, 2)
@@ -171,9 +172,10 @@ async def upload_carousel_image_to_gridfs(file: UploadFile, filename_prefix: str
     bucket = AsyncIOMotorGridFSBucket(db, bucket_name="carousel_images")
     data = file.file.read()
     filename = f"{filename_prefix}"
-    metadata = {"content_type": file.content_type}
+    content_hash = hashlib.sha256(data).hexdigest()
+    metadata = {"content_type": file.content_type, "sha256": content_hash}
     file_id = await bucket.upload_from_stream(filename, data, metadata=metadata)
-    return str(file_id)
+    return str(file_id), content_hash
 
 
 async def open_carousel_image_stream(file_id: str):
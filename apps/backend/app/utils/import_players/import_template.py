@@ -1,7 +1,7 @@
 """Template generation utilities for player import"""
 import io
 import csv
-from typing import BinaryIO, Optional
+from typing import Optional
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.worksheet.datavalidation import DataValidation
@@ -37,15 +37,15 @@ TEMPLATE_HEADERS = [
 ]
 
 
-async def generate_xlsx_template(slot_codes: Optional[list[str]] = None) -> BinaryIO:
+def build_xlsx_template(slot_codes: Optional[list[str]] = None) -> bytes:
     """
-    Generate XLSX template with data validations
+    Build the XLSX template bytes (blocking; CPU-bound openpyxl work)
     
     Args:
         slot_codes: Optional list of slot codes for dropdown
         
     Returns:
-        Binary file-like object with XLSX content
+        XLSX file content
     """
     wb = Workbook()
     ws = wb.active
@@ -155,11 +155,10 @@ async def generate_xlsx_template(slot_codes: Optional[list[str]] = None) -> Bina
         if bold:
             cell.font = Font(bold=True, size=12)
     
-    # Save to BytesIO
+    # Save to bytes
     output = io.BytesIO()
     wb.save(output)
-    output.seek(0)
-    return output
+    return output.getvalue()
 
 
 def generate_csv_template() -> str:
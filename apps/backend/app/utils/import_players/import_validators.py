@@ -1,5 +1,6 @@
 """Validation and normalization utilities for player imports"""
 from typing import Optional, Dict, Any, Tuple
+from app.common.invalidation import INSERT, SLOTS, publish_local
 from app.models.admin.player import Player
 from app.models.admin.slot import Slot
 
@@ -115,6 +116,7 @@ async def resolve_slot(
                 updated_at=datetime.utcnow(),
             )
             await slot_doc.insert()
+            publish_local(SLOTS, slot_doc.id, INSERT)
     
     # Try slot_name
     if not slot_doc and slot_name:
@@ -133,6 +135,7 @@ async def resolve_slot(
                 updated_at=datetime.utcnow(),
             )
             await slot_doc.insert()
+            publish_local(SLOTS, slot_doc.id, INSERT)
     
     return str(slot_doc.id) if slot_doc else None
 
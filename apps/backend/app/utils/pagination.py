@@ -0,0 +1,27 @@
+"""Sort-key helpers for paginated queries (see app.services.queries.find_page)."""
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from pymongo import ASCENDING, DESCENDING
+
+SortKey = Union[str, Tuple[str, int]]
+
+
+def build_sort_stage(sort: Optional[Sequence[SortKey]]) -> Dict[str, int]:
+    """Convert Beanie-style sort keys into a ``$sort`` specification.
+
+    Accepts strings such as ``"-created_at"`` / ``"+name"`` / ``"name"`` and
+    ``(field, direction)`` tuples (which is also what ``-Model.field`` yields).
+    """
+    spec: Dict[str, int] = {}
+    for key in sort or []:
+        if isinstance(key, str):
+            if key.startswith("-"):
+                spec[key[1:]] = DESCENDING
+            elif key.startswith("+"):
+                spec[key[1:]] = ASCENDING
+            else:
+                spec[key] = ASCENDING
+        else:
+            field, direction = key
+            spec[str(field)] = int(direction)
+    return spec
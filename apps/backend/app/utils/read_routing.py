@@ -0,0 +1,101 @@
+"""Read-preference routing for heavy, read-only query paths.
+
+Leaderboards and hot-player listings scan large collections and tolerate a
+little staleness, so they can be served from secondaries. Handlers opt in by
+reading through ``heavy_read_collection(Model)``; everything else (and every
+write) keeps using the primary via ``Model.get_motor_collection()``.
+
+MONGODB_HEAVY_READ_PREFERENCE applies to every such read. MONGODB_READ_PREFERENCES
+overrides it per collection, e.g. to keep ``players`` (whose points change
+live during a match) on the primary while ``teams`` and ``users`` go to
+secondaries.
+
+Reads whose result is kept rather than served once (a Redis leaderboard
+rebuild or incremental update, a frozen contest snapshot) run inside
+``primary_reads()``. A lagging secondary could otherwise leave out a team
+enrolled moments earlier until the kept copy expires.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterable, Optional, Type
+
+from beanie import Document
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+    _ServerMode,
+)
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+# Set by primary_reads(); tasks started inside the block inherit it
+_primary_only: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+_MODES = {
+    "primary": Primary,
+    "primarypreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondarypreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def parse_read_preference(mode: str, max_staleness_seconds: Optional[int] = None) -> _ServerMode:
+    """Build a read preference from a mode name such as "secondaryPreferred"."""
+    cls = _MODES.get(mode.replace("_", "").lower())
+    if cls is None:
+        raise ValueError(f"Unknown read preference '{mode}'. Use one of: primary, primaryPreferred, secondary, secondaryPreferred, nearest")
+    if cls is Primary:
+        return Primary()
+    return cls(max_staleness=max_staleness_seconds if max_staleness_seconds is not None else -1)
+
+
+@lru_cache()
+def heavy_read_preference(collection: Optional[str] = None) -> _ServerMode:
+    """Read preference for heavy reads of ``collection``.
+
+    Its MONGODB_READ_PREFERENCES entry if it has one, else MONGODB_HEAVY_READ_PREFERENCE.
+    """
+    mode = settings.mongodb_heavy_read_preference
+    if collection is not None:
+        mode = settings.mongodb_read_preferences_map.get(collection, mode)
+    return parse_read_preference(mode, settings.mongodb_max_staleness_seconds)
+
+
+def validate_read_preferences(collections: Iterable[str]) -> None:
+    """Raise ValueError for an unknown mode or a MONGODB_READ_PREFERENCES entry naming no known collection."""
+    known = set(collections)
+    unknown = sorted(set(settings.mongodb_read_preferences_map) - known)
+    if unknown:
+        raise ValueError(f"MONGODB_READ_PREFERENCES names unknown collections: {', '.join(unknown)}")
+    heavy_read_preference()
+    for collection in settings.mongodb_read_preferences_map:
+        heavy_read_preference(collection)
+
+
+@contextmanager
+def primary_reads():
+    """Send heavy reads made inside the block to the primary."""
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def heavy_read_collection(model: Type[Document]) -> AsyncIOMotorCollection:
+    """The model's collection routed with its heavy-read preference (the primary inside ``primary_reads()``)."""
+    collection = model.get_motor_collection()
+    if _primary_only.get():
+        return collection
+    preference = heavy_read_preference(collection.name)
+    if isinstance(preference, Primary):
+        return collection
+    return collection.with_options(read_preference=preference)
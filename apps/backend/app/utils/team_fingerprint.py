@@ -0,0 +1,15 @@
+"""Canonical fingerprints of team compositions.
+
+Two teams with the same players (in any order), the same captain and the same
+vice-captain get the same fingerprint. It is stored on ``Team.fingerprint``
+so identical teams can be found with one index lookup and scored only once.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+
+def team_fingerprint(player_ids: Iterable[str], captain_id: Optional[str], vice_captain_id: Optional[str]) -> str:
+    """Order-independent hex digest of a team's composition."""
+    players = ",".join(sorted(str(pid).strip() for pid in player_ids))
+    canonical = f"{players}|c:{captain_id or ''}|vc:{vice_captain_id or ''}"
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
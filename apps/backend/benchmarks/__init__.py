@@ -0,0 +1 @@
+"""Benchmarks for the backend API (run from apps/backend, e.g. `python -m benchmarks.bench_read_models`)."""
@@ -0,0 +1,91 @@
+"""Measure worker cold start: stock ``init_beanie`` vs the fast boot initializer.
+
+Each trial opens a fresh client (as a new worker would), then initialises all
+document models either with index sync (MONGODB_INDEX_SYNC=startup) or with
+``FastBootInitializer`` (background/off). Indexes are created once up front, so
+the stock path measures the steady-state cost of re-checking them on every boot.
+
+Reports wall time per boot and, against a real mongod, the number of commands
+sent before the worker is ready. The in-process mongomock fallback has no
+network round trips, so only a real server gives representative timings.
+
+Usage (from apps/backend):
+    python -m benchmarks.bench_cold_start --mongodb-url mongodb://localhost:27017 --trials 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List, Optional, Tuple
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.harness import CommandCounter
+from config.database import DOCUMENT_MODELS
+from config.indexes import FastBootInitializer
+
+
+def client_factory(mongodb_url: Optional[str]) -> Callable[[CommandCounter], object]:
+    if mongodb_url:
+        return lambda counter: AsyncIOMotorClient(mongodb_url, event_listeners=[counter])
+    from mongomock_motor import AsyncMongoMockClient
+
+    shared = AsyncMongoMockClient()  # mongomock keeps data per client object
+    return lambda counter: shared
+
+
+async def stock_boot(database) -> None:
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+
+
+async def fast_boot(database) -> None:
+    await FastBootInitializer(database=database, document_models=DOCUMENT_MODELS)
+
+
+async def measure(make_client, db_name: str, boot, trials: int) -> Tuple[List[float], List[int]]:
+    timings, commands = [], []
+    for _ in range(trials):
+        counter = CommandCounter()
+        client = make_client(counter)
+        # Connection setup is the same for both modes; keep it out of the comparison
+        await client.admin.command("ping")
+        before = counter.count
+        started = time.perf_counter()
+        await boot(client[db_name])
+        timings.append((time.perf_counter() - started) * 1000)
+        commands.append(counter.count - before)
+    return timings, commands
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    make_client = client_factory(args.mongodb_url)
+    backend = "mongod" if args.mongodb_url else "mongomock"
+
+    # Ensure indexes exist so the stock path does its usual no-op sync
+    await stock_boot(make_client(CommandCounter())[args.db_name])
+
+    print(f"{len(DOCUMENT_MODELS)} document models, {args.trials} trials on {backend}\n")
+    print(f"{'mode':<22}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}{'commands':>10}")
+    results = {}
+    for label, boot in (("startup (index sync)", stock_boot), ("fast boot", fast_boot)):
+        timings, commands = await measure(make_client, args.db_name, boot, args.trials)
+        results[label] = statistics.mean(timings)
+        cmd = f"{statistics.mean(commands):.0f}" if args.mongodb_url else "-"
+        print(f"{label:<22}{statistics.mean(timings):>10.1f}{statistics.median(timings):>10.1f}{max(timings):>10.1f}{cmd:>10}")
+
+    stock, fast = results["startup (index sync)"], results["fast boot"]
+    if stock:
+        print(f"\nfast boot saves {stock - fast:.1f} ms per worker ({(stock - fast) / stock * 100:.0f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default=None)
+    parser.add_argument("--db-name", default="walle_bench_boot")
+    parser.add_argument("--trials", type=int, default=10)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
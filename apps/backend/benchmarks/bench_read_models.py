@@ -0,0 +1,194 @@
+"""Compare full Beanie documents with projected read models on the leaderboard path.
+
+Builds synthetic raw BSON rows for N teams (default 50k), their owners and the
+player catalogue, then measures for both approaches:
+
+- bytes on the wire (BSON size of what the server would send back)
+- decode time (validating rows into models)
+- peak Python memory held by the decoded rows
+
+Beanie needs initialised collections to build documents, so models are bound to
+an in-process mongomock database when ``mongomock_motor`` is installed, or to
+``MONGODB_URL`` otherwise. No data is written either way.
+
+Usage:
+    python -m benchmarks.bench_read_models --teams 50000
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import bson
+from beanie import init_beanie
+from beanie.odm.utils.parsing import parse_obj
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.models.team import Team
+from app.models.user import User
+from app.models.player import Player
+from config.settings import settings
+from app.services.read_models import (
+    PLAYER_CARD_PROJECTION,
+    TEAM_CARD_PROJECTION,
+    USER_CARD_PROJECTION,
+    PlayerCard,
+    TeamCard,
+    UserCard,
+)
+
+
+async def init_models() -> None:
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+
+        client = AsyncMongoMockClient()
+    except ImportError:
+        client = AsyncIOMotorClient(settings.mongodb_url)
+    await init_beanie(database=client["bench_read_models"], document_models=[Team, User, Player])
+
+
+def full_document(model):
+    """Decode a raw row the way Beanie's find() does."""
+    return lambda doc: parse_obj(model, doc)
+
+
+def make_players(count: int) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Player {i}",
+            "team": f"Team {i % 10}",
+            "price": float(random.randint(5, 12)),
+            "slot": str(ObjectId()),
+            "points": float(random.randint(0, 500)),
+            "is_available": True,
+            "stats": {"matches": random.randint(0, 50), "runs": random.randint(0, 2000), "wickets": random.randint(0, 80), "strike_rate": 131.4, "economy": 7.2},
+            "form": "good",
+            "image_url": f"https://cdn.example.com/players/{i}.jpg",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def make_users(count: int) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "hashed_password": "$2b$12$" + "x" * 53,
+            "full_name": f"User {i}",
+            "mobile": "9876543210",
+            "is_active": True,
+            "is_verified": True,
+            "is_admin": False,
+            "created_at": now,
+            "updated_at": now,
+            "last_login": now,
+            "avatar_url": f"/api/users/{i}/avatar",
+            "avatar_file_id": str(ObjectId()),
+        }
+        for i in range(count)
+    ]
+
+
+def make_teams(count: int, users: List[Dict[str, Any]], players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    player_ids = [str(p["_id"]) for p in players]
+    teams = []
+    for i in range(count):
+        picks = random.sample(player_ids, 11)
+        teams.append({
+            "_id": ObjectId(),
+            "user_id": users[i % len(users)]["_id"],
+            "team_name": f"Team {i}",
+            "player_ids": picks,
+            "captain_id": picks[0],
+            "vice_captain_id": picks[1],
+            "total_points": 0.0,
+            "total_value": 99.5,
+            "rank": None,
+            "rank_change": None,
+            "contest_id": None,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return teams
+
+
+def project(docs: List[Dict[str, Any]], projection: Dict[str, int]) -> List[Dict[str, Any]]:
+    keys = set(projection) | {"_id"}
+    return [{k: v for k, v in doc.items() if k in keys} for doc in docs]
+
+
+def wire_bytes(docs: List[Dict[str, Any]]) -> int:
+    return sum(len(bson.encode(doc)) for doc in docs)
+
+
+def measure(label: str, docs: List[Dict[str, Any]], decode: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+    # Round-trip through BSON so values look exactly like what Motor hands back
+    raw = [bson.decode(bson.encode(doc)) for doc in docs]
+    tracemalloc.start()
+    started = time.perf_counter()
+    decoded = [decode(doc) for doc in raw]
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+    return {"label": label, "rows": len(raw), "bytes": wire_bytes(docs), "ms": elapsed * 1000, "peak_mb": peak / 1024 / 1024}
+
+
+def report(full: Dict[str, Any], lean: Dict[str, Any]) -> None:
+    for row in (full, lean):
+        print(
+            f"  {row['label']:<22} rows={row['rows']:>7}  wire={row['bytes'] / 1024 / 1024:8.2f}MB"
+            f"  decode={row['ms']:9.1f}ms  peak={row['peak_mb']:8.2f}MB"
+        )
+    print(
+        f"  {'reduction':<22} wire={1 - lean['bytes'] / full['bytes']:8.1%}"
+        f"     decode={1 - lean['ms'] / full['ms']:8.1%}     peak={1 - lean['peak_mb'] / full['peak_mb']:8.1%}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=None, help="defaults to teams / 2")
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(init_models())
+    random.seed(args.seed)
+    players = make_players(args.players)
+    users = make_users(args.users or max(1, args.teams // 2))
+    teams = make_teams(args.teams, users, players)
+
+    print(f"Teams ({len(teams)})")
+    report(
+        measure("Team documents", teams, full_document(Team)),
+        measure("TeamCard projection", project(teams, TEAM_CARD_PROJECTION), TeamCard.from_doc),
+    )
+    print(f"Users ({len(users)})")
+    report(
+        measure("User documents", users, full_document(User)),
+        measure("UserCard projection", project(users, USER_CARD_PROJECTION), UserCard.from_doc),
+    )
+    print(f"Players ({len(players)})")
+    report(
+        measure("Player documents", players, full_document(Player)),
+        measure("PlayerCard projection", project(players, PLAYER_CARD_PROJECTION), PlayerCard.from_doc),
+    )
+
+
+if __name__ == "__main__":
+    main()
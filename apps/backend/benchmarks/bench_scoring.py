@@ -0,0 +1,103 @@
+"""Compare per-team Python scoring with the sparse-matrix engine.
+
+Builds N synthetic teams (default 1M) of 11 players drawn from a catalogue of
+P players, with random per-player contest points. With --compositions C the
+teams are copies of C distinct compositions (as when many users pick the same
+XI), which the matrix scores once each. Then measures:
+
+- loop: contest_team_points per team, then a full sort (the previous path)
+- matrix build: encoding the teams as a CSR ScoringMatrix (once per ranking)
+- matrix score: points vector + sparse mat-vec for every team total
+- matrix rank / top-k: full ranking, and the first K places via argpartition
+
+Both paths are checked to produce the same totals and ordering.
+
+Usage:
+    python -m benchmarks.bench_scoring --teams 1000000 --top 100
+    python -m benchmarks.bench_scoring --teams 1000000 --compositions 50000
+"""
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple, TypeVar
+
+from bson import ObjectId
+
+from app.services.read_models import TeamCard
+from app.services.scoring import ScoringMatrix
+from app.services.standings import CAPTAIN_MULTIPLIER, VICE_CAPTAIN_MULTIPLIER, contest_team_points
+from app.utils.team_fingerprint import team_fingerprint
+
+T = TypeVar("T")
+
+
+def timed(fn: Callable[[], T]) -> Tuple[T, float]:
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def make_teams(count: int, players: List[str], compositions: int = 0, squad: int = 11) -> List[TeamCard]:
+    pool = [random.sample(players, squad) for _ in range(compositions)]
+    fingerprints = [team_fingerprint(picks, picks[0], picks[1]) for picks in pool]
+    teams = []
+    for i in range(count):
+        if pool:
+            which = random.randrange(len(pool))
+            picks, fingerprint = pool[which], fingerprints[which]
+        else:
+            picks = random.sample(players, squad)
+            fingerprint = team_fingerprint(picks, picks[0], picks[1])
+        teams.append(
+            TeamCard(
+                id=str(ObjectId()),
+                user_id=str(ObjectId()),
+                team_name=f"Team {i}",
+                player_ids=tuple(picks),
+                captain_id=picks[0],
+                vice_captain_id=picks[1],
+                fingerprint=fingerprint,
+            )
+        )
+    return teams
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=1_000_000)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--top", type=int, default=100)
+    parser.add_argument("--compositions", type=int, default=0, help="distinct compositions (0: every team random)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    players = [str(ObjectId()) for _ in range(args.players)]
+    points = {pid: float(random.randint(0, 120)) for pid in players}
+    teams = make_teams(args.teams, players, args.compositions)
+
+    def loop():
+        scored = [(contest_team_points(team, points), team.id, i) for i, team in enumerate(teams)]
+        scored.sort(reverse=True)
+        return scored
+
+    scored, loop_ms = timed(loop)
+    matrix, build_ms = timed(lambda: ScoringMatrix.from_teams(teams, CAPTAIN_MULTIPLIER, VICE_CAPTAIN_MULTIPLIER))
+    totals, score_ms = timed(lambda: matrix.totals(matrix.points_vector(points)))
+    order, rank_ms = timed(lambda: matrix.rank(totals))
+    top, top_ms = timed(lambda: matrix.top_k(totals, args.top))
+
+    expected = [i for _, _, i in scored]
+    assert order.tolist() == expected, "matrix ranking differs from the loop"
+    assert top.tolist() == expected[: args.top], "top-k differs from the loop"
+
+    print(f"teams={args.teams} compositions={matrix.shape[0]} players={args.players} nnz={len(matrix.data)}")
+    print(f"{'loop (score + sort)':<24} {loop_ms:>10.1f} ms")
+    print(f"{'matrix build':<24} {build_ms:>10.1f} ms")
+    print(f"{'matrix score':<24} {score_ms:>10.1f} ms")
+    print(f"{'matrix rank':<24} {rank_ms:>10.1f} ms")
+    print(f"{'matrix top-' + str(args.top):<24} {top_ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Compare the validated response path with the raw JSON fast path.
+
+For a list of N rows (default 1000) of each endpoint shape, measures the time
+from the raw BSON rows Motor hands back to the response body bytes:
+
+- validated: Beanie documents -> per-row response models -> FastAPI response
+  validation and serialization -> JSONResponse (the path before
+  app.common.responses)
+- raw: projected rows -> response-shaped dicts -> RawJSONResponse
+
+Shapes: /api/players (PlayerOut with stats) and a leaderboard page
+(LeaderboardEntrySchema). The two bodies are checked to decode to the same
+JSON before anything is timed.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import bson
+from beanie.odm.utils.parsing import parse_obj
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.common.responses import RawJSONResponse
+from app.models.player import Player
+from app.routes.contests import _leaderboard_entry
+from app.routes.players import serialize_player
+from app.schemas.leaderboard import LeaderboardEntrySchema, LeaderboardResponseSchema
+from app.schemas.player import PlayerOut
+from app.services.read_models import PLAYER_OUT_PROJECTION, TeamCard, UserCard, player_out_row
+from app.services.standings import RankedStanding, Standing
+from benchmarks.bench_read_models import init_models, make_players, project
+
+PLAYERS_FIELD = create_model_field("Response_list_players", List[PlayerOut], mode="serialization")
+LEADERBOARD_FIELD = create_model_field("Response_leaderboard", LeaderboardResponseSchema, mode="serialization")
+
+
+async def validated_body(field, content: Any) -> bytes:
+    """What FastAPI does with a route's return value when it is not a Response."""
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def players_validated(docs: List[Dict[str, Any]]) -> bytes:
+    players = [parse_obj(Player, doc) for doc in docs]
+    return await validated_body(PLAYERS_FIELD, [serialize_player(p) for p in players])
+
+
+async def players_raw(docs: List[Dict[str, Any]]) -> bytes:
+    return RawJSONResponse([player_out_row(doc) for doc in docs]).body
+
+
+def make_standings(count: int) -> List[RankedStanding]:
+    standings = []
+    for i in range(count):
+        user = UserCard(id=str(ObjectId()), username=f"user{i}", full_name=f"User {i}", avatar_url=f"/api/users/{i}/avatar")
+        team = TeamCard(id=str(ObjectId()), user_id=user.id, team_name=f"Team {i}", player_ids=(), rank_change=random.randint(-5, 5))
+        standings.append(RankedStanding(i + 1, Standing(team, user, float(random.randint(0, 5000)))))
+    return standings
+
+
+async def leaderboard_validated(standings: List[RankedStanding]) -> bytes:
+    entries = [
+        LeaderboardEntrySchema(
+            rank=r.rank,
+            username=r.standing.user.username,
+            displayName=r.standing.user.display_name,
+            teamName=r.standing.team.team_name,
+            points=r.standing.points,
+            rankChange=r.standing.team.rank_change,
+            avatarUrl=r.standing.user.avatar_url,
+            teamId=r.standing.team.id,
+        )
+        for r in standings
+    ]
+    return await validated_body(LEADERBOARD_FIELD, LeaderboardResponseSchema(entries=entries, currentUserEntry=entries[0]))
+
+
+async def leaderboard_raw(standings: List[RankedStanding]) -> bytes:
+    entries = [_leaderboard_entry(r) for r in standings]
+    return RawJSONResponse({"entries": entries, "currentUserEntry": entries[0]}).body
+
+
+async def timed(fn: Callable[[Any], Awaitable[bytes]], rows: Any, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await fn(rows)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"p50": statistics.median(samples), "min": min(samples), "bytes": len(body)}
+
+
+async def compare(label: str, validated, raw, validated_rows: Any, raw_rows: Any, repeat: int) -> None:
+    if json.loads(await validated(validated_rows)) != json.loads(await raw(raw_rows)):
+        raise SystemExit(f"{label}: raw body differs from the validated one")
+    slow = await timed(validated, validated_rows, repeat)
+    fast = await timed(raw, raw_rows, repeat)
+    print(label)
+    for name, row in (("validated", slow), ("raw", fast)):
+        print(f"  {name:<10} p50={row['p50']:8.2f}ms  min={row['min']:8.2f}ms  body={row['bytes'] / 1024:8.1f}KB")
+    print(f"  {'speedup':<10} p50={slow['p50'] / fast['p50']:7.1f}x")
+
+
+async def run(args) -> None:
+    await init_models()
+    random.seed(args.seed)
+    players = [bson.decode(bson.encode(doc)) for doc in make_players(args.rows)]
+    await compare(
+        f"/api/players ({args.rows} rows)",
+        players_validated,
+        players_raw,
+        players,
+        project(players, PLAYER_OUT_PROJECTION),
+        args.repeat,
+    )
+    standings = make_standings(args.rows)
+    await compare(f"leaderboard ({args.rows} rows)", leaderboard_validated, leaderboard_raw, standings, standings, args.repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
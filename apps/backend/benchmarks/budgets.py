@@ -0,0 +1,86 @@
+"""Check declared route query budgets (@query_budget) against a seeded database.
+
+Drives every budgeted route through the app with ``record_queries()`` and
+reports commands issued vs budget, with call sites for any route over budget.
+Needs a real mongod because the in-process stand-in emits no command events.
+Run it at two scales to confirm budgets hold regardless of N.
+
+Usage (from apps/backend):
+    python -m benchmarks.budgets --mongodb-url mongodb://localhost:27017 --scale 1k
+"""
+import argparse
+import asyncio
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.datagen import SCALES, generate
+from benchmarks.harness import asgi_client, auth_headers, open_database
+from app.common.metrics.query_budget import BUDGET_ATTRIBUTE, record_queries
+
+
+def budgeted_routes(app) -> Dict[Tuple[str, str], int]:
+    """(method, path template) -> budget for every route declaring one."""
+    budgets = {}
+    for route in app.routes:
+        budget = getattr(getattr(route, "endpoint", None), BUDGET_ATTRIBUTE, None)
+        if budget is not None:
+            for method in route.methods:
+                budgets[(method, route.path)] = budget
+    return budgets
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    from main import app
+
+    backend, _ = await open_database(args.mongodb_url, args.db_name)
+    if backend != "mongod":
+        raise SystemExit("Query budgets need --mongodb-url (mongomock emits no command events)")
+    teams = SCALES[args.scale] if args.scale in SCALES else int(args.scale)
+    dataset = await generate(teams)
+
+    user = auth_headers(dataset.usernames[0])
+    admin = auth_headers(dataset.admin_username)
+    # (method, path template, concrete url, headers)
+    calls: List[Tuple[str, str, str, Optional[Dict[str, str]]]] = [
+        ("GET", "/api/contests/{contest_id}/leaderboard", f"/api/contests/{dataset.contest_id}/leaderboard", user),
+        ("GET", "/api/leaderboard", "/api/leaderboard", user),
+        ("GET", "/api/players/hot", "/api/players/hot?limit=200", None),
+        ("GET", "/api/players/hot/ids", "/api/players/hot/ids?limit=200", None),
+        ("GET", "/api/slots", "/api/slots", None),
+        ("GET", "/api/admin/users-with-teams", "/api/admin/users-with-teams?page_size=100", admin),
+    ]
+
+    budgets = budgeted_routes(app)
+    unchecked = set(budgets) - {(m, p) for m, p, _, _ in calls}
+    failures = 0
+    async with asgi_client(app) as client:
+        print(f"{'route':<48}{'queries':>9}{'budget':>8}")
+        for method, template, url, headers in calls:
+            budget = budgets.get((method, template))
+            with record_queries() as log:
+                response = await client.request(method, url, headers=headers)
+            status = "ok"
+            if response.status_code >= 400:
+                status = f"HTTP {response.status_code}"
+                failures += 1
+            elif budget is not None and log.count > budget:
+                status = "OVER BUDGET"
+                failures += 1
+            print(f"{method + ' ' + template:<48}{log.count:>9}{str(budget):>8}  {status}")
+            if status == "OVER BUDGET":
+                print(log.summary())
+    for method, template in sorted(unchecked):
+        print(f"warning: no budget check for {method} {template}")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", required=True)
+    parser.add_argument("--db-name", default="walle_bench_budgets")
+    parser.add_argument("--scale", default="1k")
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
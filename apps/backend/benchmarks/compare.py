@@ -0,0 +1,70 @@
+"""Diff two benchmark result files and flag regressions.
+
+Usage (from apps/backend):
+    python -m benchmarks.compare benchmarks/results/10k-mongod-abc123.json benchmarks/results/10k-mongod-def456.json
+    python -m benchmarks.compare old.json new.json --threshold 15
+
+Exits with status 1 when any endpoint's p95 latency, DB round trips or peak
+memory grew by more than the threshold (percent), so it can gate CI.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "db_ops_per_request", "peak_mem_mb")
+GATED_METRICS = ("p95_ms", "db_ops_per_request", "peak_mem_mb")
+
+
+def load(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def change(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if old is None or new is None:
+        return None
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - old) / old * 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed growth in percent")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    b_meta, c_meta = baseline["meta"], candidate["meta"]
+    print(f"baseline : {b_meta['commit']} ({b_meta['scale']}, {b_meta['backend']})")
+    print(f"candidate: {c_meta['commit']} ({c_meta['scale']}, {c_meta['backend']})")
+    if (b_meta["scale"], b_meta["backend"]) != (c_meta["scale"], c_meta["backend"]):
+        print("warning: runs used different scales or backends; numbers are not comparable")
+
+    regressions = []
+    for endpoint, new_row in candidate["endpoints"].items():
+        old_row = baseline["endpoints"].get(endpoint)
+        if old_row is None:
+            print(f"\n{endpoint}: new endpoint, no baseline")
+            continue
+        print(f"\n{endpoint}")
+        for metric in METRICS:
+            old, new = old_row.get(metric), new_row.get(metric)
+            delta = change(old, new)
+            flag = ""
+            if delta is not None and metric in GATED_METRICS and delta > args.threshold:
+                flag = "  << regression"
+                regressions.append(f"{endpoint}.{metric}")
+            delta_text = "n/a" if delta is None else f"{delta:+.1f}%"
+            print(f"  {metric:<20}{str(old):>12} -> {str(new):<12}{delta_text:>10}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
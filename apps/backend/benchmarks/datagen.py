@@ -0,0 +1,210 @@
+"""Synthetic data generator for the benchmark suite.
+
+Writes players, slots, users, teams, contests, enrollments and per-contest
+points straight through Motor ``insert_many`` (bypassing Beanie validation) so
+even the 500k-team preset loads in reasonable time. Generated teams satisfy the
+per-slot selection rules, so the same catalogue can drive ``create_team``.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+from app.models.user import User
+from app.models.team import Team
+from app.models.contest import Contest
+from app.models.admin.slot import Slot
+from app.models.player import Player
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.utils.security import get_password_hash
+from app.utils.team_fingerprint import team_fingerprint
+
+# Teams per preset; users are half the teams (most users own two teams)
+SCALES: Dict[str, int] = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "50k": 50_000,
+    "100k": 100_000,
+    "500k": 500_000,
+}
+
+BATCH_SIZE = 5_000
+TEAM_SIZE = 11
+# (code, name, min_select, max_select, picks per generated team)
+SLOT_LAYOUT = [
+    ("BAT", "Batters", 2, 4, 3),
+    ("BOWL", "Bowlers", 2, 4, 3),
+    ("AR", "All Rounders", 2, 4, 3),
+    ("WK", "Wicket Keepers", 1, 2, 2),
+]
+REAL_TEAMS = ["IND", "AUS", "ENG", "NZ", "SA", "PAK", "SL", "WI"]
+BENCH_PASSWORD = "bench-password"
+
+
+@dataclass
+class Dataset:
+    """Ids of the generated fixtures that scenarios need to address."""
+
+    scale: int
+    contest_id: str = ""
+    completed_contest_id: str = ""
+    slot_ids: List[str] = field(default_factory=list)
+    players_by_slot: Dict[str, List[str]] = field(default_factory=dict)
+    usernames: List[str] = field(default_factory=list)
+    admin_username: str = "bench_admin"
+
+
+def pick_team(dataset: Dataset, rng: random.Random) -> List[str]:
+    """Pick a valid XI (respecting the slot layout) from the generated catalogue."""
+    picks: List[str] = []
+    for (_, _, _, _, count), slot_id in zip(SLOT_LAYOUT, dataset.slot_ids):
+        picks.extend(rng.sample(dataset.players_by_slot[slot_id], count))
+    return picks
+
+
+async def _insert(model, docs: List[Dict[str, Any]]) -> None:
+    collection = model.get_motor_collection()
+    for i in range(0, len(docs), BATCH_SIZE):
+        await collection.insert_many(docs[i : i + BATCH_SIZE], ordered=False)
+
+
+async def generate(teams: int, players_per_slot: int = 60, seed: int = 7) -> Dataset:
+    """Populate the (already initialised) database with a synthetic fantasy league.
+
+    Args:
+        teams: Number of fantasy teams to create
+        players_per_slot: Catalogue size per slot
+        seed: RNG seed so runs are reproducible
+
+    Returns:
+        Dataset describing the generated ids
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    dataset = Dataset(scale=teams)
+
+    # Slots
+    slot_docs = []
+    for code, name, min_select, max_select, _ in SLOT_LAYOUT:
+        slot_docs.append({
+            "_id": ObjectId(),
+            "code": code,
+            "name": name,
+            "min_select": min_select,
+            "max_select": max_select,
+            "created_at": now,
+            "updated_at": now,
+        })
+    await _insert(Slot, slot_docs)
+    dataset.slot_ids = [str(s["_id"]) for s in slot_docs]
+
+    # Players
+    player_docs = []
+    for slot in slot_docs:
+        sid = str(slot["_id"])
+        dataset.players_by_slot[sid] = []
+        for i in range(players_per_slot):
+            pid = ObjectId()
+            dataset.players_by_slot[sid].append(str(pid))
+            player_docs.append({
+                "_id": pid,
+                "name": f"{slot['code']} Player {i}",
+                "team": rng.choice(REAL_TEAMS),
+                "price": float(rng.randint(5, 12)),
+                "slot": sid,
+                "points": float(rng.randint(0, 400)),
+                "status": "Active",
+                "stats": {"matches": rng.randint(0, 60), "runs": rng.randint(0, 2500), "wickets": rng.randint(0, 90)},
+                "created_at": now,
+                "updated_at": now,
+            })
+    await _insert(Player, player_docs)
+
+    # Contests: one ongoing (the leaderboard target) and one completed
+    ongoing = {
+        "_id": ObjectId(),
+        "code": "BENCH_ONGOING",
+        "name": "Bench Ongoing",
+        "start_at": now - timedelta(hours=2),
+        "end_at": now + timedelta(days=1),
+        "status": "ongoing",
+        "visibility": "public",
+        "points_scope": "time_window",
+        "contest_type": "full",
+        "allowed_teams": [],
+        "created_at": now,
+        "updated_at": now,
+    }
+    completed = dict(ongoing, _id=ObjectId(), code="BENCH_COMPLETED", name="Bench Completed",
+                     start_at=now - timedelta(days=3), end_at=now - timedelta(days=2), status="completed")
+    await _insert(Contest, [ongoing, completed])
+    dataset.contest_id = str(ongoing["_id"])
+    dataset.completed_contest_id = str(completed["_id"])
+
+    # Per-contest points for every player in both contests
+    points_docs = [
+        {"_id": ObjectId(), "player_id": p["_id"], "contest_id": c["_id"], "points": float(rng.randint(0, 150)), "updated_at": now}
+        for c in (ongoing, completed)
+        for p in player_docs
+    ]
+    await _insert(PlayerContestPoints, points_docs)
+
+    # Users (hashing once; every bench user shares the password)
+    hashed = get_password_hash(BENCH_PASSWORD)
+    user_count = max(1, teams // 2)
+    user_docs = []
+    for i in range(user_count):
+        user_docs.append({
+            "_id": ObjectId(),
+            "username": f"bench_user_{i}",
+            "email": f"bench_user_{i}@example.com",
+            "hashed_password": hashed,
+            "full_name": f"Bench User {i}",
+            "is_active": True,
+            "is_verified": True,
+            "is_admin": False,
+            "created_at": now,
+            "updated_at": now,
+        })
+    user_docs.append(dict(user_docs[0], _id=ObjectId(), username=dataset.admin_username,
+                          email="bench_admin@example.com", is_admin=True))
+    await _insert(User, user_docs)
+    dataset.usernames = [u["username"] for u in user_docs[:user_count]]
+
+    # Teams, all enrolled in the ongoing contest and every other one in the completed contest
+    team_docs = []
+    enrollment_docs = []
+    for i in range(teams):
+        owner = user_docs[i % user_count]
+        picks = pick_team(dataset, rng)
+        captain, vice = rng.sample(picks, 2)
+        tid = ObjectId()
+        team_docs.append({
+            "_id": tid,
+            "user_id": owner["_id"],
+            "team_name": f"Bench Team {i}",
+            "player_ids": picks,
+            "captain_id": captain,
+            "vice_captain_id": vice,
+            "fingerprint": team_fingerprint(picks, captain, vice),
+            "total_points": 0.0,
+            "total_value": 0.0,
+            "created_at": now,
+            "updated_at": now,
+        })
+        for contest in (ongoing, completed) if i % 2 == 0 else (ongoing,):
+            enrollment_docs.append({
+                "_id": ObjectId(),
+                "team_id": tid,
+                "user_id": owner["_id"],
+                "contest_id": contest["_id"],
+                "status": "active",
+                "enrolled_at": now,
+            })
+    await _insert(Team, team_docs)
+    await _insert(TeamContestEnrollment, enrollment_docs)
+
+    return dataset
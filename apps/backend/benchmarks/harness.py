@@ -0,0 +1,102 @@
+"""Shared plumbing for the benchmark suite: database backends, ASGI client, auth."""
+from typing import Dict, Optional, Tuple
+
+import httpx
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+import config.database as database
+from config.database import DOCUMENT_MODELS
+from app.utils.security import create_access_token
+from app.common.metrics import QueryBudgetListener
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts every command the driver sends, i.e. DB round trips."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.count += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+async def open_database(mongodb_url: Optional[str], db_name: str) -> Tuple[str, Optional[CommandCounter]]:
+    """Bind the app's Beanie models to a fresh benchmark database.
+
+    With ``mongodb_url`` the suite runs against a real mongod (the database is
+    dropped first) and DB round trips are counted through pymongo command
+    monitoring. Without it an in-process mongomock stand-in is used; it does not
+    emit command events, so round trips are reported as ``None``.
+
+    Returns:
+        Tuple of (backend label, command counter or None)
+    """
+    counter: Optional[CommandCounter] = None
+    if mongodb_url:
+        counter = CommandCounter()
+        client = AsyncIOMotorClient(mongodb_url, event_listeners=[counter, QueryBudgetListener()])
+        await client.drop_database(db_name)
+        backend = "mongod"
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError as exc:
+            raise SystemExit(
+                "No --mongodb-url given and mongomock-motor is not installed "
+                "(pip install mongomock-motor) - nothing to run against."
+            ) from exc
+        client = AsyncMongoMockClient()
+        backend = "mongomock"
+
+    # GridFS helpers and get_database() read the module-level client
+    database.client = client
+    await init_beanie(database=client[db_name], document_models=DOCUMENT_MODELS)
+    return backend, counter
+
+
+async def open_leaderboard_store(redis_url: Optional[str]) -> Optional[str]:
+    """Serve leaderboards from Redis sorted sets for this run.
+
+    ``redis_url`` is a redis:// URL of a running server (flushed first) or
+    ``fake`` for an in-process fakeredis. Without it leaderboards use MongoDB.
+
+    Returns:
+        Label of the leaderboard backend, or None when Redis is not used
+    """
+    from app.services.leaderboard_store import LeaderboardStore, set_leaderboard_store
+
+    if not redis_url:
+        set_leaderboard_store(None)
+        return None
+    if redis_url == "fake":
+        try:
+            import fakeredis
+        except ImportError as exc:
+            raise SystemExit("--redis-url fake needs fakeredis (pip install fakeredis)") from exc
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        label = "fakeredis"
+    else:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(redis_url, decode_responses=True)
+        await client.flushdb()
+        label = "redis"
+    set_leaderboard_store(LeaderboardStore(client))
+    return label
+
+
+def asgi_client(app) -> httpx.AsyncClient:
+    """HTTP client that drives the FastAPI app in-process through ASGI."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+
+def auth_headers(username: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
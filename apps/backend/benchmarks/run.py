@@ -0,0 +1,250 @@
+"""Load-test the API endpoints against a synthetic dataset and store the results.
+
+Generates a league at the requested scale, drives the FastAPI app in-process
+through an ASGI client and reports, per endpoint: p50/p95/p99 latency, DB round
+trips per request and peak Python memory per request. Results are written as
+JSON under ``benchmarks/results/`` keyed by scale, backend and git commit so two
+runs can be diffed with ``python -m benchmarks.compare``.
+
+Usage (from apps/backend):
+    python -m benchmarks.run --scale 1k                       # in-process mongomock
+    python -m benchmarks.run --scale 50k --mongodb-url mongodb://localhost:27017
+    python -m benchmarks.run --scale 10k --scenarios contest_leaderboard,hot_players
+    python -m benchmarks.run --scale 10k --redis-url redis://localhost:6379/15   # Redis leaderboards
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.datagen import SCALES, Dataset, generate, pick_team
+from benchmarks.harness import CommandCounter, asgi_client, auth_headers, open_database, open_leaderboard_store
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+IMPORT_ROWS = 200
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    dataset: Dataset
+    rng: random.Random
+    import_file: bytes
+
+
+@dataclass
+class Scenario:
+    name: str
+    call: Callable[[Context, int], Awaitable[httpx.Response]]
+
+
+def _user_headers(ctx: Context) -> Dict[str, str]:
+    return auth_headers(ctx.rng.choice(ctx.dataset.usernames))
+
+
+async def contest_leaderboard(ctx: Context, i: int) -> httpx.Response:
+    return await ctx.client.get(
+        f"/api/contests/{ctx.dataset.contest_id}/leaderboard",
+        params={"limit": 100},
+        headers=_user_headers(ctx),
+    )
+
+
+async def global_leaderboard(ctx: Context, i: int) -> httpx.Response:
+    return await ctx.client.get("/api/leaderboard", headers=_user_headers(ctx))
+
+
+async def hot_players(ctx: Context, i: int) -> httpx.Response:
+    return await ctx.client.get("/api/players/hot", params={"limit": 200})
+
+
+async def create_team(ctx: Context, i: int) -> httpx.Response:
+    picks = pick_team(ctx.dataset, ctx.rng)
+    captain, vice = ctx.rng.sample(picks, 2)
+    body = {
+        "team_name": f"Bench Created {i}",
+        "player_ids": picks,
+        "captain_id": captain,
+        "vice_captain_id": vice,
+    }
+    return await ctx.client.post("/api/teams/", json=body, headers=_user_headers(ctx))
+
+
+async def process_import(ctx: Context, i: int) -> httpx.Response:
+    return await ctx.client.post(
+        "/api/admin/players/import",
+        files={"file": ("bench_players.csv", ctx.import_file, "text/csv")},
+        data={"dry_run": "true", "conflict": "skip", "slot_strategy": "lookup"},
+        headers=auth_headers(ctx.dataset.admin_username),
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("contest_leaderboard", contest_leaderboard),
+        Scenario("get_leaderboard", global_leaderboard),
+        Scenario("hot_players", hot_players),
+        Scenario("create_team", create_team),
+        Scenario("process_import", process_import),
+    )
+}
+
+
+def build_import_file(rows: int) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["name", "team", "points", "slot_code", "status"])
+    for i in range(rows):
+        writer.writerow([f"Imported Player {i}", "IND", 8, "BAT", "Active"])
+    return out.getvalue().encode()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+async def run_scenario(
+    ctx: Context,
+    scenario: Scenario,
+    counter: Optional[CommandCounter],
+    iterations: int,
+    warmup: int,
+    memory_samples: int,
+) -> Dict[str, Any]:
+    for i in range(warmup):
+        await scenario.call(ctx, -i - 1)
+
+    latencies: List[float] = []
+    db_ops: List[int] = []
+    errors = 0
+    for i in range(iterations):
+        before = counter.count if counter else 0
+        started = time.perf_counter()
+        response = await scenario.call(ctx, i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if counter:
+            db_ops.append(counter.count - before)
+        if response.status_code >= 400:
+            errors += 1
+            if errors == 1:
+                print(f"    ! {scenario.name} -> {response.status_code}: {response.text[:200]}")
+
+    # Memory is sampled in a separate pass because tracemalloc slows every allocation
+    peaks: List[float] = []
+    for i in range(memory_samples):
+        tracemalloc.start()
+        await scenario.call(ctx, iterations + i)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak / 1024 / 1024)
+
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "db_ops_per_request": round(sum(db_ops) / len(db_ops), 2) if db_ops else None,
+        "peak_mem_mb": round(max(peaks), 3) if peaks else None,
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except Exception:
+            return ""
+
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain"))}
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"\n{'endpoint':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'db ops':>9}{'peak MB':>10}{'errors':>8}")
+    for name, row in results.items():
+        db_ops = "-" if row["db_ops_per_request"] is None else f"{row['db_ops_per_request']:.1f}"
+        peak = "-" if row["peak_mem_mb"] is None else f"{row['peak_mem_mb']:.2f}"
+        print(f"{name:<22}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}{db_ops:>9}{peak:>10}{row['errors']:>8}")
+
+
+async def main_async(args: argparse.Namespace) -> Path:
+    # Imported late so settings/env are only required when actually running
+    from main import app
+
+    teams = SCALES[args.scale] if args.scale in SCALES else int(args.scale)
+    backend, counter = await open_database(args.mongodb_url, args.db_name)
+    leaderboard_backend = await open_leaderboard_store(args.redis_url)
+    if leaderboard_backend:
+        backend = f"{backend}+{leaderboard_backend}"
+    print(f"Generating {teams} teams on {backend} ...")
+    started = time.perf_counter()
+    dataset = await generate(teams, players_per_slot=args.players_per_slot, seed=args.seed)
+    print(f"  done in {time.perf_counter() - started:.1f}s")
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    results: Dict[str, Dict[str, Any]] = {}
+    async with asgi_client(app) as client:
+        ctx = Context(client=client, dataset=dataset, rng=random.Random(args.seed), import_file=build_import_file(IMPORT_ROWS))
+        for name in names:
+            print(f"  running {name} ...")
+            results[name] = await run_scenario(ctx, SCENARIOS[name], counter, args.iterations, args.warmup, args.memory_samples)
+
+    print_table(results)
+
+    revision = git_revision()
+    payload = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "scale": args.scale,
+            "teams": teams,
+            "backend": backend,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+            **revision,
+        },
+        "endpoints": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{args.scale}-{backend}-{revision['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2))
+    print(f"\nResults written to {output}")
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="1k", help=f"team count preset ({', '.join(SCALES)}) or an integer")
+    parser.add_argument("--mongodb-url", default=None, help="run against this mongod instead of in-process mongomock")
+    parser.add_argument("--db-name", default="walle_bench")
+    parser.add_argument("--redis-url", default=None, help="serve leaderboards from this Redis (flushed first), or 'fake' for fakeredis")
+    parser.add_argument("--scenarios", default=None, help=f"comma separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--memory-samples", type=int, default=2)
+    parser.add_argument("--players-per-slot", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="result file path (default: benchmarks/results/...)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,166 @@
+import asyncio
+import importlib
+from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from config.settings import get_settings
+from config.indexes import FastBootInitializer, build_missing_indexes, plan_indexes
+from app.common.metrics import (
+    DBCommandListener,
+    PoolMetricsListener,
+    QueryBudgetListener,
+    SlowQueryRecorder,
+    set_slow_query_recorder,
+)
+from app.utils.read_routing import validate_read_preferences
 from app.models.user import User, RefreshToken, UserProfile
 from app.models.sponsor import Sponsor
-from app.models.carousel import CarouselImage
+from app.models.carousel import CarouselImage, CarouselOrder
 from app.models.team import Team
 from app.models.contest import Contest
+from app.models.contest_standings import ContestStandingsPage, ContestTeamBreakdown
 from app.models.team_contest_enrollment import TeamContestEnrollment
 from app.models.admin.player import Player as AdminPlayer
 from app.models.admin.slot import Slot
 from app.models.admin.import_log import ImportLog
+from app.models.admin.import_dry_run import ImportDryRun
+from app.models.admin.team_recompute_job import TeamRecomputeJob
 from app.models.player import Player as PublicPlayer
 from app.models.player_contest_points import PlayerContestPoints
 from app.models.password_reset import PasswordResetSession, PasswordResetToken
 
 settings = get_settings()
 
+# Document models registered with Beanie (shared by the app, scripts and benchmarks)
+DOCUMENT_MODELS = [
+    User,
+    RefreshToken,
+    UserProfile,
+    Sponsor,
+    CarouselImage,
+    CarouselOrder,
+    Team,
+    AdminPlayer,
+    PublicPlayer,
+    PlayerContestPoints,
+    Slot,
+    ImportLog,
+    ImportDryRun,
+    TeamRecomputeJob,
+    Contest,
+    ContestStandingsPage,
+    ContestTeamBreakdown,
+    TeamContestEnrollment,
+    PasswordResetSession,
+    PasswordResetToken,
+]
+
 # MongoDB client
 client: AsyncIOMotorClient = None
+# Background index build started by MONGODB_INDEX_SYNC=background
+_index_task: Optional[asyncio.Task] = None
 
+# Optional packages each wire compressor needs (zlib ships with Python)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
 
-async def connect_to_mongo():
-    """Connect to MongoDB and initialize Beanie ODM"""
-    global client
+
+def _available_compressors(names: str) -> List[str]:
+    """Configured compressors whose support library is importable, in order."""
+    available = []
+    for name in (n.strip().lower() for n in names.split(",") if n.strip()):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module is None:
+            print(f"! Ignoring unknown MongoDB compressor '{name}'")
+            continue
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            print(f"! MongoDB compressor '{name}' needs the '{module}' package; skipping it")
+            continue
+        available.append(name)
+    return available
+
+
+def client_options() -> Dict[str, Any]:
+    """Pool sizing and compression for AsyncIOMotorClient, from settings."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+    }
+    if settings.mongodb_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    compressors = _available_compressors(settings.mongodb_compressors)
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+async def sync_indexes_in_background() -> None:
+    """Build indexes missing from the database without blocking startup."""
+    try:
+        plans = await plan_indexes(DOCUMENT_MODELS)
+        collections = {m.get_collection_name(): m.get_motor_collection() for m in DOCUMENT_MODELS}
+        for plan in plans:
+            created = await build_missing_indexes(plan, collections[plan.collection])
+            if created:
+                print(f"✓ Built indexes on {plan.collection}: {', '.join(created)}")
+    except Exception as e:
+        print(f"✗ Background index sync failed: {e}")
+
+
+async def connect_to_mongo(index_sync: Optional[str] = None):
+    """Connect to MongoDB and initialize Beanie ODM
+
+    Args:
+        index_sync: Override MONGODB_INDEX_SYNC ("startup", "background" or "off")
+    """
+    global client, _index_task
+    index_sync = index_sync or settings.mongodb_index_sync
 
     try:
-        # Create MongoDB client
-        client = AsyncIOMotorClient(settings.mongodb_url)
+        # Create MongoDB client (command monitoring feeds the per-route DB metrics)
+        event_listeners = []
+        if settings.metrics_enabled:
+            event_listeners.append(DBCommandListener(track_bytes=settings.metrics_db_bytes))
+            event_listeners.append(PoolMetricsListener())
+        if settings.is_test:
+            # Feeds record_queries() so route query budgets are enforced in tests
+            event_listeners.append(QueryBudgetListener())
+        recorder = None
+        if settings.slow_query_enabled:
+            recorder = SlowQueryRecorder(
+                threshold_ms=settings.slow_query_threshold_ms,
+                capacity=settings.slow_query_capacity,
+            )
+            event_listeners.append(recorder)
+        # Fail fast on invalid read preferences rather than on the first leaderboard read
+        validate_read_preferences(model.Settings.name for model in DOCUMENT_MODELS)
+        client = AsyncIOMotorClient(settings.mongodb_url, event_listeners=event_listeners, **client_options())
+        if recorder is not None:
+            recorder.bind(client, asyncio.get_running_loop())
+            set_slow_query_recorder(recorder)
 
         # Test connection
         await client.admin.command('ping')
         print(f"✓ Connected to MongoDB at {settings.mongodb_url}")
 
         # Initialize Beanie with document models
-        await init_beanie(
-            database=client[settings.mongodb_db_name],
-            document_models=[
-                User,
-                RefreshToken,
-                UserProfile,
-                Sponsor,
-                CarouselImage,
-                Team,
-                AdminPlayer,
-                PublicPlayer,
-                PlayerContestPoints,
-                Slot,
-                ImportLog,
-                Contest,
-                TeamContestEnrollment,
-                PasswordResetSession,
-                PasswordResetToken,
-            ]
-        )
-        print(f"✓ Initialized Beanie ODM with database: {settings.mongodb_db_name}")
+        if index_sync == "startup":
+            await init_beanie(
+                database=client[settings.mongodb_db_name],
+                document_models=DOCUMENT_MODELS,
+            )
+        else:
+            # Fast boot: skip per-model index sync (and repeated buildInfo)
+            await FastBootInitializer(
+                database=client[settings.mongodb_db_name],
+                document_models=DOCUMENT_MODELS,
+            )
+            if index_sync == "background":
+                _index_task = asyncio.create_task(sync_indexes_in_background())
+        print(f"✓ Initialized Beanie ODM with database: {settings.mongodb_db_name} (index sync: {index_sync})")
 
     except Exception as e:
         print(f"✗ Failed to connect to MongoDB: {e}")
@@ -63,6 +170,8 @@ async def connect_to_mongo():
 async def close_mongo_connection():
     """Close MongoDB connection"""
     global client
+    if _index_task is not None and not _index_task.done():
+        _index_task.cancel()
     if client:
         client.close()
         print("✓ Closed MongoDB connection")
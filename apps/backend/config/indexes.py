@@ -0,0 +1,126 @@
+"""
+Index management decoupled from application startup.
+
+By default (MONGODB_INDEX_SYNC=startup) ``init_beanie`` syncs every model's
+indexes on each boot of each worker. With MONGODB_INDEX_SYNC=background or
+off the app boots through ``FastBootInitializer`` instead. ``background``
+then builds missing indexes in a background task, and with ``off`` they are
+managed out of band with ``python -m scripts.manage_indexes`` (diff declared
+vs existing, build missing).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Type
+
+from beanie import Document
+from beanie.odm.settings.document import IndexModelField
+from beanie.odm.utils.init import Initializer
+from beanie.odm.utils.pydantic import get_model_fields
+from beanie.odm.utils.typing import get_index_attributes
+from pymongo import IndexModel
+
+
+class FastBootInitializer(Initializer):
+    """
+    Beanie initializer that skips index sync and asks for buildInfo once.
+
+    Stock initialization runs listIndexes + createIndexes and a buildInfo
+    command for every model; at 15 models that is ~45 round trips before the
+    worker can serve a request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._build_info: Optional[dict] = None
+        self._database_command = self.database.command
+        # init_document asks for buildInfo per model; answer from cache after the first
+        self.database.command = self._command
+
+    async def _command(self, command, *args, **kwargs):
+        if command == {"buildInfo": 1}:
+            if self._build_info is None:
+                self._build_info = await self._database_command(command, *args, **kwargs)
+            return self._build_info
+        return await self._database_command(command, *args, **kwargs)
+
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        return None
+
+    def __await__(self):
+        try:
+            yield from super().__await__()
+        finally:
+            self.database.command = self._database_command
+
+
+def declared_indexes(model: Type[Document]) -> List[IndexModelField]:
+    """Indexes a model declares (``Indexed`` fields plus ``Settings.indexes``).
+
+    Mirrors how Beanie's initializer gathers them; the model must already be
+    initialised so its settings are parsed.
+    """
+    found = []
+    for name, field_info in get_model_fields(model).items():
+        attrs = get_index_attributes(field_info)
+        if attrs is not None:
+            found.append(IndexModelField(IndexModel([(field_info.alias or name, attrs[0])], **attrs[1])))
+
+    settings = model.get_settings()
+    if settings.merge_indexes:
+        merged: List[IndexModelField] = []
+        for subclass in reversed(model.mro()):
+            if issubclass(subclass, Document) and subclass is not Document and subclass.get_settings().indexes:
+                merged = IndexModelField.merge_indexes(merged, subclass.get_settings().indexes)
+        return IndexModelField.merge_indexes(found, merged)
+    if settings.indexes:
+        return IndexModelField.merge_indexes(found, settings.indexes)
+    return found
+
+
+@dataclass
+class CollectionIndexPlan:
+    """Difference between declared and existing indexes of one collection."""
+
+    collection: str
+    models: List[str] = field(default_factory=list)
+    missing: List[IndexModelField] = field(default_factory=list)
+    undeclared: List[IndexModelField] = field(default_factory=list)
+
+    @property
+    def in_sync(self) -> bool:
+        return not self.missing
+
+
+async def plan_indexes(models: Sequence[Type[Document]]) -> List[CollectionIndexPlan]:
+    """Compare declared indexes with the database, per collection.
+
+    Several models can share a collection (e.g. the admin and public Player
+    models); their declarations are combined.
+    """
+    by_collection: Dict[str, CollectionIndexPlan] = {}
+    declared: Dict[str, List[IndexModelField]] = {}
+    collections = {}
+    for model in models:
+        name = model.get_collection_name()
+        plan = by_collection.setdefault(name, CollectionIndexPlan(collection=name))
+        plan.models.append(f"{model.__module__}.{model.__name__}")
+        collections[name] = model.get_motor_collection()
+        for index in declared_indexes(model):
+            if index not in declared.setdefault(name, []):
+                declared[name].append(index)
+
+    for name, plan in by_collection.items():
+        existing = IndexModelField.from_motor_index_information(await collections[name].index_information())
+        plan.missing = IndexModelField.list_difference(declared.get(name, []), existing)
+        plan.undeclared = IndexModelField.list_difference(existing, declared.get(name, []))
+    return list(by_collection.values())
+
+
+async def build_missing_indexes(plan: CollectionIndexPlan, collection) -> List[str]:
+    """Create the plan's missing indexes; returns the created index names.
+
+    On MongoDB 4.2+ every build uses the optimized process that only locks the
+    collection briefly at the start and end, so reads and writes continue.
+    """
+    if not plan.missing:
+        return []
+    return await collection.create_indexes(IndexModelField.list_to_index_model(plan.missing))
@@ -1,6 +1,6 @@
 import os
 import re
-from typing import Optional
+from typing import Literal, Optional
 from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings
@@ -27,6 +27,22 @@ class Settings(BaseSettings):
     # MongoDB Database
     mongodb_url: str = Field(default="mongodb://localhost:27017", alias="MONGODB_URL")
     mongodb_db_name: str = Field(default="world-tower", alias="MONGODB_DB_NAME")
+    # Index sync at boot: "startup" (block until synced), "background" (boot fast,
+    # build missing indexes in a background task) or "off" (use scripts/manage_indexes.py)
+    mongodb_index_sync: Literal["startup", "background", "off"] = Field(default="startup", alias="MONGODB_INDEX_SYNC")
+    # Connection pool (per worker process)
+    mongodb_max_pool_size: int = Field(default=100, ge=1, alias="MONGODB_MAX_POOL_SIZE")
+    mongodb_min_pool_size: int = Field(default=0, ge=0, alias="MONGODB_MIN_POOL_SIZE")
+    mongodb_max_idle_time_ms: Optional[int] = Field(default=None, ge=0, alias="MONGODB_MAX_IDLE_TIME_MS")
+    mongodb_wait_queue_timeout_ms: Optional[int] = Field(default=None, ge=0, alias="MONGODB_WAIT_QUEUE_TIMEOUT_MS")
+    # Wire compression in preference order, e.g. "zstd,snappy,zlib" (zstd/snappy need their extras)
+    mongodb_compressors: str = Field(default="", alias="MONGODB_COMPRESSORS")
+    # Read preference for heavy read-only paths (leaderboards, hot players), e.g. "secondaryPreferred"
+    mongodb_heavy_read_preference: str = Field(default="primary", alias="MONGODB_HEAVY_READ_PREFERENCE")
+    # Per-collection overrides of that preference, e.g. "players=secondaryPreferred,teams=primary"
+    mongodb_read_preferences: str = Field(default="", alias="MONGODB_READ_PREFERENCES")
+    # Max replication lag tolerated on those reads; MongoDB requires >= 90 when set
+    mongodb_max_staleness_seconds: Optional[int] = Field(default=None, ge=90, alias="MONGODB_MAX_STALENESS_SECONDS")
     
     # API Configuration
     api_host: str = Field(default="0.0.0.0", alias="API_HOST")
@@ -38,8 +54,63 @@ class Settings(BaseSettings):
         alias="CORS_ORIGINS"
     )
     
-    # Optional external services (for future use)
+    # Metrics / instrumentation
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    # Re-encodes each command and reply to measure BSON bytes (off by default: it costs CPU per command)
+    metrics_db_bytes: bool = Field(default=False, alias="METRICS_DB_BYTES")
+    # When set, /metrics requires "Authorization: Bearer <token>"; in production /metrics is off without it
+    metrics_token: Optional[str] = Field(default=None, alias="METRICS_TOKEN")
+
+    # Slow-query recorder (explains slow find/aggregate commands; off by default)
+    slow_query_enabled: bool = Field(default=False, alias="SLOW_QUERY_ENABLED")
+    slow_query_threshold_ms: float = Field(default=100.0, alias="SLOW_QUERY_THRESHOLD_MS")
+    slow_query_capacity: int = Field(default=50, alias="SLOW_QUERY_CAPACITY")
+
+    # Admission control for heavy endpoints (see app/common/guards/admission.py)
+    admission_control_enabled: bool = Field(default=True, alias="ADMISSION_CONTROL_ENABLED")
+    # Slots shared by all limited route classes, per worker
+    admission_max_concurrency: int = Field(default=32, ge=1, alias="ADMISSION_MAX_CONCURRENCY")
+    # Leaderboards, hot-player aggregations
+    admission_heavy_concurrency: int = Field(default=8, ge=1, alias="ADMISSION_HEAVY_CONCURRENCY")
+    admission_heavy_queue: int = Field(default=64, ge=0, alias="ADMISSION_HEAVY_QUEUE")
+    # Player imports, slot migration
+    admission_bulk_concurrency: int = Field(default=2, ge=1, alias="ADMISSION_BULK_CONCURRENCY")
+    admission_bulk_queue: int = Field(default=4, ge=0, alias="ADMISSION_BULK_QUEUE")
+    # Team create/edit/enroll; limited only by ADMISSION_MAX_CONCURRENCY but served first
+    admission_team_write_queue: int = Field(default=256, ge=0, alias="ADMISSION_TEAM_WRITE_QUEUE")
+    admission_queue_timeout_seconds: float = Field(default=2.0, gt=0, alias="ADMISSION_QUEUE_TIMEOUT_SECONDS")
+    admission_retry_after_seconds: int = Field(default=1, ge=0, alias="ADMISSION_RETRY_AFTER_SECONDS")
+
+    # Redis: when set, leaderboards are kept in sorted sets shared by all workers
     redis_url: Optional[str] = Field(default=None, alias="REDIS_URL")
+    # Sorted sets are rebuilt from MongoDB at least this often
+    leaderboard_cache_ttl_seconds: int = Field(default=3600, ge=60, alias="LEADERBOARD_CACHE_TTL_SECONDS")
+
+    # Cache invalidation across workers/instances via MongoDB change streams (needs a replica set)
+    cache_invalidation_change_streams: bool = Field(default=False, alias="CACHE_INVALIDATION_CHANGE_STREAMS")
+    # Comma-separated collections to watch
+    cache_invalidation_collections: str = Field(
+        default="players,slots,contests,sponsors,carousel_images,team_contest_enrollments",
+        alias="CACHE_INVALIDATION_COLLECTIONS",
+    )
+    # Contest metadata cached per worker is reloaded at least this often
+    contest_cache_ttl_seconds: float = Field(default=60.0, gt=0, alias="CONTEST_CACHE_TTL_SECONDS")
+    # Contest windows and team enrollments used for the team edit lock are re-read at least this often
+    team_lock_cache_ttl_seconds: float = Field(default=15.0, gt=0, alias="TEAM_LOCK_CACHE_TTL_SECONDS")
+    # The active carousel feed is rebuilt after admin changes and at least this often
+    carousel_feed_ttl_seconds: float = Field(default=300.0, gt=0, alias="CAROUSEL_FEED_TTL_SECONDS")
+    # Sections of GET /api/bootstrap (sponsors, slots, hot player ids) are reloaded at least this often
+    bootstrap_cache_ttl_seconds: float = Field(default=60.0, gt=0, alias="BOOTSTRAP_CACHE_TTL_SECONDS")
+    # Slot codes in the cached XLSX import template are re-read at least this often
+    import_template_cache_ttl_seconds: float = Field(default=300.0, gt=0, alias="IMPORT_TEMPLATE_CACHE_TTL_SECONDS")
+
+    # Teams per aggregation when recomputing team totals after a player change
+    team_recompute_batch_size: int = Field(default=1000, ge=1, alias="TEAM_RECOMPUTE_BATCH_SIZE")
+
+    # Validated rows of a dry-run import are kept this long for the commit of the same file
+    import_dry_run_ttl_seconds: int = Field(default=900, ge=0, alias="IMPORT_DRY_RUN_TTL_SECONDS")
+
+    # Optional external services (for future use)
     cricket_api_key: Optional[str] = Field(default=None, alias="CRICKET_API_KEY")
     payment_gateway_key: Optional[str] = Field(default=None, alias="PAYMENT_GATEWAY_KEY")
     email_service_key: Optional[str] = Field(default=None, alias="EMAIL_SERVICE_KEY")
@@ -87,6 +158,23 @@ class Settings(BaseSettings):
         combined = "^(?:" + "|".join(patterns) + ")$"
         return combined
     
+    @property
+    def mongodb_read_preferences_map(self) -> dict[str, str]:
+        """Collection name -> read preference mode from MONGODB_READ_PREFERENCES."""
+        preferences = {}
+        for entry in self.mongodb_read_preferences.split(","):
+            if not entry.strip():
+                continue
+            collection, _, mode = entry.partition("=")
+            if not collection.strip() or not mode.strip():
+                raise ValueError(f"Invalid MONGODB_READ_PREFERENCES entry '{entry.strip()}'. Use collection=mode")
+            preferences[collection.strip()] = mode.strip()
+        return preferences
+
+    @property
+    def cache_invalidation_collections_list(self) -> list[str]:
+        return [name.strip() for name in self.cache_invalidation_collections.split(",") if name.strip()]
+
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
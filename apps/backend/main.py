@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,8 +8,14 @@ import uvicorn
 from datetime import datetime
 from config.settings import settings
 import logging
-from config.database import connect_to_mongo, close_mongo_connection
-from app.routes import auth_router, users_router, sponsors_router, leaderboard_router, contests_router
+from config.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.leaderboard_store import close_leaderboard_store
+from app.routes import auth_router, users_router, sponsors_router, leaderboard_router, contests_router, metrics_router, bootstrap_router
+from app.common.metrics import MetricsMiddleware, QueryBudgetMiddleware
+from app.common.singleflight import SingleFlightTimeout
+from app.common.invalidation import ChangeStreamWatcher
+from app.services.contest_cache import contest_cache
+from app.common.guards.admission import AdmissionControlMiddleware, controller_from_settings
 from app.routes.players import router as players_router
 from app.routes.players_hot import router as players_hot_router
 from app.routes.slots import router as slots_router
@@ -20,6 +27,7 @@ from app.routes.admin import (
     players_import_router as admin_players_import_router,
     contests_router as admin_contests_router,
     users_teams_router as admin_users_teams_router,
+    diagnostics_router as admin_diagnostics_router,
 )
 
 # Logging configuration
@@ -34,9 +42,19 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup: Connect to MongoDB
     await connect_to_mongo()
+    # Contest metadata is read on nearly every contest-scoped request
+    await contest_cache.load()
+    # Tail change streams so writes from any worker invalidate this worker's caches
+    watcher = None
+    if settings.cache_invalidation_change_streams:
+        watcher = ChangeStreamWatcher(get_database(), settings.cache_invalidation_collections_list)
+        watcher.start()
     yield
-    # Shutdown: Close MongoDB connection
+    # Shutdown: Close MongoDB and Redis connections
+    if watcher is not None:
+        await watcher.stop()
     await close_mongo_connection()
+    await close_leaderboard_store()
 
 
 app = FastAPI(
@@ -47,6 +65,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Bound concurrency of heavy route classes and shed excess load with 503 + Retry-After
+# (added before CORS so CORS wraps it and the 503s carry CORS headers)
+if settings.admission_control_enabled:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        controller=controller_from_settings(settings),
+        retry_after=settings.admission_retry_after_seconds,
+    )
+
 # CORS middleware with wildcard support (exact origins + optional regex)
 
 app.add_middleware(
@@ -58,6 +85,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency and per-route DB accounting; Server-Timing headers only in debug
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.debug)
+
+# Fail any request that exceeds its route's declared query budget (see @query_budget)
+if settings.is_test:
+    app.add_middleware(QueryBudgetMiddleware)
+
+
+@app.exception_handler(SingleFlightTimeout)
+async def single_flight_timeout_handler(request: Request, exc: SingleFlightTimeout):
+    """A coalesced computation is overdue: ask the client to retry instead of piling on."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Log CORS configuration (helpful for debugging in deployments)
 logger.info("CORS exact origins: %s", settings.cors_exact_origins)
 logger.info("CORS origin regex: %s", settings.cors_origin_regex)
@@ -73,11 +119,18 @@ app.include_router(admin_slots_router)
 app.include_router(admin_players_import_router)
 app.include_router(admin_contests_router)
 app.include_router(admin_users_teams_router)
-app.include_router(players_router)
+app.include_router(admin_diagnostics_router)
+# Hot players must be registered before /api/players/{id} so "/hot" is not captured as an id
 app.include_router(players_hot_router)
+app.include_router(players_router)
 app.include_router(slots_router)
 app.include_router(teams_router)
 app.include_router(carousel_router)
+app.include_router(bootstrap_router)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
+    if settings.is_production and not settings.metrics_token:
+        logger.warning("METRICS_TOKEN is not set; /metrics is disabled in production")
 
 # Files are served via API streaming endpoints (GridFS); no static uploads mount required
 
@@ -0,0 +1,60 @@
+"""
+Set Team.fingerprint on teams saved before fingerprints existed.
+
+Fingerprints are maintained on team create/update; this fills in the rest in
+batched bulk writes. Pass --all to recompute every team's fingerprint.
+
+    python -m scripts.backfill_team_fingerprints [--all] [--dry-run]
+"""
+import argparse
+import asyncio
+
+from pymongo import UpdateOne
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.models.team import Team
+from app.utils.team_fingerprint import team_fingerprint
+
+BATCH_SIZE = 1000
+
+
+async def backfill(recompute_all: bool = False, dry_run: bool = False) -> None:
+    collection = Team.get_motor_collection()
+    query = {} if recompute_all else {"fingerprint": None}
+    cursor = collection.find(query, {"player_ids": 1, "captain_id": 1, "vice_captain_id": 1, "fingerprint": 1})
+
+    scanned = changed = 0
+    batch = []
+    async for doc in cursor:
+        scanned += 1
+        fingerprint = team_fingerprint(doc.get("player_ids") or [], doc.get("captain_id"), doc.get("vice_captain_id"))
+        if doc.get("fingerprint") == fingerprint:
+            continue
+        changed += 1
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"fingerprint": fingerprint}}))
+        if len(batch) >= BATCH_SIZE:
+            if not dry_run:
+                await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch and not dry_run:
+        await collection.bulk_write(batch, ordered=False)
+
+    action = "would update" if dry_run else "updated"
+    print(f"Fingerprint backfill done: scanned={scanned}, {action}={changed}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="recompute every team, not only those without one")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await backfill(recompute_all=args.all, dry_run=args.dry_run)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
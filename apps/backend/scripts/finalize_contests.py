@@ -0,0 +1,49 @@
+"""
+Freeze the standings of every contest that has ended but is not finalized yet.
+
+Meant to run periodically (e.g. from cron) after contests end. Pass contest
+codes to (re-)finalize just those, for instance after a points correction:
+
+    python -m scripts.finalize_contests
+    python -m scripts.finalize_contests IPL-FINAL DAILY-0412
+"""
+import asyncio
+import sys
+from typing import List
+
+from config.database import connect_to_mongo, close_mongo_connection
+from app.models.contest import Contest
+from app.services.contest_snapshots import finalize_contest
+from app.services.leaderboard_store import invalidate_leaderboards
+from app.utils.timezone import now_ist, to_ist
+
+
+async def finalize(codes: List[str]) -> None:
+    if codes:
+        contests = await Contest.find({"code": {"$in": codes}}).to_list()
+        missing = set(codes) - {c.code for c in contests}
+        for code in sorted(missing):
+            print(f"[SKIP] No contest with code '{code}'")
+    else:
+        contests = await Contest.find({"end_at": {"$lte": now_ist()}, "finalized_version": None}).to_list()
+    print(f"Finalizing {len(contests)} contest(s)")
+
+    for contest in contests:
+        if to_ist(contest.end_at) > now_ist():
+            print(f"[SKIP] {contest.code} has not ended yet")
+            continue
+        result = await finalize_contest(contest)
+        await invalidate_leaderboards([contest.id])
+        print(f"[OK] {contest.code}: version={result.version} teams={result.teams} pages={result.pages}")
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        await finalize(sys.argv[1:])
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
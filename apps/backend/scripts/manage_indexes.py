@@ -0,0 +1,70 @@
+"""
+Diff declared vs existing MongoDB indexes and build the missing ones.
+
+Meant to run out of band (locally, as a deploy step, or a one-off job) so app
+workers can boot with MONGODB_INDEX_SYNC=off or background.
+
+Usage (from apps/backend):
+    python -m scripts.manage_indexes              # show the diff
+    python -m scripts.manage_indexes --check      # exit 1 if any index is missing
+    python -m scripts.manage_indexes --apply      # build missing indexes
+    python -m scripts.manage_indexes --apply --drop-undeclared
+"""
+import argparse
+import asyncio
+import sys
+
+from config.database import DOCUMENT_MODELS, connect_to_mongo, close_mongo_connection
+from config.indexes import build_missing_indexes, plan_indexes
+
+
+def describe(index) -> str:
+    keys = ", ".join(f"{field}:{direction}" for field, direction in index.index.document["key"].items())
+    options = {k: v for k, v in index.options if k != "name"}
+    return f"{index.name} ({keys}){' ' + str(options) if options else ''}"
+
+
+async def run(apply: bool, check: bool, drop_undeclared: bool) -> int:
+    plans = await plan_indexes(DOCUMENT_MODELS)
+    collections = {m.get_collection_name(): m.get_motor_collection() for m in DOCUMENT_MODELS}
+
+    missing_total = 0
+    for plan in sorted(plans, key=lambda p: p.collection):
+        status = "in sync" if plan.in_sync and not plan.undeclared else ""
+        print(f"\n{plan.collection} [{', '.join(plan.models)}] {status}")
+        for index in plan.missing:
+            print(f"  + missing    {describe(index)}")
+        for index in plan.undeclared:
+            print(f"  - undeclared {describe(index)}")
+        missing_total += len(plan.missing)
+
+        if apply and plan.missing:
+            created = await build_missing_indexes(plan, collections[plan.collection])
+            print(f"  built: {', '.join(created)}")
+        if apply and drop_undeclared:
+            for index in plan.undeclared:
+                await collections[plan.collection].drop_index(index.name)
+                print(f"  dropped: {index.name}")
+
+    print(f"\n{missing_total} missing index(es)" + (" built" if apply and missing_total else ""))
+    return 1 if check and missing_total else 0
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="build missing indexes")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if indexes are missing")
+    parser.add_argument("--drop-undeclared", action="store_true", help="with --apply, drop indexes no model declares")
+    args = parser.parse_args()
+    if args.drop_undeclared and not args.apply:
+        parser.error("--drop-undeclared requires --apply")
+
+    await connect_to_mongo(index_sync="off")
+    try:
+        return await run(args.apply, args.check, args.drop_undeclared)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,41 @@
+"""
+Print the invalidation events the change stream watcher publishes.
+
+Handy to check a deployment (or a local single-node replica set) end to end:
+run this, then edit a player or slot from the admin UI or mongosh.
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 &
+    mongosh --eval 'rs.initiate()'
+    MONGODB_URL=mongodb://localhost:27017/?replicaSet=rs0 python -m scripts.watch_invalidations
+
+Pass collection names to watch only those.
+"""
+import asyncio
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.common.invalidation import ALL, ChangeStreamWatcher, InvalidationBus
+from config.settings import settings
+
+
+async def main() -> None:
+    collections = sys.argv[1:] or settings.cache_invalidation_collections_list
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    bus = InvalidationBus()
+    bus.subscribe(ALL, lambda event: print(event, flush=True))
+    watcher = ChangeStreamWatcher(client[settings.mongodb_db_name], collections, bus=bus)
+    watcher.start()
+    print(f"Watching {', '.join(collections)} on {settings.mongodb_db_name} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await watcher.stop()
+        client.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.common.guards.admission import (
+    HEAVY,
+    PRIORITY_HIGH,
+    TEAM_WRITE,
+    AdmissionControlMiddleware,
+    AdmissionController,
+    AdmissionRejected,
+    RouteClass,
+    admission_class,
+)
+
+
+def _controller(max_concurrency=1, heavy=(1, 1), team_write=(1, 1), queue_timeout=1.0):
+    return AdmissionController(
+        classes=[
+            RouteClass(HEAVY, *heavy),
+            RouteClass(TEAM_WRITE, *team_write, priority=PRIORITY_HIGH),
+        ],
+        max_concurrency=max_concurrency,
+        queue_timeout=queue_timeout,
+    )
+
+
+async def _queued(controller, name):
+    """Start an acquire and let it reach the queue."""
+    task = asyncio.create_task(controller.acquire(name))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_full_queue_is_shed():
+    controller = _controller(heavy=(1, 1))
+    await controller.acquire(HEAVY)
+    waiting = await _queued(controller, HEAVY)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire(HEAVY)
+    assert rejected.value.reason == "queue_full"
+
+    controller.release(HEAVY)
+    await waiting
+    controller.release(HEAVY)
+    assert controller._total == 0
+
+
+async def test_queued_request_times_out():
+    controller = _controller(heavy=(1, 1), queue_timeout=0.01)
+    await controller.acquire(HEAVY)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire(HEAVY)
+    assert rejected.value.reason == "timeout"
+    assert controller._queued[HEAVY] == 0
+
+    # A later release does not hand the slot to the timed-out waiter
+    controller.release(HEAVY)
+    assert controller._total == 0
+
+
+async def test_freed_slot_goes_to_higher_priority_first():
+    controller = _controller(max_concurrency=1, heavy=(1, 2), team_write=(1, 2))
+    await controller.acquire(HEAVY)
+    heavy = await _queued(controller, HEAVY)
+    team_write = await _queued(controller, TEAM_WRITE)
+
+    controller.release(HEAVY)
+    await asyncio.wait_for(team_write, 1)
+    assert not heavy.done()
+
+    controller.release(TEAM_WRITE)
+    await heavy
+    controller.release(HEAVY)
+
+
+def _app(controller, retry_after):
+    app = FastAPI()
+
+    @app.get("/heavy")
+    @admission_class(HEAVY)
+    async def heavy():
+        return {"ok": True}
+
+    @app.get("/cheap")
+    async def cheap():
+        return {"ok": True}
+
+    app.add_middleware(AdmissionControlMiddleware, controller=controller, retry_after=retry_after)
+    return app
+
+
+async def test_rejection_is_503_with_retry_after():
+    # No slots and no queue: every classified request is shed
+    controller = _controller(heavy=(0, 0))
+    transport = httpx.ASGITransport(app=_app(controller, retry_after=7))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/heavy")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "7"
+
+        # Unclassified routes are never queued
+        assert (await client.get("/cheap")).status_code == 200
+
+
+async def test_rejection_carries_cors_headers(app, client, monkeypatch):
+    middleware = next(m for m in app.user_middleware if m.cls is AdmissionControlMiddleware)
+    controller = middleware.kwargs["controller"]
+
+    async def shed(name, priority=None):
+        raise AdmissionRejected(name, "queue_full")
+
+    monkeypatch.setattr(controller, "acquire", shed)
+    response = await client.get("/api/leaderboard", headers={"Origin": "http://localhost:3000"})
+    assert response.status_code == 503
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
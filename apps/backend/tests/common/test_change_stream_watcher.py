@@ -0,0 +1,210 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from app.common.invalidation import watcher as watcher_module
+from app.common.invalidation.bus import InvalidationBus
+from app.common.invalidation.events import CHANGE_STREAM, FLUSH, PLAYERS, SLOTS
+from app.common.invalidation.watcher import ChangeStreamWatcher
+
+
+def _change(operation, collection=PLAYERS, document_id="p1", **extra):
+    return {"operationType": operation, "ns": {"coll": collection}, "documentKey": {"_id": document_id}, **extra}
+
+
+class FakeStream:
+    """One watch() cursor: yields (change, post-batch token) pairs, then ``end``."""
+
+    def __init__(self, batches, end):
+        self.batches = list(batches)
+        self.end = end
+        self.alive = True
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def try_next(self):
+        if not self.batches:
+            if isinstance(self.end, Exception):
+                raise self.end
+            # Idle until the watcher is stopped
+            await asyncio.Event().wait()
+        change, self.resume_token = self.batches.pop(0)
+        return change
+
+
+class FakeDatabase:
+    def __init__(self, *streams):
+        self.streams = list(streams)
+        self.resume_after = []
+
+    def watch(self, pipeline, resume_after=None, max_await_time_ms=None):
+        self.resume_after.append(resume_after)
+        return self.streams.pop(0)
+
+
+@pytest.fixture
+def bus():
+    bus = InvalidationBus()
+    bus.events = []
+    for collection in (PLAYERS, SLOTS):
+        bus.subscribe(collection, bus.events.append)
+    return bus
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(watcher_module.asyncio, "sleep", lambda delay: sleep(0))
+    yield
+
+
+async def _run_until(watcher, database, calls):
+    watcher.start()
+    for _ in range(200):
+        if len(database.resume_after) >= calls and not database.streams:
+            break
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await watcher.stop()
+
+
+async def test_publishes_changes_and_keeps_post_batch_tokens(bus):
+    database = FakeDatabase(FakeStream(
+        [
+            (_change("update", updateDescription={"updatedFields": {"points": 3}}), {"_data": "1"}),
+            (None, {"_data": "2"}),  # empty batch still advances the token
+        ],
+        end=None,
+    ))
+    watcher = ChangeStreamWatcher(database, [PLAYERS, SLOTS], bus=bus)
+
+    await _run_until(watcher, database, calls=1)
+
+    assert watcher.ready.is_set()
+    assert watcher.resume_token == {"_data": "2"}
+    [event] = bus.events
+    assert (event.collection, event.operation, event.document_id, event.updated_fields, event.source) == (
+        PLAYERS, "update", "p1", ("points",), CHANGE_STREAM,
+    )
+
+
+async def test_resumes_after_the_last_token_when_the_connection_drops(bus):
+    database = FakeDatabase(
+        FakeStream([(_change("insert"), {"_data": "1"})], end=AutoReconnect("gone")),
+        FakeStream([(_change("delete", document_id="p2"), {"_data": "2"})], end=None),
+    )
+    watcher = ChangeStreamWatcher(database, [PLAYERS], bus=bus)
+
+    await _run_until(watcher, database, calls=2)
+
+    assert database.resume_after == [None, {"_data": "1"}]
+    assert [(e.operation, e.document_id) for e in bus.events] == [("insert", "p1"), ("delete", "p2")]
+    assert watcher.resume_token == {"_data": "2"}
+
+
+@pytest.mark.parametrize("code", sorted(watcher_module.RESUME_LOST_CODES))
+async def test_lost_history_flushes_and_restarts_from_now(bus, code):
+    database = FakeDatabase(
+        FakeStream([(None, {"_data": "1"})], end=OperationFailure("history lost", code=code)),
+        FakeStream([], end=None),
+    )
+    watcher = ChangeStreamWatcher(database, [PLAYERS, SLOTS], bus=bus)
+
+    await _run_until(watcher, database, calls=2)
+
+    assert database.resume_after == [None, None]
+    assert [(e.collection, e.operation) for e in bus.events] == [(PLAYERS, FLUSH), (SLOTS, FLUSH)]
+    assert {e.reason for e in bus.events} == {"history_lost"}
+
+
+async def test_non_resumable_label_also_restarts_from_now(bus):
+    failure = OperationFailure("fatal", code=1, details={"errorLabels": ["NonResumableChangeStreamError"]})
+    database = FakeDatabase(
+        FakeStream([(None, {"_data": "1"})], end=failure),
+        FakeStream([], end=None),
+    )
+    watcher = ChangeStreamWatcher(database, [PLAYERS], bus=bus)
+
+    await _run_until(watcher, database, calls=2)
+
+    assert database.resume_after == [None, None]
+    assert [e.operation for e in bus.events] == [FLUSH]
+
+
+async def test_invalidate_restarts_from_now(bus):
+    database = FakeDatabase(
+        FakeStream([(None, {"_data": "1"}), ({"operationType": "invalidate"}, {"_data": "2"})], end=None),
+        FakeStream([], end=None),
+    )
+    watcher = ChangeStreamWatcher(database, [PLAYERS], bus=bus)
+
+    await _run_until(watcher, database, calls=2)
+
+    assert database.resume_after == [None, None]
+    assert [(e.operation, e.reason) for e in bus.events] == [(FLUSH, "invalidate")]
+
+
+async def test_other_failures_resume_with_the_kept_token(bus):
+    database = FakeDatabase(
+        FakeStream([(None, {"_data": "1"})], end=OperationFailure("interrupted", code=11601)),
+        FakeStream([], end=None),
+    )
+    watcher = ChangeStreamWatcher(database, [PLAYERS], bus=bus)
+
+    await _run_until(watcher, database, calls=2)
+
+    assert database.resume_after == [None, {"_data": "1"}]
+    assert bus.events == []
+
+
+async def test_standalone_server_stops_the_watcher(bus):
+    database = FakeDatabase(FakeStream([], end=OperationFailure("not a replica set", code=40573)))
+    watcher = ChangeStreamWatcher(database, [PLAYERS], bus=bus)
+
+    watcher.start()
+    await asyncio.wait_for(watcher._task, 1)
+
+    assert database.resume_after == [None]
+
+
+@pytest.mark.replica_set
+async def test_resumes_from_a_real_change_stream(mongod_db, bus):
+    watcher = ChangeStreamWatcher(mongod_db, [PLAYERS], bus=bus, max_await_time_ms=100)
+    watcher.start()
+    try:
+        await asyncio.wait_for(watcher.ready.wait(), 5)
+    except asyncio.TimeoutError:
+        await watcher.stop()
+        pytest.skip("MONGODB_TEST_URL is not a replica set")
+    players = mongod_db[PLAYERS]
+
+    first = (await players.insert_one({"name": "A"})).inserted_id
+    await _wait_for(lambda: len(bus.events) == 1)
+    await watcher.stop()
+    token = watcher.resume_token
+
+    # Written while no watcher runs; a restart with the kept token must still see it
+    second = (await players.insert_one({"name": "B"})).inserted_id
+    resumed = ChangeStreamWatcher(mongod_db, [PLAYERS], bus=bus, max_await_time_ms=100)
+    resumed.resume_token = token
+    resumed.start()
+    try:
+        await _wait_for(lambda: len(bus.events) == 2)
+    finally:
+        await resumed.stop()
+
+    assert [e.document_id for e in bus.events] == [str(first), str(second)]
+
+
+async def _wait_for(condition, timeout=5.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.05)
+
+    await asyncio.wait_for(poll(), timeout)
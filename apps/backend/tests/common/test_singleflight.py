@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.common.singleflight import SingleFlight, SingleFlightTimeout, normalize_key
+
+
+def _counting(result=None, gate=None, error=None):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if gate is not None:
+            await gate.wait()
+        if error is not None:
+            raise error
+        return result if result is not None else len(calls)
+
+    return fn, calls
+
+
+async def test_concurrent_identical_calls_share_one_computation():
+    group = SingleFlight("test")
+    gate = asyncio.Event()
+    fn, calls = _counting(gate=gate)
+
+    waiters = [asyncio.create_task(group.do({"contest_id": "c1", "skip": 0}, fn)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(group) == 1
+    gate.set()
+
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert calls == [1]
+    assert len(group) == 0
+
+
+async def test_followers_get_the_leaders_exception():
+    group = SingleFlight("test")
+    gate = asyncio.Event()
+    fn, calls = _counting(gate=gate, error=ValueError("boom"))
+
+    waiters = [asyncio.create_task(group.do({"k": 1}, fn)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert [type(r) for r in results] == [ValueError] * 3
+    assert calls == [1]
+
+
+async def test_different_params_run_separately_and_keys_are_normalized():
+    group = SingleFlight("test")
+    fn, calls = _counting()
+
+    assert normalize_key({"b": [1, 2], "a": " x ", "c": None}) == normalize_key({"a": "x", "b": (1, 2)})
+    await asyncio.gather(group.do({"page": 1}, fn), group.do({"page": 2}, fn))
+    assert len(calls) == 2
+
+
+async def test_finished_key_is_forgotten():
+    group = SingleFlight("test")
+    fn, calls = _counting()
+
+    assert await group.do({"k": 1}, fn) == 1
+    assert await group.do({"k": 1}, fn) == 2
+    assert len(group) == 0
+
+
+async def test_leader_disconnect_does_not_cancel_followers():
+    group = SingleFlight("test")
+    gate = asyncio.Event()
+    fn, calls = _counting(result="page", gate=gate)
+
+    leader = asyncio.create_task(group.do({"k": 1}, fn))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(group.do({"k": 1}, fn))
+    await asyncio.sleep(0)
+    leader.cancel()
+    gate.set()
+
+    assert await follower == "page"
+    assert leader.cancelled()
+    assert calls == [1]
+
+
+async def test_stuck_computation_times_out_and_is_not_joined_again():
+    group = SingleFlight("test", timeout=0.05)
+    stuck = asyncio.Event()
+    slow, slow_calls = _counting(gate=stuck)
+    fast, fast_calls = _counting(result="fresh")
+
+    with pytest.raises(SingleFlightTimeout) as exc:
+        await group.do({"k": 1}, slow)
+    assert exc.value.group == "test" and exc.value.timeout == 0.05
+    assert len(group) == 0
+
+    assert await group.do({"k": 1}, fast) == "fresh"
+    assert slow_calls == [1] and fast_calls == [1]
+
+    # The stuck task finishing later must not evict a newer flight for the same key
+    newer_gate = asyncio.Event()
+    newer, _ = _counting(gate=newer_gate)
+    pending = asyncio.create_task(group.do({"k": 1}, newer, timeout=5))
+    await asyncio.sleep(0)
+    stuck.set()
+    await asyncio.sleep(0.01)
+    assert len(group) == 1
+    newer_gate.set()
+    await pending
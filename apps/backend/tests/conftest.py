@@ -0,0 +1,109 @@
+"""Shared fixtures.
+
+Most tests run against mongomock-motor, an in-memory stand-in for MongoDB.
+Tests that depend on server behaviour mongomock lacks (command monitoring,
+change streams) are marked ``mongod`` and run against MONGODB_TEST_URL when
+it is set and reachable, and are skipped otherwise.
+"""
+import os
+
+# Test mode: QueryBudgetMiddleware fails any request over its route's budget
+os.environ.setdefault("NODE_ENV", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-" + "y" * 32)
+
+import httpx
+import pytest
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from app.common.invalidation import invalidation_bus
+from config.database import DOCUMENT_MODELS
+
+MONGODB_TEST_URL = os.environ.get("MONGODB_TEST_URL")
+
+
+@pytest.fixture
+async def db():
+    """A fresh in-memory database with every Beanie model registered."""
+    client = AsyncMongoMockClient()
+    database = client["tests"]
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    # Per-worker caches must not carry rows over from another test's database
+    invalidation_bus.flush(reason="tests")
+    yield database
+    invalidation_bus.flush(reason="tests")
+
+
+@pytest.fixture
+async def mongod_db():
+    """A throwaway database on a real MongoDB that reports commands to record_queries(), or skip."""
+    if not MONGODB_TEST_URL:
+        pytest.skip("MONGODB_TEST_URL is not set")
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from app.common.metrics.query_budget import QueryBudgetListener
+
+    client = AsyncIOMotorClient(
+        MONGODB_TEST_URL,
+        serverSelectionTimeoutMS=2000,
+        event_listeners=[QueryBudgetListener()],
+    )
+    try:
+        await client.admin.command("ping")
+    except Exception as exc:
+        client.close()
+        pytest.skip(f"MongoDB at MONGODB_TEST_URL is not reachable: {exc}")
+    name = f"walle_tests_{os.getpid()}"
+    database = client[name]
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    invalidation_bus.flush(reason="tests")
+    yield database
+    invalidation_bus.flush(reason="tests")
+    await client.drop_database(name)
+    client.close()
+
+
+@pytest.fixture
+async def leaderboard_store():
+    """A LeaderboardStore over fakeredis, installed for the test."""
+    from fakeredis.aioredis import FakeRedis
+
+    from app.services.leaderboard_store import LeaderboardStore, set_leaderboard_store
+
+    store = LeaderboardStore(FakeRedis(decode_responses=True))
+    set_leaderboard_store(store)
+    yield store
+    set_leaderboard_store(None)
+    await store.close()
+
+
+@pytest.fixture
+def app():
+    import main
+
+    return main.app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+        yield http
+
+
+async def make_user(username: str, is_admin: bool = False):
+    """Insert a user and return it with its bearer auth header."""
+    from app.models.user import User
+    from app.utils.security import create_access_token
+
+    user = User(
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="x",
+        full_name=username.title(),
+        is_admin=is_admin,
+    )
+    await user.insert()
+    token = create_access_token({"sub": username})
+    return user, {"Authorization": f"Bearer {token}"}
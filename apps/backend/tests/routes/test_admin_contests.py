@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from app.models.contest import Contest
+from app.models.player import Player
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from tests.conftest import make_user
+
+
+async def _contest():
+    now = datetime.utcnow()
+    contest = Contest(code="C1", name="Contest", start_at=now - timedelta(hours=1), end_at=now + timedelta(hours=5))
+    await contest.insert()
+    return contest
+
+
+async def test_player_points_reads_and_upserts_rows_of_the_contest(db, client):
+    contest = await _contest()
+    player = Player(name="P1", team="IND", price=8, points=0)
+    await player.insert()
+    await PlayerContestPoints(player_id=player.id, contest_id=contest.id, points=4).insert()
+    _, headers = await make_user("root", is_admin=True)
+
+    response = await client.get(f"/api/admin/contests/{contest.id}/player-points", headers=headers)
+    assert response.status_code == 200
+    assert [(row["player_id"], row["points"]) for row in response.json()] == [(str(player.id), 4.0)]
+
+    body = {"updates": [{"player_id": str(player.id), "points": 9}]}
+    response = await client.put(f"/api/admin/contests/{contest.id}/player-points", json=body, headers=headers)
+    assert response.status_code == 200
+    rows = await PlayerContestPoints.find({"contest_id": contest.id}).to_list()
+    assert [row.points for row in rows] == [9.0]
+
+
+async def test_enroll_teams_skips_active_enrollments(db, client):
+    contest = await _contest()
+    user, _ = await make_user("al")
+    team = Team(user_id=user.id, team_name="XI", player_ids=[], captain_id="", vice_captain_id="")
+    await team.insert()
+    _, headers = await make_user("root", is_admin=True)
+
+    for _ in range(2):
+        response = await client.post(
+            f"/api/admin/contests/{contest.id}/enroll-teams", json={"team_ids": [str(team.id)]}, headers=headers
+        )
+        assert response.status_code == 200
+
+    assert await TeamContestEnrollment.find({"contest_id": contest.id}).count() == 1
@@ -0,0 +1,30 @@
+from app.models.admin.slot import Slot
+from tests.conftest import make_user
+
+
+async def _player_counts(client):
+    response = await client.get("/api/bootstrap")
+    assert response.status_code == 200
+    return [slot["player_count"] for slot in response.json()["slots"]["slots"]]
+
+
+async def test_slot_player_counts_follow_player_writes(db, client):
+    _, headers = await make_user("admin", is_admin=True)
+    slot = Slot(code="BAT", name="Batters", min_select=1, max_select=4)
+    await slot.insert()
+    slot_id = str(slot.id)
+    assert await _player_counts(client) == [0]
+
+    response = await client.post("/api/admin/players", headers=headers, json={"name": "A", "team": "IND", "slot": slot_id})
+    assert response.status_code == 201
+    player_id = response.json()["id"]
+    assert await _player_counts(client) == [1]
+
+    assert (await client.delete(f"/api/admin/slots/{slot_id}/players/{player_id}", headers=headers)).status_code == 200
+    assert await _player_counts(client) == [0]
+
+    assert (await client.put(f"/api/admin/players/{player_id}", headers=headers, json={"slot": slot_id})).status_code == 200
+    assert await _player_counts(client) == [1]
+
+    assert (await client.delete(f"/api/admin/players/{player_id}", headers=headers)).status_code == 204
+    assert await _player_counts(client) == [0]
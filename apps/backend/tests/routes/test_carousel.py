@@ -0,0 +1,70 @@
+from bson import ObjectId
+
+from app.models.carousel import CarouselImage
+from app.services.carousel_feed import carousel_feed, save_positions
+from tests.conftest import make_user
+
+BASE = "/api/v1/carousel"
+
+
+async def _images(titles):
+    images = []
+    for order, title in enumerate(titles):
+        image = CarouselImage(title=title, display_order=order)
+        await image.insert()
+        images.append(image)
+    return images
+
+
+async def _feed_titles(client):
+    response = await client.get(f"{BASE}/feed")
+    assert response.status_code == 200
+    return [image["title"] for image in response.json()["images"]]
+
+
+async def test_reorder_switches_the_feed_to_the_new_order(db, client):
+    _, headers = await make_user("admin", is_admin=True)
+    a, b, c = await _images(["a", "b", "c"])
+    assert await _feed_titles(client) == ["a", "b", "c"]
+
+    response = await client.patch(
+        f"{BASE}/reorder",
+        headers=headers,
+        json={"image_orders": [
+            {"id": str(a.id), "display_order": 2},
+            {"id": str(c.id), "display_order": 0},
+            {"id": str(ObjectId()), "display_order": 5},
+        ]},
+    )
+
+    assert response.status_code == 200 and response.json()["updated"] == 2
+    assert await _feed_titles(client) == ["c", "b", "a"]
+    assert [(await CarouselImage.get(i.id)).display_order for i in (a, b, c)] == [2, 1, 0]
+
+
+async def test_feed_follows_the_order_document_while_images_are_being_updated(db, client):
+    a, b, c = await _images(["a", "b", "c"])
+    await _feed_titles(client)
+
+    # A reorder whose order document is written but whose image copies are only partly applied
+    await save_positions({str(a.id): 2, str(b.id): 1, str(c.id): 0})
+    await CarouselImage.get_motor_collection().update_one({"_id": a.id}, {"$set": {"display_order": 2}})
+    carousel_feed.invalidate()
+
+    assert await _feed_titles(client) == ["c", "b", "a"]
+
+
+async def test_single_image_edits_and_deletes_update_the_order(db, client):
+    _, headers = await make_user("admin", is_admin=True)
+    created = []
+    for title in ("a", "b"):
+        response = await client.post(f"{BASE}/", headers=headers, json={"title": title})
+        assert response.status_code == 201
+        created.append(response.json()["_id"])
+
+    response = await client.put(f"{BASE}/{created[0]}", headers=headers, json={"display_order": 9})
+    assert response.status_code == 200
+    assert await _feed_titles(client) == ["b", "a"]
+
+    assert (await client.delete(f"{BASE}/{created[1]}", headers=headers)).status_code == 204
+    assert await _feed_titles(client) == ["a"]
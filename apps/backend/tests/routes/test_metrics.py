@@ -0,0 +1,35 @@
+import pytest
+
+from app.routes import metrics as metrics_route
+
+
+@pytest.fixture
+def metrics_settings(monkeypatch):
+    def configure(node_env, token=None):
+        monkeypatch.setattr(metrics_route.settings, "node_env", node_env)
+        monkeypatch.setattr(metrics_route.settings, "metrics_token", token)
+
+    return configure
+
+
+async def test_served_without_a_token_outside_production(client, metrics_settings):
+    metrics_settings("development")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+
+async def test_not_served_in_production_without_a_token(client, metrics_settings):
+    metrics_settings("production")
+
+    assert (await client.get("/metrics")).status_code == 404
+
+
+async def test_token_is_required_when_configured(client, metrics_settings):
+    metrics_settings("production", token="scrape-me")
+
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+    assert (await client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})).status_code == 200
@@ -0,0 +1,18 @@
+from app.models.player import Player
+from app.models.team import Team
+from tests.conftest import make_user
+
+
+async def test_hot_players_keep_the_player_out_shape(db, client):
+    player = Player(name="P1", team="IND", price=8, points=3, stats={"runs": 742})
+    await player.insert()
+    user, _ = await make_user("al")
+    await Team(user_id=user.id, team_name="XI", player_ids=[str(player.id)]).insert()
+
+    response = await client.get("/api/players/hot", params={"threshold": 1})
+
+    assert response.status_code == 200
+    [item] = response.json()
+    assert item["selection_count"] == 1 and item["is_hot"] is True
+    assert item["player"]["id"] == str(player.id)
+    assert item["player"]["stats"] == {"runs": 742}
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.contest import Contest
+from app.models.player import Player
+from app.models.team import Team
+from app.services.leaderboard_store import GLOBAL_SCOPE
+from tests.conftest import make_user
+
+
+@pytest.fixture
+async def setup(db):
+    now = datetime.utcnow()
+    contests = []
+    for code in ("C1", "C2"):
+        contest = Contest(code=code, name=code, start_at=now + timedelta(days=1), end_at=now + timedelta(days=2))
+        await contest.insert()
+        contests.append(str(contest.id))
+    players = []
+    for i in range(3):
+        player = Player(name=f"P{i}", team="IND", price=8, points=0)
+        await player.insert()
+        players.append(str(player.id))
+    _, headers = await make_user("al")
+    return contests, players, headers
+
+
+def _team(players, contest_id, name="XI"):
+    return {
+        "team_name": name,
+        "player_ids": players,
+        "captain_id": players[0],
+        "vice_captain_id": players[1],
+        "contest_id": contest_id,
+    }
+
+
+async def test_identical_teams_are_allowed_and_reported_as_duplicates(setup, client):
+    (first, second), players, headers = setup
+
+    created = []
+    for contest_id, name in ((first, "a"), (second, "b"), (None, "c"), (None, "d")):
+        response = await client.post("/api/teams/", json=_team(players, contest_id, name), headers=headers)
+        assert response.status_code == 201
+        created.append(response.json()["id"])
+
+    response = await client.get(f"/api/teams/{created[0]}/duplicates", headers=headers)
+    assert response.status_code == 200
+    assert (response.json()["teams"], response.json()["users"]) == (4, 1)
+
+
+async def test_batch_accepts_identical_teams(setup, client):
+    (first, second), players, headers = setup
+    body = {"teams": [_team(players, first, "a"), _team(players, second, "b"), _team(players, first, "c")]}
+
+    response = await client.post("/api/teams/batch", json=body, headers=headers)
+
+    assert response.status_code == 200
+    assert [r["status_code"] for r in response.json()["results"]] == [201, 201, 201]
+    assert await Team.count() == 3
+
+
+async def test_batch_sets_global_scores_in_one_store_update(setup, client, leaderboard_store, monkeypatch):
+    (first, second), players, headers = setup
+    await Player.get_motor_collection().update_many({}, {"$set": {"points": 10}})
+    assert await leaderboard_store.replace(GLOBAL_SCOPE, [], await leaderboard_store.generation(GLOBAL_SCOPE))
+    upserts = []
+    original = leaderboard_store.upsert
+
+    async def counting_upsert(scores_by_scope):
+        upserts.append(scores_by_scope)
+        await original(scores_by_scope)
+
+    monkeypatch.setattr(leaderboard_store, "upsert", counting_upsert)
+    body = {"teams": [_team(players, first, "a"), _team(players, second, "b")]}
+
+    response = await client.post("/api/teams/batch", json=body, headers=headers)
+
+    assert response.status_code == 200
+    team_ids = [r["team"]["id"] for r in response.json()["results"]]
+    assert len(upserts) == 1
+    ranked, size = await leaderboard_store.page(GLOBAL_SCOPE, 0, None)
+    assert size == 2
+    assert sorted(team_id for team_id, _ in ranked) == sorted(team_ids)
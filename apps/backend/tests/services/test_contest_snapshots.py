@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.contest import Contest
+from app.models.contest_standings import ContestStandingsPage
+from app.models.player import Player
+from app.models.player_contest_points import PlayerContestPoints
+from app.models.team import Team
+from app.models.team_contest_enrollment import TeamContestEnrollment
+from app.models.user import User
+from app.services import contest_snapshots
+from app.services.contest_snapshots import (
+    FinalizeConflict,
+    finalize_contest,
+    frozen_leaderboard_page,
+    frozen_team_breakdown,
+)
+
+
+@pytest.fixture
+async def ended_contest(db, monkeypatch):
+    monkeypatch.setattr(contest_snapshots, "STANDINGS_PAGE_SIZE", 2)
+    contest_snapshots._page_cache.clear()
+    now = datetime.utcnow()
+    contest = Contest(code="C1", name="Contest", start_at=now - timedelta(days=2), end_at=now - timedelta(days=1))
+    await contest.insert()
+    players = []
+    for i in range(4):
+        player = Player(name=f"P{i}", team="IND", price=8, points=0)
+        await player.insert()
+        await PlayerContestPoints(player_id=player.id, contest_id=contest.id, points=10 * i).insert()
+        players.append(player)
+    teams = []
+    for i in range(5):
+        user = User(username=f"u{i}", email=f"u{i}@example.com", hashed_password="x", full_name=f"U{i}")
+        await user.insert()
+        picks = [str(p.id) for p in players[i % 2:i % 2 + 2]]
+        team = Team(user_id=user.id, team_name=f"team{i}", player_ids=picks, captain_id=picks[0], vice_captain_id=picks[1])
+        await team.insert()
+        await TeamContestEnrollment(team_id=team.id, user_id=user.id, contest_id=contest.id).insert()
+        teams.append(team)
+    return contest, teams
+
+
+async def test_reader_with_a_stale_version_follows_the_refinalized_snapshot(ended_contest):
+    contest, teams = ended_contest
+    await finalize_contest(contest)
+    # What another worker's contest cache still holds
+    stale = await Contest.get(contest.id)
+
+    await finalize_contest(await Contest.get(contest.id))
+    assert await ContestStandingsPage.get_motor_collection().distinct("version") == [2]
+
+    page = await frozen_leaderboard_page(stale, skip=0, limit=5)
+    assert [entry.rank for entry in page.entries] == [1, 2, 3, 4, 5]
+    assert await frozen_team_breakdown(stale, teams[0].id) is not None
+
+
+async def test_concurrent_finalizations_write_distinct_versions(ended_contest):
+    contest, _ = ended_contest
+    first, second = await Contest.get(contest.id), await Contest.get(contest.id)
+
+    results = await asyncio.gather(finalize_contest(first), finalize_contest(second), return_exceptions=True)
+
+    versions = [r.version for r in results if not isinstance(r, Exception)]
+    assert all(isinstance(r, FinalizeConflict) for r in results if isinstance(r, Exception))
+    assert len(set(versions)) == len(versions) >= 1
+    stored = await Contest.get(contest.id)
+    assert stored.finalized_version == 2
+    assert await ContestStandingsPage.get_motor_collection().distinct("version") == [2]
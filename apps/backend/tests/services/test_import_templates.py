@@ -0,0 +1,16 @@
+from app.models.admin.slot import Slot
+from app.services.import_templates import import_templates
+from app.utils.import_players.import_validators import resolve_slot
+
+
+async def test_slots_created_by_an_import_refresh_the_template(db):
+    before = await import_templates.get("xlsx")
+
+    slot_id = await resolve_slot("wk_bat", None, strategy="create")
+    by_name = await resolve_slot(None, "All Rounders", strategy="create")
+    after = await import_templates.get("xlsx")
+
+    assert {slot.code for slot in await Slot.find_all().to_list()} == {"WK_BAT", "ALL_ROUNDERS"}
+    assert slot_id and by_name
+    assert after.version != before.version
+    assert await import_templates.get("xlsx") is after
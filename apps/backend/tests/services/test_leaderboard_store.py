@@ -0,0 +1,128 @@
+import numpy as np
+
+from app.models.player import Player
+from app.models.team import Team
+from app.services.leaderboard_store import (
+    GLOBAL_SCOPE,
+    apply_global_point_changes,
+    contest_scope,
+    leaderboard_page,
+    remove_teams,
+)
+from app.services.read_models import TeamCard, UserCard
+from app.services.scoring import ScoringMatrix
+from app.services.standings import Ranking
+from app.utils.team_fingerprint import team_fingerprint
+from tests.conftest import make_user
+
+SCOPE = contest_scope("c1")
+
+
+async def _build(store, scope, scores):
+    assert await store.replace(scope, scores, await store.generation(scope))
+
+
+async def test_page_ranks_by_score_then_team_id_descending(leaderboard_store):
+    await _build(leaderboard_store, SCOPE, [("a", 10.0), ("c", 20.0), ("b", 10.0), ("d", 5.0)])
+
+    assert await leaderboard_store.page(SCOPE, 0, None) == ([("c", 20.0), ("b", 10.0), ("a", 10.0), ("d", 5.0)], 4)
+    assert await leaderboard_store.page(SCOPE, 1, 2) == ([("b", 10.0), ("a", 10.0)], 4)
+
+
+async def test_unbuilt_scope_has_no_page(leaderboard_store):
+    assert await leaderboard_store.page(SCOPE, 0, 10) is None
+
+
+async def test_replace_is_refused_after_a_concurrent_change(leaderboard_store):
+    generation = await leaderboard_store.generation(SCOPE)
+    await leaderboard_store.increment(SCOPE, {"a": 1.0})
+
+    assert not await leaderboard_store.replace(SCOPE, [("a", 1.0)], generation)
+    assert await leaderboard_store.page(SCOPE, 0, None) is None
+
+
+async def test_increment_shifts_ranked_teams_only(leaderboard_store):
+    await _build(leaderboard_store, SCOPE, [("a", 10.0), ("b", 12.0)])
+
+    await leaderboard_store.increment(SCOPE, {"a": 5.0, "x": 3.0})
+
+    assert await leaderboard_store.page(SCOPE, 0, None) == ([("a", 15.0), ("b", 12.0)], 2)
+
+
+async def test_upsert_sets_scores_in_built_scopes_only(leaderboard_store):
+    await _build(leaderboard_store, SCOPE, [("a", 10.0)])
+    other = contest_scope("c2")
+
+    await leaderboard_store.upsert({SCOPE: {"b": 11.0, "a": 1.0}, other: {"b": 11.0}})
+
+    assert await leaderboard_store.page(SCOPE, 0, None) == ([("b", 11.0), ("a", 1.0)], 2)
+    assert await leaderboard_store.page(other, 0, None) is None
+
+
+async def test_best_rank_of_a_users_teams(leaderboard_store):
+    await _build(leaderboard_store, SCOPE, [("a", 10.0), ("b", 30.0), ("c", 20.0)])
+
+    assert await leaderboard_store.best_rank(SCOPE, ["a", "c"]) == (2, "c", 20.0)
+    assert await leaderboard_store.best_rank(SCOPE, ["missing"]) is None
+    assert await leaderboard_store.best_rank(SCOPE, []) is None
+
+
+async def test_remove_teams_takes_them_out_of_the_given_scopes(db, leaderboard_store):
+    await _build(leaderboard_store, SCOPE, [("a", 10.0), ("b", 12.0)])
+    await _build(leaderboard_store, GLOBAL_SCOPE, [("a", 10.0), ("b", 12.0)])
+
+    await remove_teams(["a"], contest_ids=["c1"])
+
+    assert await leaderboard_store.page(SCOPE, 0, None) == ([("b", 12.0)], 1)
+    assert await leaderboard_store.page(GLOBAL_SCOPE, 0, None) == ([("b", 12.0), ("a", 10.0)], 2)
+
+
+async def test_global_point_changes_apply_per_team_deltas(db, leaderboard_store):
+    user, _ = await make_user("al")
+    players = [Player(name=f"P{i}", team="IND", price=8, points=0) for i in range(2)]
+    for player in players:
+        await player.insert()
+    teams = []
+    for name, squad in (("both", players), ("one", players[1:])):
+        player_ids = [str(p.id) for p in squad]
+        team = Team(user_id=user.id, team_name=name, player_ids=player_ids, fingerprint=team_fingerprint(player_ids, None, None))
+        await team.insert()
+        teams.append(team)
+    both, one = teams
+    await _build(leaderboard_store, GLOBAL_SCOPE, [(str(both.id), 0.0), (str(one.id), 0.0)])
+
+    await apply_global_point_changes({str(players[0].id): 4.0, str(players[1].id): 1.0})
+
+    ranked, _ = await leaderboard_store.page(GLOBAL_SCOPE, 0, None)
+    assert ranked == [(str(both.id), 5.0), (str(one.id), 1.0)]
+
+
+async def test_leaderboard_page_is_served_from_the_store_once_built(db, leaderboard_store):
+    user, _ = await make_user("al")
+    rival, _ = await make_user("bo")
+    teams = []
+    for owner, name in ((user, "mine"), (rival, "theirs")):
+        team = Team(user_id=owner.id, team_name=name, fingerprint=name)
+        await team.insert()
+        teams.append(team)
+    me = UserCard.from_user(user)
+    cards = [
+        TeamCard(id=str(team.id), user_id=str(team.user_id), team_name=team.team_name, player_ids=(), fingerprint=team.fingerprint)
+        for team in teams
+    ]
+    users = {me.id: me, str(rival.id): UserCard.from_user(rival)}
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        return Ranking(ScoringMatrix.from_teams(cards), cards, users, np.array([3.0, 9.0]))
+
+    first = await leaderboard_page(GLOBAL_SCOPE, compute, skip=0, limit=1, user=me)
+    second = await leaderboard_page(GLOBAL_SCOPE, compute, skip=0, limit=1, user=me)
+
+    assert len(computed) == 1
+    for page in (first, second):
+        assert page.total == 2
+        assert [entry.standing.team.team_name for entry in page.entries] == ["theirs"]
+        assert page.current_user_entry.rank == 2
+        assert page.current_user_entry.standing.points == 3.0
@@ -0,0 +1,69 @@
+import random
+
+import numpy as np
+
+from app.services.read_models import TeamCard, UserCard
+from app.services.scoring import ScoringMatrix
+from app.services.standings import Ranking, paginate
+
+
+def _ranking(rows, owners=None):
+    """rows: (team id, user id, points); ``owners`` defaults to every user id in rows."""
+    teams = [TeamCard(id=tid, user_id=uid, team_name=tid, player_ids=(), fingerprint=tid) for tid, uid, _ in rows]
+    owners = {uid for _, uid, _ in rows} if owners is None else owners
+    users = {uid: UserCard(id=uid, username=uid, full_name=None, avatar_url=None) for uid in owners}
+    return Ranking(ScoringMatrix.from_teams(teams), teams, users, np.array([p for _, _, p in rows], dtype=np.float64))
+
+
+def _ids(entries):
+    return [(entry.rank, entry.standing.team.id) for entry in entries]
+
+
+def test_page_orders_by_points_then_team_id_descending():
+    ranking = _ranking([("a", "u1", 10.0), ("c", "u2", 20.0), ("b", "u3", 10.0), ("d", "u1", 5.0)])
+
+    assert _ids(ranking.page()) == [(1, "c"), (2, "b"), (3, "a"), (4, "d")]
+    assert _ids(ranking.page(1, 2)) == [(2, "b"), (3, "a")]
+    assert ranking.page(4, 10) == []
+
+
+def test_page_matches_a_full_sort():
+    rng = random.Random(7)
+    rows = [(f"t{i:04d}", f"u{i % 40}", float(rng.randint(0, 30))) for i in range(500)]
+    expected = sorted(rows, key=lambda row: (row[2], row[0]), reverse=True)
+    ranking = _ranking(rows)
+
+    for skip, limit in ((0, 10), (95, 20), (480, 50)):
+        page = ranking.page(skip, limit)
+        assert [e.standing.team.id for e in page] == [tid for tid, _, _ in expected[skip:skip + limit]]
+        assert [e.standing.points for e in page] == [points for _, _, points in expected[skip:skip + limit]]
+
+
+def test_current_user_entry_is_their_best_ranked_team():
+    ranking = _ranking([("a", "u1", 10.0), ("b", "u2", 20.0), ("c", "u1", 15.0), ("d", "u3", 1.0)])
+
+    page = paginate(ranking, skip=0, limit=1, user_id="u1")
+
+    assert _ids(page.entries) == [(1, "b")]
+    assert (page.current_user_entry.rank, page.current_user_entry.standing.team.id) == (2, "c")
+    assert paginate(ranking, user_id="nobody").current_user_entry is None
+    assert page.total == 4
+
+
+def test_teams_without_an_owner_are_not_ranked():
+    ranking = _ranking([("a", "u1", 10.0), ("b", "gone", 30.0), ("c", "u2", 5.0)], owners={"u1", "u2"})
+
+    assert len(ranking) == 2
+    assert _ids(ranking.page()) == [(1, "a"), (2, "c")]
+    assert _ids(ranking.page(0, 10)) == [(1, "a"), (2, "c")]
+    assert ranking.user_entry("u2").rank == 2
+    assert ranking.user_entry("gone") is None
+    assert sorted(ranking.scores()) == [("a", 10.0), ("c", 5.0)]
+
+
+def test_empty_ranking():
+    ranking = Ranking.empty()
+
+    assert len(ranking) == 0
+    assert ranking.page(0, 10) == [] and ranking.standings() == []
+    assert ranking.user_entry("u1") is None
@@ -0,0 +1,72 @@
+"""Declared route query budgets (@query_budget), checked at two data sizes.
+
+Command counts come from pymongo command monitoring, which mongomock does not
+emit, so these tests need a real MongoDB (MONGODB_TEST_URL) and are skipped
+without one.
+"""
+import pytest
+
+from app.common.metrics.query_budget import (
+    BUDGET_ATTRIBUTE,
+    QueryBudgetExceeded,
+    QueryLog,
+    RecordedQuery,
+    assert_query_budget,
+    record_queries,
+)
+from benchmarks.datagen import generate
+from tests.conftest import make_user
+
+# (path template, url format, auth: None, "user" or "admin")
+BUDGETED_CALLS = [
+    ("/api/contests/{contest_id}/leaderboard", "/api/contests/{contest_id}/leaderboard", "user"),
+    ("/api/leaderboard", "/api/leaderboard", "user"),
+    ("/api/players/hot", "/api/players/hot?limit=200", None),
+    ("/api/players/hot/ids", "/api/players/hot/ids?limit=200", None),
+    ("/api/slots", "/api/slots", None),
+    ("/api/admin/users-with-teams", "/api/admin/users-with-teams?page_size=100", "admin"),
+    ("/api/bootstrap", "/api/bootstrap", None),
+]
+
+
+def _budgets(app):
+    return {
+        route.path: getattr(route.endpoint, BUDGET_ATTRIBUTE)
+        for route in app.routes
+        if getattr(getattr(route, "endpoint", None), BUDGET_ATTRIBUTE, None) is not None
+    }
+
+
+def test_every_budgeted_route_is_checked(app):
+    assert set(_budgets(app)) == {template for template, _, _ in BUDGETED_CALLS}
+
+
+def test_budget_ignores_cursor_housekeeping():
+    log = QueryLog([
+        RecordedQuery("find", "players", ()),
+        RecordedQuery("getMore", "players", ()),
+        RecordedQuery("killCursors", "players", ()),
+    ])
+    assert log.count == 1
+    assert_query_budget(log, 1)
+    with pytest.raises(QueryBudgetExceeded):
+        assert_query_budget(log, 0)
+
+
+@pytest.mark.mongod
+@pytest.mark.parametrize("teams", [50, 500])
+async def test_routes_stay_within_their_query_budget(mongod_db, app, client, teams):
+    from app.services.leaderboard_store import set_leaderboard_store
+
+    set_leaderboard_store(None)
+    dataset = await generate(teams, players_per_slot=20)
+    _, user = await make_user("budget_user")
+    _, admin = await make_user("budget_admin", is_admin=True)
+    headers = {None: None, "user": user, "admin": admin}
+    budgets = _budgets(app)
+
+    for template, url, auth in BUDGETED_CALLS:
+        with record_queries() as log:
+            response = await client.get(url.format(contest_id=dataset.contest_id), headers=headers[auth])
+        assert response.status_code == 200, (template, response.text)
+        assert log.count <= budgets[template], f"{template} at {teams} teams:\n{log.summary()}"
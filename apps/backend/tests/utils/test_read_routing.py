@@ -0,0 +1,73 @@
+import pytest
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from app.models.player import Player
+from app.models.team import Team
+from app.utils import read_routing
+
+
+@pytest.fixture
+def preferences(monkeypatch):
+    def configure(default="primary", overrides=""):
+        monkeypatch.setattr(read_routing.settings, "mongodb_heavy_read_preference", default)
+        monkeypatch.setattr(read_routing.settings, "mongodb_read_preferences", overrides)
+        monkeypatch.setattr(read_routing.settings, "mongodb_max_staleness_seconds", None)
+        read_routing.heavy_read_preference.cache_clear()
+
+    yield configure
+    read_routing.heavy_read_preference.cache_clear()
+
+
+async def test_collections_without_an_override_use_the_heavy_read_preference(db, preferences):
+    preferences(default="secondaryPreferred", overrides="players=primary")
+
+    assert isinstance(read_routing.heavy_read_collection(Team).read_preference, SecondaryPreferred)
+    assert isinstance(read_routing.heavy_read_collection(Player).read_preference, Primary)
+
+
+async def test_override_can_send_one_collection_to_secondaries(db, preferences):
+    preferences(overrides=" teams = secondaryPreferred ,")
+
+    assert isinstance(read_routing.heavy_read_collection(Team).read_preference, SecondaryPreferred)
+    assert isinstance(read_routing.heavy_read_collection(Player).read_preference, Primary)
+
+
+def test_validation_rejects_unknown_collections_and_modes(preferences):
+    preferences(overrides="teams=secondaryPreferred")
+    read_routing.validate_read_preferences(["teams", "players"])
+
+    preferences(overrides="team=secondaryPreferred")
+    with pytest.raises(ValueError, match="unknown collections: team"):
+        read_routing.validate_read_preferences(["teams", "players"])
+
+    preferences(overrides="teams=secondaryFirst")
+    with pytest.raises(ValueError, match="Unknown read preference"):
+        read_routing.validate_read_preferences(["teams"])
+
+    preferences(overrides="teams")
+    with pytest.raises(ValueError, match="collection=mode"):
+        read_routing.validate_read_preferences(["teams"])
+
+
+async def test_primary_reads_override_every_preference(db, preferences):
+    preferences(default="secondaryPreferred", overrides="teams=secondaryPreferred")
+
+    with read_routing.primary_reads():
+        assert isinstance(read_routing.heavy_read_collection(Team).read_preference, Primary)
+    assert isinstance(read_routing.heavy_read_collection(Team).read_preference, SecondaryPreferred)
+
+
+async def test_leaderboard_rebuilds_read_from_the_primary(db, preferences, leaderboard_store):
+    from app.services.leaderboard_store import GLOBAL_SCOPE, leaderboard_page
+    from app.services.standings import Ranking
+
+    preferences(default="secondaryPreferred")
+    seen = []
+
+    async def compute():
+        seen.append(read_routing.heavy_read_collection(Team).read_preference)
+        return Ranking.empty()
+
+    await leaderboard_page(GLOBAL_SCOPE, compute, skip=0, limit=10)
+
+    assert len(seen) == 1 and isinstance(seen[0], Primary)